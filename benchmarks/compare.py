@@ -0,0 +1,79 @@
+"""Compares two ``benchmarks.request_as_client`` JSON results, for example the
+results of the base and head commits of a change.
+
+    python -m benchmarks.compare results/base.json results/head.json --threshold 5
+
+Changes for the worse beyond the threshold are flagged as regressions, and the
+command exits with status 1 when there is any.
+"""
+import argparse
+import sys
+from typing import List
+
+import orjson
+
+
+METRICS = (
+    ("throughput_rps", ("throughput_rps",), True),
+    ("latency_p50_ms", ("latency_ms", "p50"), False),
+    ("latency_p99_ms", ("latency_ms", "p99"), False),
+    ("redis_commands_per_request", ("redis", "commands_per_request"), False),
+)
+
+
+def load(path: str) -> dict:
+    with open(path, "rb") as result:
+        return orjson.loads(result.read())
+
+
+def lookup(result: dict, path: tuple) -> float:
+    for key in path:
+        result = result[key]
+    return result
+
+
+def parse_options(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base", help="result of the base commit")
+    parser.add_argument("head", help="result of the head commit")
+    parser.add_argument(
+        "--threshold", type=float, default=5, help="tolerated change in percent"
+    )
+    return parser.parse_args(argv)
+
+
+def compare(base: dict, head: dict, threshold: float = 0) -> List[dict]:
+    rows = []
+    for name, path, higher_is_better in METRICS:
+        base_value, head_value = lookup(base, path), lookup(head, path)
+        change = (head_value - base_value) / base_value if base_value else 0.0
+        rows.append(
+            {
+                "metric": name,
+                "base": base_value,
+                "head": head_value,
+                "change": change,
+                "regression": (-change if higher_is_better else change) > threshold,
+            }
+        )
+    return rows
+
+
+def main(argv: List[str] = None) -> List[dict]:
+    options = parse_options(argv)
+    base, head = load(options.base), load(options.head)
+    if base["options"] != head["options"]:
+        print("warning: the results were produced with different options")
+    rows = compare(base, head, options.threshold / 100)
+    print(f"{'metric':<28}{'base':>14}{'head':>14}{'change':>10}")
+    for row in rows:
+        flag = "  !" if row["regression"] else ""
+        print(
+            f"{row['metric']:<28}{row['base']:>14.3f}{row['head']:>14.3f}"
+            f"{row['change']:>+10.1%}{flag}"
+        )
+    return rows
+
+
+if __name__ == "__main__":
+    sys.exit(any(row["regression"] for row in main()))
@@ -0,0 +1,37 @@
+from contextlib import contextmanager
+
+from decouple import undefined
+
+from caronte.src.infrastructures.env_config import Settings
+
+
+BENCHMARK_ENV = {
+    "CARONTE_CACHE_KEYS_PREFIX": "caronte:",
+    "CARONTE_REDIS_DB": "0",
+    "CARONTE_CLIENT_AUTHENTICATION_LOCK_MANAGER_TIMEOUT": "10000",
+    "CARONTE_CLIENT_AUTHENTICATION_LOCK_MANAGER_IDENTIFIER": "benchmark",
+    "OUROINVEST_BASE_TOKENS_CACHE_FOLDER": "ouroinvest:tokens",
+    "OUROINVEST_DEFAULT_TOKEN_CACHE_KEY": ":default",
+    "OUROINVEST_USER_TOKEN_CACHE_KEY": ":user:{}",
+    "OUROINVEST_DEFAULT_TOKEN_URL": "http://127.0.0.1/token",
+    "OUROINVEST_USER_TOKEN_URL": "http://127.0.0.1/user-token",
+}
+
+
+def _config(key, default=undefined, cast=undefined):
+    value = BENCHMARK_ENV.get(key, default)
+    if value is undefined:
+        value = "benchmark"
+    return value if cast is undefined else cast(value)
+
+
+@contextmanager
+def benchmark_config(**overrides):
+    """Serve the caronte settings from ``BENCHMARK_ENV`` instead of the deployment
+    .env file, so the package can be exercised on any machine."""
+    BENCHMARK_ENV.update(overrides)
+    Settings.configure(source=_config)
+    try:
+        yield
+    finally:
+        Settings.configure(source=None)
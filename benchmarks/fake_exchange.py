@@ -0,0 +1,95 @@
+import asyncio
+from collections import Counter
+from itertools import count
+from random import Random
+
+import orjson
+from aiohttp import web
+
+
+class FakeExchange:
+    """Local aiohttp server imitating the Ouroinvest token and business endpoints,
+    with configurable latency, server error rate and token rejection rate."""
+
+    def __init__(
+        self,
+        latency: float = 0,
+        jitter: float = 0,
+        token_latency: float = 0,
+        error_rate: float = 0,
+        reject_rate: float = 0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.token_latency = token_latency
+        self.error_rate = error_rate
+        self.reject_rate = reject_rate
+        self.random = Random(seed)
+        self.calls = Counter()
+        self.url = None
+        self.__tokens = count(1)
+        self.__runner = None
+        self.__payload = orjson.dumps(
+            {
+                "posicoes": [
+                    {"ativo": "PETR4", "quantidade": 100, "precoMedio": 32.15},
+                    {"ativo": "VALE3", "quantidade": 50, "precoMedio": 68.4},
+                ]
+            }
+        )
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_post("/token", self.__company_token)
+        app.router.add_post("/user-token", self.__user_token)
+        app.router.add_route("*", "/business/{path:.*}", self.__business)
+        self.__runner = web.AppRunner(app, access_log=None)
+        await self.__runner.setup()
+        await web.TCPSite(self.__runner, host, port).start()
+        host, port = self.__runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self):
+        if self.__runner is not None:
+            await self.__runner.cleanup()
+            self.__runner = None
+
+    async def __company_token(self, request: web.Request) -> web.Response:
+        self.calls["token"] += 1
+        await request.read()
+        await self.__wait(self.token_latency)
+        return self.__json({"tokenAcesso": {"token": f"company-{next(self.__tokens)}"}})
+
+    async def __user_token(self, request: web.Request) -> web.Response:
+        self.calls["user_token"] += 1
+        body = orjson.loads(await request.read())
+        await self.__wait(self.token_latency)
+        if not request.headers.get("Authorization", "").startswith("Bearer company-"):
+            return web.Response(status=401)
+        client_id = body["codigoCliente"]
+        return self.__json(
+            {"tokenAcesso": {"token": f"user-{client_id}-{next(self.__tokens)}"}}
+        )
+
+    async def __business(self, request: web.Request) -> web.Response:
+        self.calls["business"] += 1
+        await request.read()
+        await self.__wait(self.latency + self.random.uniform(0, self.jitter))
+        if self.random.random() < self.error_rate:
+            self.calls["business_error"] += 1
+            return web.Response(status=500)
+        if self.random.random() < self.reject_rate:
+            self.calls["business_rejected"] += 1
+            return web.Response(status=401)
+        return web.Response(body=self.__payload, content_type="application/json")
+
+    @staticmethod
+    async def __wait(delay: float):
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def __json(content: dict) -> web.Response:
+        return web.Response(body=orjson.dumps(content), content_type="application/json")
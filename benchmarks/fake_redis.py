@@ -0,0 +1,218 @@
+import asyncio
+from collections import Counter, defaultdict
+from fnmatch import fnmatchcase
+from time import monotonic
+
+
+class FakePubSub:
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.channels = set()
+        self.messages = asyncio.Queue()
+
+    async def subscribe(self, *channels):
+        self.redis.count("SUBSCRIBE")
+        for channel in channels:
+            channel = self.redis.encode(channel)
+            self.channels.add(channel)
+            self.redis.subscribers[channel].add(self)
+
+    async def get_message(
+        self, ignore_subscribe_messages: bool = False, timeout: float = 0
+    ):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def reset(self):
+        for channel in self.channels:
+            self.redis.subscribers[channel].discard(self)
+        self.channels.clear()
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.command_stack = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.command_stack.clear()
+
+    def __len__(self):
+        return len(self.command_stack)
+
+    def __getattr__(self, name):
+        command = getattr(self.redis, f"_{name}")
+
+        def queue(*args, **kwargs):
+            self.command_stack.append((name, command, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        results = []
+        for name, command, args, kwargs in self.command_stack:
+            self.redis.count(name.upper(), round_trip=False)
+            results.append(command(*args, **kwargs))
+        self.command_stack.clear()
+        return results
+
+
+class FakeRedis:
+    """In-memory stand-in for ``redis.asyncio.Redis`` that counts every command and
+    network round trip issued against it."""
+
+    def __init__(self, latency: float = 0):
+        self.latency = latency
+        self.data = {}
+        self.subscribers = defaultdict(set)
+        self.commands = Counter()
+        self.round_trips = 0
+        self.scripts = {}
+
+    @staticmethod
+    def encode(value) -> bytes:
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def count(self, command: str, round_trip: bool = True):
+        self.commands[command] += 1
+        if round_trip:
+            self.round_trips += 1
+
+    def reset_counters(self):
+        self.commands.clear()
+        self.round_trips = 0
+
+    def emulate_script(self, script: str, handler):
+        """Emulate a Lua script with ``handler(redis, keys, args)``, since EVAL can
+        not run Lua here."""
+        self.scripts[script] = handler
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self)
+
+    async def _round_trip(self, command: str, *args, **kwargs):
+        self.count(command.upper())
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return getattr(self, f"_{command}")(*args, **kwargs)
+
+    def __getattr__(self, name):
+        if name.startswith("_") or not hasattr(self, f"_{name}"):
+            raise AttributeError(name)
+
+        async def command(*args, **kwargs):
+            return await self._round_trip(name, *args, **kwargs)
+
+        return command
+
+    async def scan_iter(self, match: str = None, count: int = None):
+        self.count("SCAN")
+        for key in list(self.data):
+            if match is None or fnmatchcase(key.decode(), match):
+                yield key
+
+    def _alive(self, key: bytes):
+        entry = self.data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= monotonic():
+            del self.data[key]
+            entry = None
+        return entry
+
+    def _get(self, name):
+        entry = self._alive(self.encode(name))
+        return entry[0] if entry else None
+
+    def _mget(self, keys, *args):
+        return [self._get(key) for key in keys]
+
+    def _set(self, name, value, ex=None, px=None, nx=False):
+        key = self.encode(name)
+        if nx and self._alive(key):
+            return None
+        ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+        self.data[key] = (self.encode(value), monotonic() + ttl if ttl else None)
+        return True
+
+    def _pttl(self, name):
+        entry = self._alive(self.encode(name))
+        if entry is None:
+            return -2
+        if entry[1] is None:
+            return -1
+        return int((entry[1] - monotonic()) * 1000)
+
+    def _expire(self, name, time):
+        key = self.encode(name)
+        if (entry := self._alive(key)) is None:
+            return False
+        self.data[key] = (entry[0], monotonic() + time)
+        return True
+
+    def _delete(self, *names):
+        return sum(self.data.pop(self.encode(name), None) is not None for name in names)
+
+    def _unlink(self, *names):
+        return self._delete(*names)
+
+    def _incr(self, name, amount=1):
+        value = int(self._get(name) or 0) + amount
+        entry = self._alive(self.encode(name))
+        self.data[self.encode(name)] = (self.encode(value), entry[1] if entry else None)
+        return value
+
+    def _pexpire(self, name, time):
+        return self._expire(name, time / 1000)
+
+    def _eval(self, script, numkeys, *args):
+        return self.scripts[script](self, args[:numkeys], args[numkeys:])
+
+    def _publish(self, channel, message):
+        subscribers = self.subscribers[self.encode(channel)]
+        for subscriber in subscribers:
+            subscriber.messages.put_nowait({"type": "message", "data": message})
+        return len(subscribers)
+
+
+def emulate_caronte_scripts(fake_redis: FakeRedis):
+    from caronte.src.repositories.authentication.redis_lock_manager.repository import (
+        RedisLockManagerRepository,
+    )
+    from caronte.src.repositories.cache.repository import Cache
+
+    def compare_and_delete(redis, keys, args):
+        if redis._get(keys[0]) != redis.encode(args[0]):
+            return 0
+        return redis._delete(keys[0])
+
+    def compare_and_pexpire(redis, keys, args):
+        if redis._get(keys[0]) != redis.encode(args[0]):
+            return 0
+        return int(redis._pexpire(keys[0], int(args[1])))
+
+    def fenced_set_and_publish(redis, keys, args):
+        if redis._get(keys[1]) != redis.encode(args[2]):
+            return 0
+        redis._set(keys[0], args[0], ex=int(args[1]) or None)
+        redis._publish(keys[0], args[0])
+        return 1
+
+    fake_redis.emulate_script(Cache.delete_if_equals_script, compare_and_delete)
+    fake_redis.emulate_script(
+        RedisLockManagerRepository.unlock_script, compare_and_delete
+    )
+    fake_redis.emulate_script(
+        RedisLockManagerRepository.extend_script, compare_and_pexpire
+    )
+    fake_redis.emulate_script(
+        Cache.fenced_set_and_publish_script, fenced_set_and_publish
+    )
@@ -0,0 +1,65 @@
+"""Compares the CPU spent per request encoding the request body and decoding the
+response body with the stdlib ``json`` module versus ``orjson``.
+
+    python -m benchmarks.json_serialization
+"""
+import json
+from datetime import datetime
+from timeit import repeat
+
+import orjson
+from pytz import timezone
+
+
+ROUNDS = 5
+CALLS = 20000
+
+
+def request_body() -> dict:
+    return {
+        "codigoCliente": 123456,
+        "controle": {
+            "dataHoraCliente": datetime.now(tz=timezone("America/Sao_Paulo")),
+            "recurso": {"codigo": "1", "sigla": "CARONTE"},
+            "origem": {"nome": "caronte", "chave": "key", "endereco": "127.0.0.1"},
+        },
+    }
+
+
+def response_body() -> bytes:
+    position = {
+        "ativo": "PETR4",
+        "quantidade": 100,
+        "precoMedio": 32.15,
+        "dataHoraAtualizacao": "2022-10-18T10:00:00-03:00",
+    }
+    return orjson.dumps(
+        {"posicoes": [position] * 50, "tokenAcesso": {"token": "x" * 512}}
+    )
+
+
+def microseconds_per_call(statement) -> float:
+    return min(repeat(statement, number=CALLS, repeat=ROUNDS)) / CALLS * 1e6
+
+
+def main() -> dict:
+    body = request_body()
+    payload = response_body()
+    stdlib_encode = microseconds_per_call(
+        lambda: json.dumps(body, default=str).encode()
+    )
+    orjson_encode = microseconds_per_call(lambda: orjson.dumps(body))
+    stdlib_decode = microseconds_per_call(lambda: json.loads(payload))
+    orjson_decode = microseconds_per_call(lambda: orjson.loads(payload))
+    return {
+        "encode_us": {"stdlib": stdlib_encode, "orjson": orjson_encode},
+        "decode_us": {"stdlib": stdlib_decode, "orjson": orjson_decode},
+        "saved_us_per_request": stdlib_encode
+        + stdlib_decode
+        - orjson_encode
+        - orjson_decode,
+    }
+
+
+if __name__ == "__main__":
+    print(orjson.dumps(main(), option=orjson.OPT_INDENT_2).decode())
@@ -0,0 +1,203 @@
+"""Drives ``ExchangeCompanyApi.request_as_client`` against a local fake Ouroinvest
+exchange and reports throughput, latency percentiles and Redis commands per request.
+Results are written as JSON so runs can be compared between commits with
+``benchmarks.compare``.
+
+    python -m benchmarks.request_as_client --concurrency 100 --clients 1000 \\
+        --requests 20000 --output results/head.json
+"""
+import argparse
+import asyncio
+import platform
+import subprocess
+from collections import Counter
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from random import Random
+from statistics import mean
+from time import perf_counter
+from typing import List
+from unittest.mock import patch
+
+import orjson
+
+from benchmarks.environment import benchmark_config
+from benchmarks.fake_exchange import FakeExchange
+from benchmarks.fake_redis import FakeRedis, emulate_caronte_scripts
+
+
+BACKENDS = ("fake-redis", "memory", "redis")
+
+
+def parse_options(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=1000, help="distinct client ids")
+    parser.add_argument("--backend", choices=BACKENDS, default="fake-redis")
+    parser.add_argument("--redis-url", default="redis://127.0.0.1:6379")
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="business call seconds"
+    )
+    parser.add_argument("--jitter", type=float, default=0, help="extra random seconds")
+    parser.add_argument("--token-latency", type=float, default=0.05)
+    parser.add_argument(
+        "--error-rate", type=float, default=0, help="share of 500 responses"
+    )
+    parser.add_argument(
+        "--reject-rate", type=float, default=0, help="share of 401 responses"
+    )
+    parser.add_argument(
+        "--warm-up", action="store_true", help="generate tokens before timing"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON result to this path")
+    return parser.parse_args(argv)
+
+
+def percentile(sorted_values: List[float], quantile: float) -> float:
+    index = min(int(quantile * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, check=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def drive(exchange_company_api, url: str, options: argparse.Namespace) -> dict:
+    from caronte import AllowedHTTPMethods
+
+    random = Random(options.seed)
+    client_ids = [random.randrange(options.clients) for _ in range(options.requests)]
+    pending_client_ids = iter(client_ids)
+    latencies = []
+    statuses = Counter()
+
+    async def worker():
+        for client_id in pending_client_ids:
+            started_at = perf_counter()
+            _, status, _ = await exchange_company_api.request_as_client(
+                AllowedHTTPMethods.GET, url, client_id
+            )
+            latencies.append(perf_counter() - started_at)
+            statuses[status.value] += 1
+
+    if options.warm_up:
+        await exchange_company_api.warm_up_client_tokens(set(client_ids))
+    started_at = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(options.concurrency)))
+    duration = perf_counter() - started_at
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "duration_s": duration,
+        "throughput_rps": len(latencies) / duration,
+        "latency_ms": {
+            "mean": mean(latencies) * 1000,
+            "p50": percentile(latencies, 0.5) * 1000,
+            "p90": percentile(latencies, 0.9) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "max": latencies[-1] * 1000,
+        },
+        "statuses": dict(statuses),
+    }
+
+
+async def run(options: argparse.Namespace) -> dict:
+    exchange = FakeExchange(
+        latency=options.latency,
+        jitter=options.jitter,
+        token_latency=options.token_latency,
+        error_rate=options.error_rate,
+        reject_rate=options.reject_rate,
+        seed=options.seed,
+    )
+    exchange_url = await exchange.start()
+    memory = options.backend == "memory"
+    try:
+        with benchmark_config(
+            OUROINVEST_DEFAULT_TOKEN_URL=f"{exchange_url}/token",
+            OUROINVEST_USER_TOKEN_URL=f"{exchange_url}/user-token",
+            CARONTE_CACHE_BACKEND="memory" if memory else "redis",
+            CARONTE_LOCK_BACKEND="memory" if memory else "redis",
+            CARONTE_REDIS_HOST=options.redis_url,
+        ), ExitStack() as stack:
+            from caronte import ExchangeCompanyApi
+            from caronte.src.infrastructures.redis.client.infrastructure import (
+                RedisInfrastructure,
+            )
+
+            fake_redis = None
+            if options.backend == "fake-redis":
+                fake_redis = FakeRedis()
+                emulate_caronte_scripts(fake_redis)
+                stack.enter_context(
+                    patch.object(
+                        RedisInfrastructure, "get_redis", return_value=fake_redis
+                    )
+                )
+            await ExchangeCompanyApi.startup()
+            try:
+                commands_before = await count_redis_commands(options, fake_redis)
+                result = await drive(
+                    ExchangeCompanyApi, f"{exchange_url}/business/positions", options
+                )
+                commands = (
+                    await count_redis_commands(options, fake_redis) - commands_before
+                )
+            finally:
+                await ExchangeCompanyApi.aclose()
+    finally:
+        await exchange.stop()
+    result["redis"] = {"commands_per_request": commands / result["requests"]}
+    if fake_redis is not None:
+        result["redis"]["round_trips_per_request"] = (
+            fake_redis.round_trips / result["requests"]
+        )
+        result["redis"]["commands"] = dict(fake_redis.commands)
+    result["exchange_calls"] = dict(exchange.calls)
+    return result
+
+
+async def count_redis_commands(
+    options: argparse.Namespace, fake_redis: FakeRedis
+) -> int:
+    if fake_redis is not None:
+        return sum(fake_redis.commands.values())
+    if options.backend == "memory":
+        return 0
+    from caronte.src.infrastructures.redis.client.infrastructure import (
+        RedisInfrastructure,
+    )
+
+    stats = await RedisInfrastructure.get_redis().info("stats")
+    return stats["total_commands_processed"]
+
+
+def main(argv: List[str] = None) -> dict:
+    options = parse_options(argv)
+    result = {
+        "benchmark": "request_as_client",
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+        "options": {
+            key: value for key, value in vars(options).items() if key != "output"
+        },
+        **asyncio.run(run(options)),
+    }
+    payload = orjson.dumps(result, option=orjson.OPT_INDENT_2)
+    if options.output:
+        with open(options.output, "wb") as output:
+            output.write(payload)
+    print(payload.decode())
+    return result
+
+
+if __name__ == "__main__":
+    main()
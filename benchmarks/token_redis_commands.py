@@ -0,0 +1,80 @@
+"""Counts the Redis commands and round trips issued per ``TokenService.get_user_token``
+call for the cold, Redis-hit and in-process-hit paths.
+
+    python -m benchmarks.token_redis_commands
+"""
+import asyncio
+from unittest.mock import patch
+
+import orjson
+
+from benchmarks.environment import benchmark_config
+from benchmarks.fake_redis import FakeRedis, emulate_caronte_scripts
+
+
+CALLS = 1000
+TOKEN_CONTENT = {"tokenAcesso": {"token": "token"}}
+
+
+async def measure(
+    token_service, fake_redis: FakeRedis, clear_local_cache: bool
+) -> dict:
+    fake_redis.reset_counters()
+    for client_id in range(CALLS):
+        if clear_local_cache and hasattr(token_service, "local_cache"):
+            token_service.local_cache.clear()
+        await token_service.get_user_token(client_id=client_id)
+    return {
+        "commands_per_call": sum(fake_redis.commands.values()) / CALLS,
+        "round_trips_per_call": fake_redis.round_trips / CALLS,
+        "commands": dict(fake_redis.commands),
+    }
+
+
+async def measure_warm(token_service, fake_redis: FakeRedis) -> dict:
+    await measure(token_service, fake_redis, False)
+    return await measure(token_service, fake_redis, False)
+
+
+async def main() -> dict:
+    from aioredlock import Lock
+
+    from caronte.src.domain.enums.response import CaronteStatus
+    from caronte.src.domain.models.authentication.response.model import (
+        LockAuthenticationStatus,
+        UnlockAuthenticationStatus,
+    )
+    from caronte.src.repositories.authentication.distribuited_lock_manager.repository import (
+        AuthenticationLockManagerRepository,
+    )
+    from caronte.src.repositories.cache.repository import Cache
+    from caronte.src.service.token import TokenService
+    from caronte.src.transports.ouroinvest.transport import HTTPTransport
+
+    fake_redis = FakeRedis()
+    emulate_caronte_scripts(fake_redis)
+    lock = Lock(None, "lock", "benchmark", lock_timeout=10, valid=True)
+    with patch.object(Cache, "get_redis", return_value=fake_redis), patch.object(
+        AuthenticationLockManagerRepository,
+        "lock_authentication",
+        return_value=(True, LockAuthenticationStatus.SUCCESS, lock),
+    ), patch.object(
+        AuthenticationLockManagerRepository,
+        "unlock_authentication",
+        return_value=(True, UnlockAuthenticationStatus.SUCCESS),
+    ), patch.object(
+        HTTPTransport,
+        "request_method",
+        return_value=(True, CaronteStatus.SUCCESS, TOKEN_CONTENT),
+    ):
+        return {
+            "user_token_generated": await measure(TokenService, fake_redis, False),
+            "user_token_redis_hit": await measure(TokenService, fake_redis, True),
+            "user_token_local_hit": await measure_warm(TokenService, fake_redis),
+        }
+
+
+if __name__ == "__main__":
+    with benchmark_config():
+        results = asyncio.run(main())
+    print(orjson.dumps(results, option=orjson.OPT_INDENT_2).decode())
@@ -1,7 +1,22 @@
 from caronte.main import ExchangeCompanyApi
 from caronte.src.domain.enums.response import CaronteStatus
-from caronte.src.domain.models.authentication.response.model import CaronteStatusResponse
+from caronte.src.domain.models.authentication.response.model import (
+    CaronteStatusResponse,
+)
+from caronte.src.domain.enums.hook import HookEvent
 from caronte.src.domain.enums.http_methods import AllowedHTTPMethods
+from caronte.src.domain.models.call_context.model import CallContext
+from caronte.src.domain.models.request.model import ClientRequest
+from caronte.src.infrastructures.env_config import Settings
 
 
-__all__ = ["AllowedHTTPMethods", "ExchangeCompanyApi", "CaronteStatusResponse", "CaronteStatus"]
+__all__ = [
+    "AllowedHTTPMethods",
+    "CallContext",
+    "ClientRequest",
+    "ExchangeCompanyApi",
+    "CaronteStatusResponse",
+    "CaronteStatus",
+    "HookEvent",
+    "Settings",
+]
@@ -1,38 +1,122 @@
+# Standards
+import asyncio
+from functools import partial
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+# Third party
+from etria_logger import Gladsheim
+
 # Caronte
+from caronte.src.domain.enums.hook import HookEvent
 from caronte.src.domain.enums.http_methods import AllowedHTTPMethods
 from caronte.src.domain.enums.response import CaronteStatus
 from caronte.src.domain.exceptions.base_exceptions.exception import ServiceException
-from caronte.src.domain.models.authentication.response.model import CaronteStatusResponse
+from caronte.src.domain.exceptions.service.exception import DeadlineExceeded
+from caronte.src.domain.models.authentication.response.model import (
+    CaronteStatusResponse,
+)
+from caronte.src.domain.models.call_context.model import CallContext
+from caronte.src.domain.models.deadline.model import Deadline
+from caronte.src.domain.models.request.model import ClientRequest
+from caronte.src.infrastructures.env_config import Setting, Settings, positive_int
+from caronte.src.infrastructures.hooks import Hooks, current_call_context
+from caronte.src.infrastructures.metrics import Metrics
 from caronte.src.service.token import TokenService
 from caronte.src.transports.ouroinvest.transport import HTTPTransport
 
-# Third party
-from etria_logger import Gladsheim
-
 
 class ExchangeCompanyApi:
+    batch_concurrency = Setting(
+        "CARONTE_BATCH_REQUEST_CONCURRENCY", default=50, cast=positive_int
+    )
+    hooks = Hooks()
+
+    @classmethod
+    async def startup(cls):
+        cls._validate_settings()
+        await HTTPTransport.startup()
+
+    @classmethod
+    def reload_settings(cls):
+        Settings.reload()
+        cls._validate_settings()
+
+    @classmethod
+    async def aclose(cls):
+        await TokenService.stop_company_token_refresh()
+        await HTTPTransport.aclose()
+
+    @classmethod
+    def _validate_settings(cls):
+        Settings.validate(cls, TokenService, HTTPTransport)
+        components = [
+            TokenService.cache,
+            TokenService.lock_manager,
+            TokenService.local_cache,
+            HTTPTransport.circuit_breakers,
+            HTTPTransport.retry_budget,
+            Metrics,
+        ]
+        if HTTPTransport.rate_limiter.enabled:
+            components.append(HTTPTransport.rate_limiter)
+        Settings.validate(*components)
+
+    @classmethod
+    def get_circuit_breakers_state(cls) -> Dict[str, dict]:
+        return HTTPTransport.get_circuit_breakers_state()
+
+    @classmethod
+    def get_metrics(cls) -> str:
+        return Metrics.render()
+
+    @classmethod
+    def start_company_token_refresh(cls):
+        TokenService.start_company_token_refresh()
+
+    @classmethod
+    async def stop_company_token_refresh(cls):
+        await TokenService.stop_company_token_refresh()
+
+    @classmethod
+    async def warm_up_client_tokens(
+        cls,
+        client_ids: Iterable[int],
+        concurrency: int = None,
+        on_progress: Callable[[int, CaronteStatus], None] = None,
+    ) -> Dict[int, CaronteStatus]:
+        return await TokenService.warm_up_user_tokens(
+            client_ids=client_ids, concurrency=concurrency, on_progress=on_progress
+        )
+
     @classmethod
     async def request_as_company(
         cls,
         method: AllowedHTTPMethods,
         url: str,
-        body: dict = None
+        body: dict = None,
+        timeout: float = None,
+        correlation_id: str = None,
+        idempotent: bool = None,
     ) -> CaronteStatusResponse:
-        try:
-            headers = await TokenService.get_company_token()
-            response = await HTTPTransport.request_method(
-                method=method,
-                url=url,
-                body=body,
-                headers=headers
-            )
-            return response
-        except ServiceException as ex:
-            Gladsheim.info(message=ex.msg)
-            return CaronteStatusResponse((False, ex.code, None))
-        except Exception as ex:
-            Gladsheim.error(error=ex)
-            return CaronteStatusResponse((False, CaronteStatus.UNEXPECTED_ERROR, None))
+        return await cls._request(
+            method=method,
+            url=url,
+            body=body,
+            get_headers=TokenService.get_company_token,
+            invalidate_headers=TokenService.invalidate_company_token,
+            send=partial(HTTPTransport.request_method, idempotent=idempotent),
+            timeout=timeout,
+            correlation_id=correlation_id,
+        )
 
     @classmethod
     async def request_as_client(
@@ -41,18 +125,272 @@ class ExchangeCompanyApi:
         url: str,
         client_id: int,
         body: dict = None,
+        timeout: float = None,
+        correlation_id: str = None,
+        idempotent: bool = None,
+    ) -> CaronteStatusResponse:
+        return await cls._request(
+            method=method,
+            url=url,
+            body=body,
+            get_headers=partial(TokenService.get_user_token, client_id=client_id),
+            invalidate_headers=partial(TokenService.invalidate_user_token, client_id),
+            client_id=client_id,
+            send=partial(HTTPTransport.request_method, idempotent=idempotent),
+            timeout=timeout,
+            correlation_id=correlation_id,
+        )
+
+    @classmethod
+    async def stream_as_company(
+        cls,
+        method: AllowedHTTPMethods,
+        url: str,
+        body: dict = None,
+        json_items: bool = False,
+        timeout: float = None,
+        correlation_id: str = None,
+        idempotent: bool = None,
+    ) -> CaronteStatusResponse:
+        return await cls._request(
+            method=method,
+            url=url,
+            body=body,
+            get_headers=TokenService.get_company_token,
+            invalidate_headers=TokenService.invalidate_company_token,
+            send=partial(
+                HTTPTransport.request_stream,
+                json_items=json_items,
+                idempotent=idempotent,
+            ),
+            timeout=timeout,
+            correlation_id=correlation_id,
+        )
+
+    @classmethod
+    async def stream_as_client(
+        cls,
+        method: AllowedHTTPMethods,
+        url: str,
+        client_id: int,
+        body: dict = None,
+        json_items: bool = False,
+        timeout: float = None,
+        correlation_id: str = None,
+        idempotent: bool = None,
     ) -> CaronteStatusResponse:
+        return await cls._request(
+            method=method,
+            url=url,
+            body=body,
+            get_headers=partial(TokenService.get_user_token, client_id=client_id),
+            invalidate_headers=partial(TokenService.invalidate_user_token, client_id),
+            client_id=client_id,
+            send=partial(
+                HTTPTransport.request_stream,
+                json_items=json_items,
+                idempotent=idempotent,
+            ),
+            timeout=timeout,
+            correlation_id=correlation_id,
+        )
+
+    @classmethod
+    async def request_as_clients(
+        cls, requests: Iterable[ClientRequest], concurrency: int = None
+    ) -> List[CaronteStatusResponse]:
+        responses = {}
+        async for index, response in cls.iter_request_as_clients(requests, concurrency):
+            responses[index] = response
+        return [responses[index] for index in range(len(responses))]
+
+    @classmethod
+    async def iter_request_as_clients(
+        cls, requests: Iterable[ClientRequest], concurrency: int = None
+    ) -> AsyncIterator[Tuple[int, CaronteStatusResponse]]:
+        if concurrency is None:
+            concurrency = cls.batch_concurrency
+        elif concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        pending_requests = enumerate(requests)
+        user_tokens = {}
+        responses = asyncio.Queue()
+
+        async def worker():
+            try:
+                for index, request in pending_requests:
+                    method, url, client_id, body = ClientRequest(*request)
+                    response = await cls._request(
+                        method=method,
+                        url=url,
+                        body=body,
+                        get_headers=partial(
+                            cls._get_shared_user_token, client_id, user_tokens
+                        ),
+                        invalidate_headers=partial(
+                            cls._invalidate_shared_user_token, client_id, user_tokens
+                        ),
+                        client_id=client_id,
+                    )
+                    responses.put_nowait((index, response))
+                responses.put_nowait(None)
+            except Exception as ex:
+                responses.put_nowait(ex)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
         try:
-            headers = await TokenService.get_user_token(
-                client_id=client_id
+            running_workers = len(workers)
+            while running_workers:
+                if (response := await responses.get()) is None:
+                    running_workers -= 1
+                    continue
+                if isinstance(response, Exception):
+                    raise response
+                yield response
+        finally:
+            for running_worker in workers:
+                running_worker.cancel()
+
+    @classmethod
+    async def _get_shared_user_token(cls, client_id: int, user_tokens: dict) -> dict:
+        if (user_token := user_tokens.get(client_id)) is None:
+            user_token = asyncio.ensure_future(
+                TokenService.get_user_token(client_id=client_id)
             )
-            response = await HTTPTransport.request_method(
-                method=method, url=url, body=body, headers=headers
+            user_tokens[client_id] = user_token
+            user_token.add_done_callback(
+                partial(cls._discard_failed_user_token, client_id, user_tokens)
             )
-            return response
-        except ServiceException as ex:
-            Gladsheim.info(message=ex.msg)
-            return CaronteStatusResponse((False, ex.code, None))
-        except Exception as ex:
-            Gladsheim.error(error=ex)
-            return CaronteStatusResponse((False, CaronteStatus.UNEXPECTED_ERROR, None))
+        return await asyncio.shield(user_token)
+
+    @staticmethod
+    def _discard_failed_user_token(
+        client_id: int, user_tokens: dict, user_token: asyncio.Future
+    ):
+        if user_tokens.get(client_id) is not user_token:
+            return
+        if user_token.cancelled() or user_token.exception() is not None:
+            del user_tokens[client_id]
+
+    @staticmethod
+    async def _invalidate_shared_user_token(
+        client_id: int, user_tokens: dict, token: dict
+    ):
+        user_token = user_tokens.get(client_id)
+        if (
+            user_token is not None
+            and user_token.done()
+            and not user_token.cancelled()
+            and user_token.exception() is None
+            and user_token.result() == token
+        ):
+            del user_tokens[client_id]
+        await TokenService.invalidate_user_token(client_id, token)
+
+    @classmethod
+    async def _request(
+        cls,
+        method: AllowedHTTPMethods,
+        url: str,
+        body: dict,
+        get_headers: Callable[[], Awaitable[dict]],
+        invalidate_headers: Callable[[dict], Awaitable[None]],
+        send: Callable[..., Awaitable[CaronteStatusResponse]] = None,
+        timeout: float = None,
+        client_id: int = None,
+        correlation_id: str = None,
+    ) -> CaronteStatusResponse:
+        deadline = Deadline(timeout) if timeout is not None else None
+        context = CallContext(
+            method, url, client_id=client_id, correlation_id=correlation_id
+        )
+        context_token = current_call_context.set(context)
+        cls.hooks.emit(HookEvent.REQUEST_START, context)
+        with Metrics.stage("request"):
+            try:
+                response = await cls._send_with_replay(
+                    partial(
+                        send or HTTPTransport.request_method,
+                        method=method,
+                        url=url,
+                        body=body,
+                    ),
+                    get_headers,
+                    invalidate_headers,
+                    context,
+                    deadline,
+                )
+            except ServiceException as ex:
+                Gladsheim.info(message=ex.msg, correlation_id=context.correlation_id)
+                response = CaronteStatusResponse((False, ex.code, None))
+                cls.hooks.emit(
+                    HookEvent.ERROR,
+                    context,
+                    error=ex,
+                    status=ex.code,
+                    elapsed=context.elapsed(),
+                )
+            except Exception as ex:
+                Gladsheim.error(error=ex, correlation_id=context.correlation_id)
+                response = CaronteStatusResponse(
+                    (False, CaronteStatus.UNEXPECTED_ERROR, None)
+                )
+                cls.hooks.emit(
+                    HookEvent.ERROR,
+                    context,
+                    error=ex,
+                    status=CaronteStatus.UNEXPECTED_ERROR,
+                    elapsed=context.elapsed(),
+                )
+            else:
+                cls.hooks.emit(
+                    HookEvent.RESPONSE,
+                    context,
+                    status=response[1],
+                    elapsed=context.elapsed(),
+                )
+            finally:
+                current_call_context.reset(context_token)
+        Metrics.increment("responses_total", status=response[1].value)
+        return response
+
+    @classmethod
+    async def _resolve_headers(
+        cls,
+        get_headers: Callable[[], Awaitable[dict]],
+        context: CallContext,
+        deadline: Optional[Deadline],
+    ) -> dict:
+        started_at = context.elapsed()
+        headers = await cls._within_deadline(get_headers(), deadline)
+        cls.hooks.emit(
+            HookEvent.TOKEN_RESOLVED, context, elapsed=context.elapsed() - started_at
+        )
+        return headers
+
+    @classmethod
+    async def _send_with_replay(
+        cls,
+        send: Callable[..., Awaitable[CaronteStatusResponse]],
+        get_headers: Callable[[], Awaitable[dict]],
+        invalidate_headers: Callable[[dict], Awaitable[None]],
+        context: CallContext,
+        deadline: Optional[Deadline],
+    ) -> CaronteStatusResponse:
+        headers = await cls._resolve_headers(get_headers, context, deadline)
+        response = await cls._within_deadline(send(headers=headers), deadline)
+        _, caronte_status, _ = response
+        if caronte_status in TokenService.rejected_token_statuses:
+            await cls._within_deadline(invalidate_headers(headers), deadline)
+            headers = await cls._resolve_headers(get_headers, context, deadline)
+            response = await cls._within_deadline(send(headers=headers), deadline)
+        return response
+
+    @staticmethod
+    async def _within_deadline(awaitable: Awaitable, deadline: Optional[Deadline]):
+        if deadline is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, deadline.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded()
@@ -0,0 +1,13 @@
+# Standards
+from enum import Enum
+
+
+class CacheBackendType(Enum):
+    REDIS = "redis"
+    MEMORY = "memory"
+
+
+class LockBackendType(Enum):
+    REDLOCK = "redlock"
+    REDIS = "redis"
+    MEMORY = "memory"
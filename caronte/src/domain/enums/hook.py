@@ -0,0 +1,9 @@
+# Standards
+from enum import Enum
+
+
+class HookEvent(Enum):
+    REQUEST_START = "on_request_start"
+    TOKEN_RESOLVED = "on_token_resolved"
+    RESPONSE = "on_response"
+    ERROR = "on_error"
@@ -0,0 +1,7 @@
+# Standards
+from enum import Enum
+
+
+class RateLimitBucket(Enum):
+    TOKEN = "token"
+    BUSINESS = "business"
@@ -0,0 +1,7 @@
+# Standards
+from enum import Enum
+
+
+class RedisTopology(Enum):
+    STANDALONE = "standalone"
+    SENTINEL = "sentinel"
@@ -8,5 +8,9 @@ class CaronteStatus(Enum):
     UNAUTHORIZED = "invalid_token"
     BAD_REQUEST = "expired_token"
     TOKEN_NOT_FOUND = "token_not_found"
+    TOKEN_GENERATION_TIMEOUT = "token_generation_timeout"
+    DEADLINE_EXCEEDED = "deadline_exceeded"
+    CIRCUIT_OPEN = "circuit_open"
+    RATE_LIMITED = "rate_limited"
+    INVALID_SETTINGS = "invalid_settings"
     UNEXPECTED_ERROR = "unexpected_error_has_occurred"
-
@@ -24,3 +24,10 @@ class TransportException(Exception):
         self.msg = msg
         self.code = code
         super().__init__(args, kwargs)
+
+
+class InfrastructureException(Exception):
+    def __init__(self, msg, code, *args, **kwargs):
+        self.msg = msg
+        self.code = code
+        super().__init__(args, kwargs)
@@ -0,0 +1,13 @@
+# Caronte
+from caronte.src.domain.enums.response import CaronteStatus
+from caronte.src.domain.exceptions.base_exceptions.exception import (
+    InfrastructureException,
+)
+
+
+class InvalidSettings(InfrastructureException):
+    def __init__(self, errors: dict, *args, **kwargs):
+        self.msg = f"Invalid caronte settings: {errors}"
+        self.code = CaronteStatus.INVALID_SETTINGS
+        self.errors = errors
+        super().__init__(self.msg, self.code, args, kwargs)
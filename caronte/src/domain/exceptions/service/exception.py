@@ -8,3 +8,31 @@ class TokenNotFoundInContent(ServiceException):
         self.msg = "Token not found in result content from exchange API"
         self.code = CaronteStatus.TOKEN_NOT_FOUND
         super().__init__(self.msg, self.code, args, kwargs)
+
+
+class TokenGenerationTimeout(ServiceException):
+    def __init__(self, *args, **kwargs):
+        self.msg = "Timed out waiting for the token generation lock"
+        self.code = CaronteStatus.TOKEN_GENERATION_TIMEOUT
+        super().__init__(self.msg, self.code, args, kwargs)
+
+
+class DeadlineExceeded(ServiceException):
+    def __init__(self, *args, **kwargs):
+        self.msg = "The request deadline was exceeded"
+        self.code = CaronteStatus.DEADLINE_EXCEEDED
+        super().__init__(self.msg, self.code, args, kwargs)
+
+
+class CompanyTokenRejected(ServiceException):
+    def __init__(self, code, *args, **kwargs):
+        self.msg = "Company token rejected by exchange API"
+        self.code = code
+        super().__init__(self.msg, self.code, args, kwargs)
+
+
+class ExchangeRequestFailed(ServiceException):
+    def __init__(self, code, *args, **kwargs):
+        self.msg = "Token request to exchange API failed"
+        self.code = code
+        super().__init__(self.msg, self.code, args, kwargs)
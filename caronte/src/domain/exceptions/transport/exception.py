@@ -0,0 +1,17 @@
+# Caronte
+from caronte.src.domain.enums.response import CaronteStatus
+from caronte.src.domain.exceptions.base_exceptions.exception import TransportException
+
+
+class CircuitBreakerOpen(TransportException):
+    def __init__(self, *args, **kwargs):
+        self.msg = "Circuit breaker is open for the exchange endpoint"
+        self.code = CaronteStatus.CIRCUIT_OPEN
+        super().__init__(self.msg, self.code, args, kwargs)
+
+
+class RateLimitExceeded(TransportException):
+    def __init__(self, *args, **kwargs):
+        self.msg = "Timed out waiting for an exchange rate limit permit"
+        self.code = CaronteStatus.RATE_LIMITED
+        super().__init__(self.msg, self.code, args, kwargs)
@@ -0,0 +1,27 @@
+# Standards
+from time import perf_counter
+from typing import Optional
+from uuid import uuid4
+
+# Caronte
+from caronte.src.domain.enums.http_methods import AllowedHTTPMethods
+
+
+class CallContext:
+    def __init__(
+        self,
+        method: AllowedHTTPMethods,
+        url: str,
+        client_id: int = None,
+        correlation_id: str = None,
+    ):
+        self.method = method
+        self.url = url
+        self.client_id = client_id
+        self.correlation_id = correlation_id or uuid4().hex
+        self.trace_headers = {}
+        self.attributes = {}
+        self.started_at = perf_counter()
+
+    def elapsed(self, since: Optional[float] = None) -> float:
+        return perf_counter() - (self.started_at if since is None else since)
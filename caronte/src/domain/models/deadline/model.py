@@ -0,0 +1,14 @@
+# Standards
+from time import monotonic
+
+
+class Deadline:
+    def __init__(self, timeout: float):
+        self.expires_at = monotonic() + timeout
+
+    def remaining(self) -> float:
+        return max(self.expires_at - monotonic(), 0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
@@ -0,0 +1,12 @@
+# Standards
+from typing import NamedTuple, Optional
+
+# Caronte
+from caronte.src.domain.enums.http_methods import AllowedHTTPMethods
+
+
+class ClientRequest(NamedTuple):
+    method: AllowedHTTPMethods
+    url: str
+    client_id: int
+    body: Optional[dict] = None
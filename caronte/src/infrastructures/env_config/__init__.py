@@ -1,23 +1,9 @@
-import os
-import platform
-from decouple import Config, RepositoryEnv
+from caronte.src.infrastructures.env_config.infrastructure import (
+    Setting,
+    Settings,
+    positive_int,
+)
 
+config = Settings.get
 
-def get_config(base_path: str) -> Config:
-    path = os.path.join(base_path, "opt", "envs", "caronte.lionx.com.br", ".env")
-    path = str(path)
-    config = Config(RepositoryEnv(path))
-    return config
-
-
-SYSTEM = platform.system()
-supported_systems = {
-    "Linux": "/",
-    "Darwin": "/",
-    "Windows": "C:/",
-}
-
-base_path = supported_systems.get(SYSTEM)
-config = get_config(base_path)
-
-__all__ = config
+__all__ = ["config", "positive_int", "Setting", "Settings"]
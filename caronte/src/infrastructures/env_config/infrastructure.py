@@ -0,0 +1,148 @@
+import os
+import platform
+from typing import Any, Callable, Iterable, List
+
+from decouple import (
+    Config,
+    RepositoryEmpty,
+    RepositoryEnv,
+    Undefined,
+    strtobool,
+    undefined,
+)
+
+from caronte.src.domain.exceptions.infrastructure.exception import InvalidSettings
+
+
+class Settings:
+    env_file_variable = "CARONTE_ENV_FILE"
+    supported_systems = {
+        "Linux": "/",
+        "Darwin": "/",
+        "Windows": "C:/",
+    }
+    version = 0
+    __source = None
+    __injected_source = None
+    __overrides = {}
+    __values = {}
+    __settings = []
+
+    @classmethod
+    def get(cls, key: str, default: Any = undefined, cast: Callable = undefined) -> Any:
+        if key in cls.__overrides:
+            return cls.__cast_override(cls.__overrides[key], cast)
+        return cls.__get_source()(key, default=default, cast=cast)
+
+    @classmethod
+    def resolve(cls, setting: "Setting") -> Any:
+        try:
+            return cls.__values[setting]
+        except KeyError:
+            value = cls.get(setting.key, default=setting.default, cast=setting.cast)
+            cls.__values[setting] = value
+            return value
+
+    @classmethod
+    def register(cls, setting: "Setting"):
+        cls.__settings.append(setting)
+
+    @classmethod
+    def validate(cls, *owners: type):
+        errors = {}
+        for setting in cls.__settings:
+            if owners and not setting.belongs_to(owners):
+                continue
+            try:
+                cls.resolve(setting)
+            except Exception as error:
+                errors[setting.key] = str(error) or error.__class__.__name__
+        if errors:
+            raise InvalidSettings(errors)
+
+    @classmethod
+    def configure(cls, source: Callable = None):
+        cls.__injected_source = source
+        cls.reload()
+
+    @classmethod
+    def override(cls, **values):
+        cls.__overrides.update(values)
+        cls.__invalidate()
+
+    @classmethod
+    def clear_overrides(cls):
+        cls.__overrides.clear()
+        cls.__invalidate()
+
+    @classmethod
+    def reload(cls):
+        cls.__source = None
+        cls.__invalidate()
+
+    @classmethod
+    def get_keys(cls) -> List[str]:
+        return sorted({setting.key for setting in cls.__settings})
+
+    @staticmethod
+    def __cast_override(value: Any, cast: Callable) -> Any:
+        if not isinstance(value, str) or isinstance(cast, Undefined):
+            return value
+        if cast is bool:
+            return bool(strtobool(value)) if value else False
+        return cast(value)
+
+    @classmethod
+    def __invalidate(cls):
+        cls.__values.clear()
+        cls.version += 1
+
+    @classmethod
+    def __get_source(cls) -> Callable:
+        if cls.__injected_source is not None:
+            return cls.__injected_source
+        if cls.__source is None:
+            cls.__source = cls.__load_source()
+        return cls.__source
+
+    @classmethod
+    def __load_source(cls) -> Config:
+        path = os.environ.get(cls.env_file_variable) or cls.__get_default_path()
+        if path and os.path.isfile(path):
+            return Config(RepositoryEnv(path))
+        return Config(RepositoryEmpty())
+
+    @classmethod
+    def __get_default_path(cls) -> str:
+        base_path = cls.supported_systems.get(platform.system())
+        if base_path is None:
+            return ""
+        return os.path.join(base_path, "opt", "envs", "caronte.lionx.com.br", ".env")
+
+
+def positive_int(value: Any) -> int:
+    value = int(value)
+    if value < 1:
+        raise ValueError(f"{value} is not a positive integer")
+    return value
+
+
+class Setting:
+    def __init__(self, key: str, default: Any = undefined, cast: Callable = undefined):
+        self.key = key
+        self.default = default
+        self.cast = cast
+        self.owner = None
+        Settings.register(self)
+
+    def __set_name__(self, owner, name):
+        self.owner = owner
+
+    def __get__(self, instance, owner) -> Any:
+        return Settings.resolve(self)
+
+    def belongs_to(self, owners: Iterable[type]) -> bool:
+        return self.owner is not None and any(
+            isinstance(owner, type) and issubclass(owner, self.owner)
+            for owner in owners
+        )
@@ -0,0 +1,3 @@
+from caronte.src.infrastructures.hooks.infrastructure import Hooks, current_call_context
+
+__all__ = ["Hooks", "current_call_context"]
@@ -0,0 +1,42 @@
+from contextlib import suppress
+from contextvars import ContextVar
+from typing import Callable, Optional, Union
+
+from etria_logger import Gladsheim
+
+from caronte.src.domain.enums.hook import HookEvent
+from caronte.src.domain.models.call_context.model import CallContext
+
+current_call_context: ContextVar[Optional[CallContext]] = ContextVar(
+    "caronte_call_context", default=None
+)
+
+
+class Hooks:
+    def __init__(self):
+        self.__hooks = {event: [] for event in HookEvent}
+
+    def register(
+        self, event: Union[HookEvent, str], hook: Callable[..., None]
+    ) -> Callable[..., None]:
+        self.__hooks[HookEvent(event)].append(hook)
+        return hook
+
+    def unregister(self, event: Union[HookEvent, str], hook: Callable[..., None]):
+        with suppress(ValueError):
+            self.__hooks[HookEvent(event)].remove(hook)
+
+    def clear(self):
+        for hooks in self.__hooks.values():
+            hooks.clear()
+
+    def emit(self, event: HookEvent, context: CallContext, **details):
+        for hook in self.__hooks[event]:
+            try:
+                hook(context, **details)
+            except Exception as error:
+                Gladsheim.error(
+                    message=f"Hooks::emit::Error in {event.value} hook",
+                    correlation_id=context.correlation_id,
+                    error=error,
+                )
@@ -0,0 +1,3 @@
+from caronte.src.infrastructures.metrics.infrastructure import Metrics
+
+__all__ = ["Metrics"]
@@ -0,0 +1,153 @@
+from bisect import bisect_left
+from contextlib import nullcontext
+from time import perf_counter
+from typing import ContextManager, Dict, List, Tuple
+
+from caronte.src.infrastructures.env_config import Setting
+
+
+class Metrics:
+    enabled = Setting("CARONTE_METRICS_ENABLED", default=False, cast=bool)
+    namespace = "caronte"
+    latency_buckets = (
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1,
+        2.5,
+        5,
+        10,
+    )
+    definitions = {
+        "stage_duration_seconds": ("histogram", "Latency of each stage of a call."),
+        "stage_in_flight": ("gauge", "Calls currently running each stage."),
+        "token_cache_total": ("counter", "Token lookups by cache result."),
+        "token_generations_total": ("counter", "Token generations by result."),
+        "lock_attempts_total": ("counter", "Token generation lock attempts by result."),
+        "responses_total": ("counter", "Responses by Caronte status."),
+    }
+    __counters = {}
+    __gauges = {}
+    __histograms = {}
+    __disabled_stage = nullcontext()
+
+    @classmethod
+    def increment(cls, name: str, value: float = 1, **labels: str):
+        if not cls.enabled:
+            return
+        samples = cls.__counters.setdefault(name, {})
+        labels_key = tuple(sorted(labels.items()))
+        samples[labels_key] = samples.get(labels_key, 0) + value
+
+    @classmethod
+    def add(cls, name: str, value: float, **labels: str):
+        if not cls.enabled:
+            return
+        samples = cls.__gauges.setdefault(name, {})
+        labels_key = tuple(sorted(labels.items()))
+        samples[labels_key] = samples.get(labels_key, 0) + value
+
+    @classmethod
+    def observe(cls, name: str, value: float, **labels: str):
+        if not cls.enabled:
+            return
+        samples = cls.__histograms.setdefault(name, {})
+        labels_key = tuple(sorted(labels.items()))
+        histogram = samples.get(labels_key)
+        if histogram is None:
+            histogram = samples[labels_key] = [
+                [0] * (len(cls.latency_buckets) + 1),
+                0.0,
+            ]
+        bucket_counts, _ = histogram
+        bucket_counts[bisect_left(cls.latency_buckets, value)] += 1
+        histogram[1] += value
+
+    @classmethod
+    def stage(cls, stage: str) -> ContextManager:
+        if not cls.enabled:
+            return cls.__disabled_stage
+        return _Stage(cls, stage)
+
+    @classmethod
+    def render(cls) -> str:
+        lines = []
+        for name, (metric_type, description) in cls.definitions.items():
+            full_name = f"{cls.namespace}_{name}"
+            lines.append(f"# HELP {full_name} {description}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+            if metric_type == "histogram":
+                lines.extend(
+                    cls.__render_histogram(full_name, cls.__histograms.get(name, {}))
+                )
+                continue
+            samples = cls.__counters if metric_type == "counter" else cls.__gauges
+            for labels_key, value in samples.get(name, {}).items():
+                lines.append(f"{full_name}{cls.__format_labels(labels_key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def get_counters(cls) -> Dict[str, Dict[Tuple[Tuple[str, str], ...], float]]:
+        return {name: dict(samples) for name, samples in cls.__counters.items()}
+
+    @classmethod
+    def reset(cls):
+        cls.__counters.clear()
+        cls.__gauges.clear()
+        cls.__histograms.clear()
+
+    @classmethod
+    def __render_histogram(cls, full_name: str, samples: dict) -> List[str]:
+        lines = []
+        for labels_key, (bucket_counts, total) in samples.items():
+            cumulative_count = 0
+            for bound, count in zip((*cls.latency_buckets, "+Inf"), bucket_counts):
+                cumulative_count += count
+                bucket_labels = cls.__format_labels((*labels_key, ("le", str(bound))))
+                lines.append(f"{full_name}_bucket{bucket_labels} {cumulative_count}")
+            labels = cls.__format_labels(labels_key)
+            lines.append(f"{full_name}_sum{labels} {total}")
+            lines.append(f"{full_name}_count{labels} {cumulative_count}")
+        return lines
+
+    @staticmethod
+    def __format_labels(labels_key: Tuple[Tuple[str, str], ...]) -> str:
+        if not labels_key:
+            return ""
+        labels = ",".join(
+            '{}="{}"'.format(
+                label,
+                str(value)
+                .replace("\\", "\\\\")
+                .replace('"', '\\"')
+                .replace("\n", "\\n"),
+            )
+            for label, value in labels_key
+        )
+        return f"{{{labels}}}"
+
+
+class _Stage:
+    __slots__ = ("metrics", "stage", "started_at")
+
+    def __init__(self, metrics: type, stage: str):
+        self.metrics = metrics
+        self.stage = stage
+        self.started_at = None
+
+    def __enter__(self):
+        self.metrics.add("stage_in_flight", 1, stage=self.stage)
+        self.started_at = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(
+            "stage_duration_seconds", perf_counter() - self.started_at, stage=self.stage
+        )
+        self.metrics.add("stage_in_flight", -1, stage=self.stage)
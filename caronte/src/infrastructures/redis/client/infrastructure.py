@@ -1,13 +1,98 @@
+from typing import List, Tuple
+
 import redis.asyncio as aioredis
-from caronte.src.infrastructures.env_config import config
+from decouple import Csv
+from redis.asyncio.retry import Retry
+from redis.asyncio.sentinel import Sentinel
+from redis.backoff import EqualJitterBackoff
+
+from caronte.src.domain.enums.redis import RedisTopology
+from caronte.src.infrastructures.env_config import Setting
 
 
 class RedisInfrastructure:
     __redis = None
-    __url = f'{config("CARONTE_REDIS_HOST")}?db={config("CARONTE_REDIS_DB")}'
+    redis_host = Setting("CARONTE_REDIS_HOST")
+    redis_db = Setting("CARONTE_REDIS_DB")
+    redis_topology = Setting(
+        "CARONTE_REDIS_TOPOLOGY", default="standalone", cast=RedisTopology
+    )
+    redis_sentinels = Setting("CARONTE_REDIS_SENTINELS", default="", cast=Csv())
+    redis_sentinel_service_name = Setting(
+        "CARONTE_REDIS_SENTINEL_SERVICE_NAME", default="mymaster"
+    )
+    redis_max_connections = Setting(
+        "CARONTE_REDIS_MAX_CONNECTIONS", default=50, cast=int
+    )
+    redis_pool_timeout = Setting("CARONTE_REDIS_POOL_TIMEOUT", default=5, cast=float)
+    redis_socket_timeout = Setting(
+        "CARONTE_REDIS_SOCKET_TIMEOUT", default=2, cast=float
+    )
+    redis_socket_connect_timeout = Setting(
+        "CARONTE_REDIS_SOCKET_CONNECT_TIMEOUT", default=2, cast=float
+    )
+    redis_retry_on_timeout = Setting(
+        "CARONTE_REDIS_RETRY_ON_TIMEOUT", default=True, cast=bool
+    )
+    redis_retry_attempts = Setting("CARONTE_REDIS_RETRY_ATTEMPTS", default=3, cast=int)
+    redis_retry_backoff_base = Setting(
+        "CARONTE_REDIS_RETRY_BACKOFF_BASE", default=0.05, cast=float
+    )
+    redis_retry_backoff_max = Setting(
+        "CARONTE_REDIS_RETRY_BACKOFF_MAX", default=1, cast=float
+    )
+    redis_health_check_interval = Setting(
+        "CARONTE_REDIS_HEALTH_CHECK_INTERVAL", default=30, cast=int
+    )
 
     @classmethod
     def get_redis(cls):
-        if cls.__redis is None:
-            cls.__redis = aioredis.from_url(cls.__url)
-        return cls.__redis
+        if RedisInfrastructure.__redis is None:
+            RedisInfrastructure.__redis = cls.__create_redis()
+        return RedisInfrastructure.__redis
+
+    @classmethod
+    def __create_redis(cls):
+        topology = RedisTopology(cls.redis_topology)
+        options = cls.__get_connection_options()
+        options["retry_on_timeout"] = bool(cls.redis_retry_on_timeout)
+        if topology == RedisTopology.SENTINEL:
+            sentinel = Sentinel(
+                cls.__get_sentinel_addresses(),
+                sentinel_kwargs={
+                    "socket_timeout": options["socket_timeout"],
+                    "socket_connect_timeout": options["socket_connect_timeout"],
+                },
+                db=int(cls.redis_db),
+                **options,
+            )
+            return sentinel.master_for(cls.redis_sentinel_service_name)
+        connection_pool = aioredis.BlockingConnectionPool.from_url(
+            f"{cls.redis_host}?db={cls.redis_db}",
+            timeout=float(cls.redis_pool_timeout),
+            **options,
+        )
+        return aioredis.Redis(connection_pool=connection_pool)
+
+    @classmethod
+    def __get_connection_options(cls) -> dict:
+        backoff = EqualJitterBackoff(
+            cap=float(cls.redis_retry_backoff_max),
+            base=float(cls.redis_retry_backoff_base),
+        )
+        return {
+            "max_connections": int(cls.redis_max_connections),
+            "socket_timeout": float(cls.redis_socket_timeout),
+            "socket_connect_timeout": float(cls.redis_socket_connect_timeout),
+            "socket_keepalive": True,
+            "health_check_interval": int(cls.redis_health_check_interval),
+            "retry": Retry(backoff, int(cls.redis_retry_attempts)),
+        }
+
+    @classmethod
+    def __get_sentinel_addresses(cls) -> List[Tuple[str, int]]:
+        addresses = []
+        for address in cls.redis_sentinels:
+            host, _, port = address.rpartition(":")
+            addresses.append((host, int(port)))
+        return addresses
@@ -1,9 +1,26 @@
+from ast import literal_eval
+from typing import List, Union
+
 from aioredlock import Aioredlock
 
 # Jotunheimr
 from etria_logger import Gladsheim
 
 
+def parse_redis_urls(
+    redis_urls: Union[str, list, tuple]
+) -> List[Union[str, dict, tuple]]:
+    if isinstance(redis_urls, (list, tuple)):
+        return list(redis_urls)
+    redis_urls = redis_urls.strip()
+    if redis_urls.startswith("["):
+        parsed_urls = literal_eval(redis_urls)
+        if not isinstance(parsed_urls, list):
+            raise ValueError("redis_urls must be a list of urls")
+        return parsed_urls
+    return [url.strip() for url in redis_urls.split(",") if url.strip()]
+
+
 class RedLockManagerInfrastructure:
     red_lock_manager = None
 
@@ -21,7 +38,7 @@ class RedLockManagerInfrastructure:
         if cls.red_lock_manager is None:
             try:
                 cls.red_lock_manager = Aioredlock(
-                    eval(cls.redis_urls),
+                    parse_redis_urls(cls.redis_urls),
                     retry_count=cls.retry_count,
                     retry_delay_min=cls.retry_delay_min,
                     retry_delay_max=cls.retry_delay_max,
@@ -29,7 +46,11 @@ class RedLockManagerInfrastructure:
 
             except Exception as exception:
                 Gladsheim.error(
-                    message=f"RedisInfrastructure::_get_client::Error on client connection for the giving url",
+                    message=(
+                        "RedisInfrastructure::_get_client::"
+                        "Error on client connection for the giving url"
+                    ),
                     error=exception,
                 )
+                raise
         return cls.red_lock_manager
@@ -12,20 +12,32 @@ from caronte.src.domain.models.authentication.response.model import (
     UnlockAuthenticationResponse,
     UnlockAuthenticationStatus,
 )
-from caronte.src.infrastructures.env_config import config
+from caronte.src.infrastructures.env_config import Setting
 from caronte.src.infrastructures.redis.distribuited_lock_manager.infrastructure import (
     RedLockManagerInfrastructure,
+    parse_redis_urls,
 )
-
-
-class AuthenticationLockManagerRepository(RedLockManagerInfrastructure):
-
-    redis_urls = config("CARONTE_CLIENT_LOCK_MANAGER_REDIS_URLS")
-    retry_count = config("CARONTE_CLIENT_AUTHENTICATION_RETRY_COUNT")
-    retry_delay_min = config("CARONTE_CLIENT_AUTHENTICATION_RETRY_DELAY_MIN")
-    retry_delay_max = config("CARONTE_CLIENT_AUTHENTICATION_RETRY_DELAY_MAX")
-    lock_time_out = config("CARONTE_CLIENT_AUTHENTICATION_LOCK_MANAGER_TIMEOUT")
-    distributed_lock_manager_identifier = config('CARONTE_CLIENT_AUTHENTICATION_LOCK_MANAGER_IDENTIFIER')
+from caronte.src.repositories.authentication.interface import LockBackend
+
+
+class AuthenticationLockManagerRepository(RedLockManagerInfrastructure, LockBackend):
+
+    redis_urls = Setting(
+        "CARONTE_CLIENT_LOCK_MANAGER_REDIS_URLS", cast=parse_redis_urls
+    )
+    retry_count = Setting("CARONTE_CLIENT_AUTHENTICATION_RETRY_COUNT", cast=int)
+    retry_delay_min = Setting(
+        "CARONTE_CLIENT_AUTHENTICATION_RETRY_DELAY_MIN", cast=float
+    )
+    retry_delay_max = Setting(
+        "CARONTE_CLIENT_AUTHENTICATION_RETRY_DELAY_MAX", cast=float
+    )
+    lock_time_out = Setting(
+        "CARONTE_CLIENT_AUTHENTICATION_LOCK_MANAGER_TIMEOUT", cast=int
+    )
+    distributed_lock_manager_identifier = Setting(
+        "CARONTE_CLIENT_AUTHENTICATION_LOCK_MANAGER_IDENTIFIER"
+    )
 
     @classmethod
     async def lock_authentication(cls, hash: str) -> LockAuthenticationResponse:
@@ -80,6 +92,19 @@ class AuthenticationLockManagerRepository(RedLockManagerInfrastructure):
         finally:
             return LockAuthenticationResponse(lock_balance)
 
+    @classmethod
+    async def extend_authentication(cls, lock: Lock) -> bool:
+        try:
+            red_lock_manager: Aioredlock = cls.get_red_lock_manager()
+            await red_lock_manager.extend(lock)
+            return True
+        except Exception as error:
+            Gladsheim.error(
+                message=f"{cls.__class__}::extend_authentication::Error in extending the lock",
+                error=error,
+            )
+            return False
+
     @classmethod
     async def unlock_authentication(cls, lock: Lock) -> UnlockAuthenticationResponse:
         unlock_balance_response = (
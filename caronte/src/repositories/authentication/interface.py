@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+
+from aioredlock import Lock
+
+from caronte.src.domain.models.authentication.response.model import (
+    LockAuthenticationResponse,
+    UnlockAuthenticationResponse,
+)
+
+
+class LockBackend(ABC):
+    @classmethod
+    @abstractmethod
+    async def lock_authentication(cls, hash: str) -> LockAuthenticationResponse:
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def extend_authentication(cls, lock: Lock) -> bool:
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def unlock_authentication(cls, lock: Lock) -> UnlockAuthenticationResponse:
+        pass
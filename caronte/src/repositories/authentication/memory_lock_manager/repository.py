@@ -0,0 +1,55 @@
+from time import monotonic
+from uuid import uuid4
+
+from aioredlock import Lock
+
+from caronte.src.domain.models.authentication.response.model import (
+    LockAuthenticationResponse,
+    LockAuthenticationStatus,
+    UnlockAuthenticationResponse,
+    UnlockAuthenticationStatus,
+)
+from caronte.src.infrastructures.env_config import Setting
+from caronte.src.repositories.authentication.interface import LockBackend
+
+
+class MemoryLockManagerRepository(LockBackend):
+    lock_time_out = Setting(
+        "CARONTE_CLIENT_AUTHENTICATION_LOCK_MANAGER_TIMEOUT", default=10, cast=int
+    )
+    __locks = {}
+
+    @classmethod
+    async def lock_authentication(cls, hash: str) -> LockAuthenticationResponse:
+        resource = f"caronte:ouroinvest:{hash}"
+        now = monotonic()
+        _, expires_at = cls.__locks.get(resource, (None, 0))
+        if expires_at > now:
+            return LockAuthenticationResponse(
+                (False, LockAuthenticationStatus.ACQUIRING_LOCK_ERROR, None)
+            )
+        lock_timeout = int(cls.lock_time_out)
+        lock = Lock(None, resource, str(uuid4()), lock_timeout=lock_timeout, valid=True)
+        cls.__locks[resource] = (lock.id, now + lock_timeout)
+        return LockAuthenticationResponse(
+            (True, LockAuthenticationStatus.SUCCESS, lock)
+        )
+
+    @classmethod
+    async def extend_authentication(cls, lock: Lock) -> bool:
+        identifier, expires_at = cls.__locks.get(lock.resource, (None, 0))
+        now = monotonic()
+        if identifier != lock.id or expires_at <= now:
+            return False
+        cls.__locks[lock.resource] = (identifier, now + lock.lock_timeout)
+        return True
+
+    @classmethod
+    async def unlock_authentication(cls, lock: Lock) -> UnlockAuthenticationResponse:
+        identifier, _ = cls.__locks.get(lock.resource, (None, 0))
+        if identifier != lock.id:
+            return UnlockAuthenticationResponse(
+                (False, UnlockAuthenticationStatus.RUNTIME_LOCK_ERROR)
+            )
+        del cls.__locks[lock.resource]
+        return UnlockAuthenticationResponse((True, UnlockAuthenticationStatus.SUCCESS))
@@ -0,0 +1,102 @@
+from uuid import uuid4
+
+from aioredlock import Lock
+from etria_logger import Gladsheim
+
+from caronte.src.domain.models.authentication.response.model import (
+    LockAuthenticationResponse,
+    LockAuthenticationStatus,
+    UnlockAuthenticationResponse,
+    UnlockAuthenticationStatus,
+)
+from caronte.src.infrastructures.env_config import Setting
+from caronte.src.infrastructures.redis.client.infrastructure import RedisInfrastructure
+from caronte.src.repositories.authentication.interface import LockBackend
+
+
+class RedisLockManagerRepository(RedisInfrastructure, LockBackend):
+    lock_time_out = Setting(
+        "CARONTE_CLIENT_AUTHENTICATION_LOCK_MANAGER_TIMEOUT", cast=int
+    )
+    distributed_lock_manager_identifier = Setting(
+        "CARONTE_CLIENT_AUTHENTICATION_LOCK_MANAGER_IDENTIFIER"
+    )
+    extend_script = """
+        if redis.call("GET", KEYS[1]) == ARGV[1] then
+            return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+        end
+        return 0
+    """
+    unlock_script = """
+        if redis.call("GET", KEYS[1]) == ARGV[1] then
+            return redis.call("DEL", KEYS[1])
+        end
+        return 0
+    """
+
+    @classmethod
+    async def lock_authentication(cls, hash: str) -> LockAuthenticationResponse:
+        resource = f"caronte:ouroinvest:{hash}"
+        identifier = f"{cls.distributed_lock_manager_identifier}-{str(uuid4())}"
+        lock_timeout = int(cls.lock_time_out)
+        try:
+            acquired = await cls.get_redis().set(
+                resource, identifier, nx=True, px=lock_timeout * 1000
+            )
+        except Exception as error:
+            Gladsheim.error(
+                message=f"{cls.__name__}::lock_authentication::Error in acquiring the lock",
+                resource=resource,
+                error=error,
+            )
+            return LockAuthenticationResponse(
+                (False, LockAuthenticationStatus.INTERNAL_SERVER_ERROR, None)
+            )
+        if not acquired:
+            return LockAuthenticationResponse(
+                (False, LockAuthenticationStatus.ACQUIRING_LOCK_ERROR, None)
+            )
+        lock = Lock(None, resource, identifier, lock_timeout=lock_timeout, valid=True)
+        return LockAuthenticationResponse(
+            (True, LockAuthenticationStatus.SUCCESS, lock)
+        )
+
+    @classmethod
+    async def extend_authentication(cls, lock: Lock) -> bool:
+        try:
+            extended = await cls.get_redis().eval(
+                cls.extend_script,
+                1,
+                lock.resource,
+                lock.id,
+                int(lock.lock_timeout * 1000),
+            )
+        except Exception as error:
+            Gladsheim.error(
+                message=f"{cls.__name__}::extend_authentication::Error in extending the lock",
+                resource=lock.resource,
+                error=error,
+            )
+            return False
+        return bool(extended)
+
+    @classmethod
+    async def unlock_authentication(cls, lock: Lock) -> UnlockAuthenticationResponse:
+        try:
+            released = await cls.get_redis().eval(
+                cls.unlock_script, 1, lock.resource, lock.id
+            )
+        except Exception as error:
+            Gladsheim.error(
+                message=f"{cls.__name__}::unlock_authentication::Error in releasing the lock",
+                resource=lock.resource,
+                error=error,
+            )
+            return UnlockAuthenticationResponse(
+                (False, UnlockAuthenticationStatus.INTERNAL_SERVER_ERROR)
+            )
+        if not released:
+            return UnlockAuthenticationResponse(
+                (False, UnlockAuthenticationStatus.RUNTIME_LOCK_ERROR)
+            )
+        return UnlockAuthenticationResponse((True, UnlockAuthenticationStatus.SUCCESS))
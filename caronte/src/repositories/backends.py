@@ -0,0 +1,34 @@
+from typing import Type, Union
+
+from caronte.src.domain.enums.backend import CacheBackendType, LockBackendType
+from caronte.src.repositories.authentication.distribuited_lock_manager.repository import (
+    AuthenticationLockManagerRepository,
+)
+from caronte.src.repositories.authentication.interface import LockBackend
+from caronte.src.repositories.authentication.memory_lock_manager.repository import (
+    MemoryLockManagerRepository,
+)
+from caronte.src.repositories.authentication.redis_lock_manager.repository import (
+    RedisLockManagerRepository,
+)
+from caronte.src.repositories.cache.interface import CacheBackend
+from caronte.src.repositories.cache.repository import Cache
+from caronte.src.repositories.memory_cache.repository import MemoryCache
+
+cache_backends = {
+    CacheBackendType.REDIS: Cache,
+    CacheBackendType.MEMORY: MemoryCache,
+}
+lock_backends = {
+    LockBackendType.REDLOCK: AuthenticationLockManagerRepository,
+    LockBackendType.REDIS: RedisLockManagerRepository,
+    LockBackendType.MEMORY: MemoryLockManagerRepository,
+}
+
+
+def get_cache_backend(backend: Union[str, CacheBackendType]) -> Type[CacheBackend]:
+    return cache_backends[CacheBackendType(backend)]
+
+
+def get_lock_backend(backend: Union[str, LockBackendType]) -> Type[LockBackend]:
+    return lock_backends[LockBackendType(backend)]
@@ -0,0 +1,74 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple, Union
+
+
+class CacheBackend(ABC):
+    batch_size = 1000
+
+    @classmethod
+    @abstractmethod
+    async def set(cls, key: str, value: Union[dict, str], ttl: int = None):
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def set_and_publish(
+        cls, key: str, value: Union[dict, str], ttl: int = None, fence: int = None
+    ) -> bool:
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def get(cls, key: str) -> Optional[Union[dict, str]]:
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def set_many(cls, values: Dict[str, Tuple[Union[dict, str], int]]):
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def get_many(cls, keys: List[str]) -> List[Optional[Union[dict, str]]]:
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def get_with_ttl(
+        cls, key: str
+    ) -> Tuple[Optional[Union[dict, str]], Optional[float]]:
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def get_with_ttl_and_fence(
+        cls, key: str
+    ) -> Tuple[Optional[Union[dict, str]], Optional[float], int]:
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def wait_for(
+        cls, key: str, timeout: float
+    ) -> Tuple[Optional[Union[dict, str]], Optional[float]]:
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def delete(cls, key: str):
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def delete_if_equals(cls, key: str, value: Union[dict, str]) -> bool:
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def get_folder_version(cls, folder: str) -> int:
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def bump_folder_version(cls, folder: str) -> int:
+        pass
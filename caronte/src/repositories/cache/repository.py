@@ -1,13 +1,34 @@
-from typing import Optional, Union
+from time import monotonic
+from typing import Dict, List, Optional, Tuple, Union
 
 import orjson
 
-from caronte.src.infrastructures.env_config import config
+from caronte.src.infrastructures.env_config import Setting
+from caronte.src.repositories.cache.interface import CacheBackend
 from caronte.src.infrastructures.redis.client.infrastructure import RedisInfrastructure
 
 
-class Cache(RedisInfrastructure):
-    prefix = config("CARONTE_CACHE_KEYS_PREFIX")
+class Cache(RedisInfrastructure, CacheBackend):
+    prefix = Setting("CARONTE_CACHE_KEYS_PREFIX")
+    fence_ttl = Setting("CARONTE_CACHE_FENCE_TTL", default=24 * 60 * 60, cast=int)
+    fenced_set_and_publish_script = """
+        if redis.call("GET", KEYS[2]) ~= ARGV[3] then
+            return 0
+        end
+        if tonumber(ARGV[2]) > 0 then
+            redis.call("SET", KEYS[1], ARGV[1], "EX", ARGV[2])
+        else
+            redis.call("SET", KEYS[1], ARGV[1])
+        end
+        redis.call("PUBLISH", KEYS[1], ARGV[1])
+        return 1
+    """
+    delete_if_equals_script = """
+        if redis.call("GET", KEYS[1]) == ARGV[1] then
+            return redis.call("DEL", KEYS[1])
+        end
+        return 0
+    """
 
     @classmethod
     async def set(cls, key: str, value: Union[dict, str], ttl: int = None):
@@ -16,6 +37,30 @@ class Cache(RedisInfrastructure):
         json_payload = orjson.dumps(value)
         await redis.set(name=key, value=json_payload, ex=ttl)
 
+    @classmethod
+    async def set_and_publish(
+        cls, key: str, value: Union[dict, str], ttl: int = None, fence: int = None
+    ) -> bool:
+        redis = cls.get_redis()
+        key = f"{cls.prefix}{key}"
+        json_payload = orjson.dumps(value)
+        if fence is not None:
+            stored = await redis.eval(
+                cls.fenced_set_and_publish_script,
+                2,
+                key,
+                cls._fence_key(key),
+                json_payload,
+                int(ttl or 0),
+                fence,
+            )
+            return bool(stored)
+        async with redis.pipeline(transaction=False) as pipeline:
+            await pipeline.set(name=key, value=json_payload, ex=ttl).publish(
+                key, json_payload
+            ).execute()
+        return True
+
     @classmethod
     async def get(cls, key: str) -> Optional[str]:
         redis = cls.get_redis()
@@ -24,14 +69,110 @@ class Cache(RedisInfrastructure):
             value = orjson.loads(value)
         return value
 
+    @classmethod
+    async def set_many(cls, values: Dict[str, Tuple[Union[dict, str], int]]):
+        redis = cls.get_redis()
+        async with redis.pipeline(transaction=False) as pipeline:
+            for key, (value, ttl) in values.items():
+                pipeline.set(
+                    name=f"{cls.prefix}{key}", value=orjson.dumps(value), ex=ttl
+                )
+                if len(pipeline) >= cls.batch_size:
+                    await pipeline.execute()
+            await pipeline.execute()
+
+    @classmethod
+    async def get_many(cls, keys: List[str]) -> List[Optional[str]]:
+        redis = cls.get_redis()
+        values = []
+        for start in range(0, len(keys), cls.batch_size):
+            batch = [
+                f"{cls.prefix}{key}" for key in keys[start : start + cls.batch_size]
+            ]
+            values.extend(await redis.mget(batch))
+        return [orjson.loads(value) if value else value for value in values]
+
+    @classmethod
+    async def get_with_ttl(cls, key: str) -> Tuple[Optional[str], Optional[float]]:
+        redis = cls.get_redis()
+        key = f"{cls.prefix}{key}"
+        async with redis.pipeline(transaction=False) as pipeline:
+            value, ttl = await pipeline.get(key).pttl(key).execute()
+        if value:
+            value = orjson.loads(value)
+        ttl = ttl / 1000 if ttl > 0 else None
+        return value, ttl
+
+    @classmethod
+    async def get_with_ttl_and_fence(
+        cls, key: str
+    ) -> Tuple[Optional[str], Optional[float], int]:
+        redis = cls.get_redis()
+        key = f"{cls.prefix}{key}"
+        fence_key = cls._fence_key(key)
+        async with redis.pipeline(transaction=False) as pipeline:
+            value, ttl, fence, _ = (
+                await pipeline.get(key)
+                .pttl(key)
+                .incr(fence_key)
+                .expire(fence_key, int(cls.fence_ttl))
+                .execute()
+            )
+        if value:
+            value = orjson.loads(value)
+        ttl = ttl / 1000 if ttl > 0 else None
+        return value, ttl, fence
+
+    @classmethod
+    async def wait_for(
+        cls, key: str, timeout: float
+    ) -> Tuple[Optional[str], Optional[float]]:
+        redis = cls.get_redis()
+        key = f"{cls.prefix}{key}"
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(key)
+            async with redis.pipeline(transaction=False) as pipeline:
+                value, ttl = await pipeline.get(key).pttl(key).execute()
+            deadline = monotonic() + timeout
+            while not value and (remaining := deadline - monotonic()) > 0:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=remaining
+                )
+                if message:
+                    value = message["data"]
+                    ttl = await redis.pttl(key)
+        finally:
+            await pubsub.reset()
+        if value:
+            value = orjson.loads(value)
+        ttl = ttl / 1000 if ttl > 0 else None
+        return value, ttl
+
     @classmethod
     async def delete(cls, key: str):
         redis = cls.get_redis()
         await redis.delete(f"{cls.prefix}{key}")
 
     @classmethod
-    async def delete_folder(cls, folder: str):
+    async def delete_if_equals(cls, key: str, value: Union[dict, str]) -> bool:
+        redis = cls.get_redis()
+        deleted = await redis.eval(
+            cls.delete_if_equals_script, 1, f"{cls.prefix}{key}", orjson.dumps(value)
+        )
+        return bool(deleted)
+
+    @classmethod
+    async def get_folder_version(cls, folder: str) -> int:
         redis = cls.get_redis()
-        keys_in_folder = redis.scan_iter(match=f"{cls.prefix}{folder}:*")
-        async for key in keys_in_folder:
-            await redis.delete(key)
+        version = await redis.get(f"{cls.prefix}version:{folder}")
+        return int(version or 0)
+
+    @classmethod
+    async def bump_folder_version(cls, folder: str) -> int:
+        redis = cls.get_redis()
+        return await redis.incr(f"{cls.prefix}version:{folder}")
+
+    @staticmethod
+    def _fence_key(key: str) -> str:
+        return f"{{{key}}}:fence"
@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Optional, Union
+
+from caronte.src.infrastructures.env_config import Setting
+
+
+class LocalCache:
+    max_size = Setting("CARONTE_LOCAL_CACHE_MAX_SIZE", default=10000, cast=int)
+    max_ttl = Setting("CARONTE_LOCAL_CACHE_MAX_TTL", default=60, cast=int)
+
+    hits = 0
+    misses = 0
+    __entries = OrderedDict()
+
+    @classmethod
+    def set(cls, key: str, value: Union[dict, str], ttl: float = None):
+        ttl = int(cls.max_ttl) if ttl is None else min(ttl, int(cls.max_ttl))
+        if ttl <= 0:
+            cls.__entries.pop(key, None)
+            return
+        cls.__entries[key] = (value, monotonic() + ttl)
+        cls.__entries.move_to_end(key)
+        while len(cls.__entries) > int(cls.max_size):
+            cls.__entries.popitem(last=False)
+
+    @classmethod
+    def get(cls, key: str) -> Optional[Union[dict, str]]:
+        entry = cls.__entries.get(key)
+        if entry is None:
+            cls.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at <= monotonic():
+            del cls.__entries[key]
+            cls.misses += 1
+            return None
+        cls.__entries.move_to_end(key)
+        cls.hits += 1
+        return value
+
+    @classmethod
+    def delete(cls, key: str):
+        cls.__entries.pop(key, None)
+
+    @classmethod
+    def delete_if_equals(cls, key: str, value: Union[dict, str]):
+        entry = cls.__entries.get(key)
+        if entry is not None and entry[0] == value:
+            del cls.__entries[key]
+
+    @classmethod
+    def delete_folder(cls, folder: str):
+        keys_in_folder = [key for key in cls.__entries if key.startswith(f"{folder}:")]
+        for key in keys_in_folder:
+            del cls.__entries[key]
+
+    @classmethod
+    def clear(cls):
+        cls.__entries.clear()
+        cls.hits = 0
+        cls.misses = 0
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        return {"hits": cls.hits, "misses": cls.misses, "size": len(cls.__entries)}
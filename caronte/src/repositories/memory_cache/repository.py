@@ -0,0 +1,121 @@
+import asyncio
+from time import monotonic
+from typing import Dict, List, Optional, Tuple, Union
+
+from caronte.src.repositories.cache.interface import CacheBackend
+
+
+class MemoryCache(CacheBackend):
+    __entries = {}
+    __folder_versions = {}
+    __fences = {}
+    __waiters = {}
+
+    @classmethod
+    async def set(cls, key: str, value: Union[dict, str], ttl: int = None):
+        cls.__store(key, value, ttl)
+
+    @classmethod
+    async def set_and_publish(
+        cls, key: str, value: Union[dict, str], ttl: int = None, fence: int = None
+    ) -> bool:
+        if fence is not None and cls.__fences.get(key) != fence:
+            return False
+        cls.__store(key, value, ttl)
+        for waiter in cls.__waiters.pop(key, ()):
+            if not waiter.done():
+                waiter.set_result(value)
+        return True
+
+    @classmethod
+    async def get(cls, key: str) -> Optional[Union[dict, str]]:
+        value, _ = cls.__load(key)
+        return value
+
+    @classmethod
+    async def set_many(cls, values: Dict[str, Tuple[Union[dict, str], int]]):
+        for key, (value, ttl) in values.items():
+            cls.__store(key, value, ttl)
+
+    @classmethod
+    async def get_many(cls, keys: List[str]) -> List[Optional[Union[dict, str]]]:
+        return [cls.__load(key)[0] for key in keys]
+
+    @classmethod
+    async def get_with_ttl(
+        cls, key: str
+    ) -> Tuple[Optional[Union[dict, str]], Optional[float]]:
+        value, expires_at = cls.__load(key)
+        ttl = expires_at - monotonic() if expires_at is not None else None
+        return value, ttl
+
+    @classmethod
+    async def get_with_ttl_and_fence(
+        cls, key: str
+    ) -> Tuple[Optional[Union[dict, str]], Optional[float], int]:
+        value, ttl = await cls.get_with_ttl(key)
+        fence = cls.__fences.get(key, 0) + 1
+        cls.__fences[key] = fence
+        return value, ttl, fence
+
+    @classmethod
+    async def wait_for(
+        cls, key: str, timeout: float
+    ) -> Tuple[Optional[Union[dict, str]], Optional[float]]:
+        value, ttl = await cls.get_with_ttl(key)
+        if value is not None:
+            return value, ttl
+        waiter = asyncio.get_running_loop().create_future()
+        waiters = cls.__waiters.setdefault(key, set())
+        waiters.add(waiter)
+        try:
+            value = await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            return None, None
+        finally:
+            waiters.discard(waiter)
+            if not waiters and cls.__waiters.get(key) is waiters:
+                del cls.__waiters[key]
+        _, ttl = await cls.get_with_ttl(key)
+        return value, ttl
+
+    @classmethod
+    async def delete(cls, key: str):
+        cls.__entries.pop(key, None)
+
+    @classmethod
+    async def delete_if_equals(cls, key: str, value: Union[dict, str]) -> bool:
+        cached_value, _ = cls.__load(key)
+        if cached_value is None or cached_value != value:
+            return False
+        del cls.__entries[key]
+        return True
+
+    @classmethod
+    async def get_folder_version(cls, folder: str) -> int:
+        return cls.__folder_versions.get(folder, 0)
+
+    @classmethod
+    async def bump_folder_version(cls, folder: str) -> int:
+        version = cls.__folder_versions.get(folder, 0) + 1
+        cls.__folder_versions[folder] = version
+        return version
+
+    @classmethod
+    def clear(cls):
+        cls.__entries.clear()
+        cls.__folder_versions.clear()
+        cls.__fences.clear()
+
+    @classmethod
+    def __store(cls, key: str, value: Union[dict, str], ttl: Optional[float]):
+        expires_at = monotonic() + ttl if ttl else None
+        cls.__entries[key] = (value, expires_at)
+
+    @classmethod
+    def __load(cls, key: str) -> Tuple[Optional[Union[dict, str]], Optional[float]]:
+        value, expires_at = cls.__entries.get(key, (None, None))
+        if expires_at is not None and expires_at <= monotonic():
+            del cls.__entries[key]
+            return None, None
+        return value, expires_at
@@ -0,0 +1,96 @@
+import asyncio
+from time import monotonic
+
+from caronte.src.domain.enums.rate_limit import RateLimitBucket
+from caronte.src.domain.exceptions.transport.exception import RateLimitExceeded
+from caronte.src.infrastructures.env_config import Setting
+from caronte.src.infrastructures.redis.client.infrastructure import RedisInfrastructure
+
+
+class RateLimiter(RedisInfrastructure):
+    prefix = Setting("CARONTE_CACHE_KEYS_PREFIX")
+    enabled = Setting("CARONTE_RATE_LIMIT_ENABLED", default=False, cast=bool)
+    max_wait = Setting("CARONTE_RATE_LIMIT_MAX_WAIT", default=5, cast=float)
+    preallocation = Setting("CARONTE_RATE_LIMIT_PREALLOCATION", default=1, cast=int)
+    token_rate = Setting("CARONTE_RATE_LIMIT_TOKEN_RATE", default=10, cast=float)
+    token_burst = Setting("CARONTE_RATE_LIMIT_TOKEN_BURST", default=10, cast=int)
+    business_rate = Setting("CARONTE_RATE_LIMIT_BUSINESS_RATE", default=100, cast=float)
+    business_burst = Setting("CARONTE_RATE_LIMIT_BUSINESS_BURST", default=100, cast=int)
+    gcra_script = """
+        local now = redis.call("TIME")
+        local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+        local emission_interval = tonumber(ARGV[1])
+        local burst_tolerance = tonumber(ARGV[2])
+        local permits = tonumber(ARGV[3])
+        local tat = tonumber(redis.call("GET", KEYS[1])) or now_ms
+        if tat < now_ms then
+            tat = now_ms
+        end
+        local new_tat = tat + emission_interval * permits
+        local retry_after = new_tat - burst_tolerance - now_ms
+        if retry_after > 0 then
+            return math.ceil(retry_after)
+        end
+        redis.call("SET", KEYS[1], new_tat, "PX", math.ceil(new_tat - now_ms))
+        return 0
+    """
+
+    __script = None
+    __preallocated_permits = {}
+    __refill_locks = {}
+
+    @classmethod
+    async def acquire(cls, bucket: RateLimitBucket):
+        if not cls.enabled or cls.__take_preallocated_permit(bucket):
+            return
+        refill_lock = cls.__refill_locks.setdefault(bucket, asyncio.Lock())
+        async with refill_lock:
+            if cls.__take_preallocated_permit(bucket):
+                return
+            await cls.__reserve(bucket)
+
+    @classmethod
+    def reset(cls):
+        cls.__script = None
+        cls.__preallocated_permits.clear()
+        cls.__refill_locks.clear()
+
+    @classmethod
+    def __take_preallocated_permit(cls, bucket: RateLimitBucket) -> bool:
+        permits, expires_at = cls.__preallocated_permits.get(bucket, (0, 0))
+        if permits <= 0 or expires_at <= monotonic():
+            return False
+        cls.__preallocated_permits[bucket] = (permits - 1, expires_at)
+        return True
+
+    @classmethod
+    async def __reserve(cls, bucket: RateLimitBucket):
+        emission_interval = 1000 / float(getattr(cls, f"{bucket.value}_rate"))
+        burst = int(getattr(cls, f"{bucket.value}_burst"))
+        permits = max(min(int(cls.preallocation), burst), 1)
+        deadline = monotonic() + float(cls.max_wait)
+        while True:
+            retry_after = await cls.__run_gcra(
+                bucket, emission_interval, burst, permits
+            )
+            if not retry_after:
+                break
+            retry_after = retry_after / 1000
+            if monotonic() + retry_after > deadline:
+                raise RateLimitExceeded()
+            await asyncio.sleep(retry_after)
+        if permits > 1:
+            expires_at = monotonic() + permits * emission_interval / 1000
+            cls.__preallocated_permits[bucket] = (permits - 1, expires_at)
+
+    @classmethod
+    async def __run_gcra(
+        cls, bucket: RateLimitBucket, emission_interval: float, burst: int, permits: int
+    ) -> int:
+        script = cls.__script
+        if script is None:
+            script = cls.__script = cls.get_redis().register_script(cls.gcra_script)
+        return await script(
+            keys=[f"{cls.prefix}rate_limit:{bucket.value}"],
+            args=[emission_interval, emission_interval * burst, permits],
+        )
@@ -1,133 +1,521 @@
+# Standards
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from functools import partial
+from random import uniform
+from base64 import urlsafe_b64decode
+from datetime import datetime
+from time import monotonic
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+# Third party
+from decouple import Csv
+from etria_logger import Gladsheim
+from pytz import timezone
+import orjson
+
 # Caronte
 from caronte.src.domain.enums.http_methods import AllowedHTTPMethods
-from caronte.src.domain.exceptions.service.exception import TokenNotFoundInContent
+from caronte.src.domain.enums.rate_limit import RateLimitBucket
+from caronte.src.domain.enums.response import CaronteStatus
+from caronte.src.domain.exceptions.base_exceptions.exception import ServiceException
+from caronte.src.domain.exceptions.service.exception import (
+    CompanyTokenRejected,
+    ExchangeRequestFailed,
+    TokenGenerationTimeout,
+    TokenNotFoundInContent,
+)
 from caronte.src.domain.models.authentication.response.model import (
     LockAuthenticationStatus,
 )
-from caronte.src.infrastructures.env_config import config
-from caronte.src.repositories.authentication.distribuited_lock_manager.repository import (
-    AuthenticationLockManagerRepository,
-)
+from caronte.src.infrastructures.env_config import Setting, positive_int
+from caronte.src.infrastructures.metrics import Metrics
+from caronte.src.repositories.backends import get_cache_backend, get_lock_backend
 from caronte.src.transports.ouroinvest.transport import HTTPTransport
-from caronte.src.repositories.cache.repository import Cache
-
-# Standards
-import asyncio
-from contextlib import asynccontextmanager
-
-# Third party
-from etria_logger import Gladsheim
+from caronte.src.repositories.local_cache.repository import LocalCache
 
 
 class TokenService:
-    cache = Cache
+    cache = Setting("CARONTE_CACHE_BACKEND", default="redis", cast=get_cache_backend)
+    lock_manager = Setting(
+        "CARONTE_LOCK_BACKEND", default="redlock", cast=get_lock_backend
+    )
+    local_cache = LocalCache
+    system_user = Setting("OUROINVEST_SYSTEM_USER")
+    system_password = Setting("OUROINVEST_SYSTEM_PWD")
+    default_token_url = Setting("OUROINVEST_DEFAULT_TOKEN_URL")
+    user_token_url = Setting("OUROINVEST_USER_TOKEN_URL")
+    base_tokens_cache_folder = Setting("OUROINVEST_BASE_TOKENS_CACHE_FOLDER")
+    default_token_cache_key = Setting("OUROINVEST_DEFAULT_TOKEN_CACHE_KEY")
+    user_token_cache_key = Setting("OUROINVEST_USER_TOKEN_CACHE_KEY")
+    generation_wait_timeout = Setting(
+        "CARONTE_TOKEN_GENERATION_WAIT_TIMEOUT", default=30, cast=float
+    )
+    generation_backoff_min = Setting(
+        "CARONTE_TOKEN_GENERATION_BACKOFF_MIN", default=0.1, cast=float
+    )
+    generation_backoff_max = Setting(
+        "CARONTE_TOKEN_GENERATION_BACKOFF_MAX", default=2, cast=float
+    )
+    company_token_refresh_margin = Setting(
+        "CARONTE_COMPANY_TOKEN_REFRESH_MARGIN", default=30 * 60, cast=int
+    )
+    token_default_ttl = Setting(
+        "CARONTE_TOKEN_DEFAULT_TTL", default=12 * 60 * 60, cast=int
+    )
+    token_ttl_safety_margin = Setting(
+        "CARONTE_TOKEN_TTL_SAFETY_MARGIN", default=60, cast=int
+    )
+    warm_up_concurrency = Setting(
+        "CARONTE_WARM_UP_CONCURRENCY", default=50, cast=positive_int
+    )
+    folder_version_ttl = Setting(
+        "CARONTE_TOKEN_FOLDER_VERSION_TTL", default=1, cast=float
+    )
+    token_expiration_fields = Setting(
+        "CARONTE_TOKEN_EXPIRATION_FIELDS",
+        default="dataHoraExpiracao,dataExpiracao,expiracao",
+        cast=Csv(),
+    )
+    rejected_token_statuses = (CaronteStatus.UNAUTHORIZED,)
+    company_token_refresh_ratio = 0.5
+    __pending_generations = {}
+    __folder_versions = {}
+    __company_token_refresh = None
 
     @classmethod
     async def get_company_token(cls) -> dict:
         default_token_cache_key = cls._default_token_cache_key()
-        token = await cls.cache.get(default_token_cache_key)
+        token = await cls._get_cached_token(default_token_cache_key)
         if not token:
-            hash = "default_token"
-            async with cls._lock_token_generation(hash=hash) as lock:
-                token = await cls.cache.get(default_token_cache_key)
-                if token is None:
-                    await cls.cache.delete_folder(cls._base_tokens_cache_folder())
-                    token = await cls._request_new_token()
-                    await cls.cache.set(default_token_cache_key, token, 12 * 60 * 60)
-            token = await cls.cache.get(default_token_cache_key)
+            token = await cls._single_flight(
+                hash="default_token", generation=cls._generate_company_token
+            )
         return token
 
     @classmethod
     async def get_user_token(cls, client_id: int) -> dict:
-        user_token_cache_key = cls._user_token_cache_key_format(client_id)
-        default_token = await cls.get_company_token()
-        user_token = await cls.cache.get(user_token_cache_key)
+        user_token_cache_key = await cls._user_token_cache_key_format(client_id)
+        user_token = await cls._get_cached_token(user_token_cache_key)
         if not user_token:
-            hash = f"cliente:{client_id}"
+            user_token = await cls._single_flight(
+                hash=f"cliente:{client_id}",
+                generation=partial(cls._generate_user_token, client_id),
+            )
+        return user_token
+
+    @classmethod
+    async def invalidate_company_token(cls, token: dict):
+        await cls._invalidate_token(
+            hash="default_token", cache_key=cls._default_token_cache_key(), token=token
+        )
+
+    @classmethod
+    async def invalidate_user_token(cls, client_id: int, token: dict):
+        await cls._invalidate_token(
+            hash=f"cliente:{client_id}",
+            cache_key=await cls._user_token_cache_key_format(client_id),
+            token=token,
+        )
+
+    @classmethod
+    async def _invalidate_token(cls, hash: str, cache_key: str, token: dict):
+        cls.local_cache.delete_if_equals(cache_key, token)
+        await cls._single_flight(
+            hash=f"invalidate:{hash}",
+            generation=partial(cls.cache.delete_if_equals, cache_key, token),
+        )
+
+    @classmethod
+    async def warm_up_user_tokens(
+        cls,
+        client_ids: Iterable[int],
+        concurrency: int = None,
+        on_progress: Callable[[int, CaronteStatus], None] = None,
+    ) -> Dict[int, CaronteStatus]:
+        if concurrency is None:
+            concurrency = int(cls.warm_up_concurrency)
+        elif concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        client_ids = list(dict.fromkeys(client_ids))
+        cache_keys = [
+            await cls._user_token_cache_key_format(client_id)
+            for client_id in client_ids
+        ]
+        cached_tokens = await cls.cache.get_many(cache_keys)
+        report = {}
+        missing_tokens = []
+        for client_id, token in zip(client_ids, cached_tokens):
+            if token:
+                cls._report_warm_up(
+                    report, on_progress, client_id, CaronteStatus.SUCCESS
+                )
+            else:
+                missing_tokens.append(client_id)
+        if not missing_tokens:
+            return report
+
+        semaphore = asyncio.Semaphore(concurrency)
+        generated_tokens = {}
+
+        async def warm_up(client_id: int):
+            async with semaphore:
+                try:
+                    token = await cls._issue_user_token(client_id)
+                    cache_key = await cls._user_token_cache_key_format(client_id)
+                    generated_tokens[cache_key] = token
+                    status = CaronteStatus.SUCCESS
+                except ServiceException as ex:
+                    Gladsheim.info(message=ex.msg, client_id=client_id)
+                    status = ex.code
+                except Exception as ex:
+                    Gladsheim.error(error=ex, client_id=client_id)
+                    status = CaronteStatus.UNEXPECTED_ERROR
+                if len(generated_tokens) >= cls.cache.batch_size:
+                    batch = generated_tokens.copy()
+                    generated_tokens.clear()
+                    await cls.cache.set_many(batch)
+            cls._report_warm_up(report, on_progress, client_id, status)
+
+        await asyncio.gather(*(warm_up(client_id) for client_id in missing_tokens))
+        if generated_tokens:
+            await cls.cache.set_many(generated_tokens)
+        return report
+
+    @staticmethod
+    def _report_warm_up(
+        report: Dict[int, CaronteStatus],
+        on_progress: Optional[Callable[[int, CaronteStatus], None]],
+        client_id: int,
+        status: CaronteStatus,
+    ):
+        report[client_id] = status
+        if on_progress:
+            on_progress(client_id, status)
+
+    @classmethod
+    async def _generate_company_token(cls) -> dict:
+        return await cls._generate_token(
+            hash="default_token",
+            cache_key=cls._default_token_cache_key(),
+            request_token=cls._replace_company_token,
+        )
+
+    @classmethod
+    async def _replace_company_token(cls) -> Tuple[dict, int]:
+        await cls._bump_user_tokens_version()
+        return await cls._request_new_token()
+
+    @classmethod
+    async def _refresh_company_token(cls, refresh_margin: float) -> dict:
+        return await cls._generate_token(
+            hash="default_token",
+            cache_key=cls._default_token_cache_key(),
+            request_token=cls._request_new_token,
+            min_ttl=refresh_margin,
+        )
+
+    @classmethod
+    async def _bump_user_tokens_version(cls):
+        folder = cls._base_tokens_cache_folder()
+        version = await cls.cache.bump_folder_version(folder)
+        cls.__set_folder_version(folder, version)
+        cls.local_cache.delete_folder(folder)
+
+    @classmethod
+    async def _keep_company_token_fresh(cls):
+        default_token_cache_key = cls._default_token_cache_key()
+        refresh_margin = float(cls.company_token_refresh_margin)
+        while True:
+            try:
+                token, ttl = await cls.cache.get_with_ttl(default_token_cache_key)
+                if token and (ttl is None or ttl > refresh_margin):
+                    await asyncio.sleep(ttl - refresh_margin if ttl else refresh_margin)
+                    continue
+                await cls._single_flight(
+                    hash="default_token",
+                    generation=partial(cls._refresh_company_token, refresh_margin),
+                )
+                _, ttl = await cls.cache.get_with_ttl(default_token_cache_key)
+                refresh_margin = cls._get_refresh_margin(ttl)
+            except Exception as err:
+                message = f"{cls.__class__}:keep_company_token_fresh:Error - {err}"
+                Gladsheim.error(error=err, message=message)
+            await asyncio.sleep(float(cls.generation_backoff_max))
+
+    @classmethod
+    def _get_refresh_margin(cls, ttl: Optional[float]) -> float:
+        refresh_margin = float(cls.company_token_refresh_margin)
+        if ttl is None:
+            return refresh_margin
+        return min(refresh_margin, ttl * cls.company_token_refresh_ratio)
+
+    @classmethod
+    def start_company_token_refresh(cls) -> asyncio.Task:
+        if cls.__company_token_refresh is None or cls.__company_token_refresh.done():
+            cls.__company_token_refresh = asyncio.ensure_future(
+                cls._keep_company_token_fresh()
+            )
+        return cls.__company_token_refresh
+
+    @classmethod
+    async def stop_company_token_refresh(cls):
+        company_token_refresh = cls.__company_token_refresh
+        cls.__company_token_refresh = None
+        if company_token_refresh is not None:
+            company_token_refresh.cancel()
+            with suppress(asyncio.CancelledError):
+                await company_token_refresh
+
+    @classmethod
+    async def _generate_user_token(cls, client_id: int) -> dict:
+        return await cls._generate_token(
+            hash=f"cliente:{client_id}",
+            cache_key=await cls._user_token_cache_key_format(client_id),
+            request_token=partial(cls._issue_user_token, client_id),
+        )
+
+    @classmethod
+    async def _issue_user_token(cls, client_id: int) -> Tuple[dict, int]:
+        default_token = await cls.get_company_token()
+        try:
+            return await cls._request_new_user_token(client_id, default_token)
+        except CompanyTokenRejected:
+            await cls.invalidate_company_token(default_token)
+            default_token = await cls.get_company_token()
+            return await cls._request_new_user_token(client_id, default_token)
+
+    @classmethod
+    async def _generate_token(
+        cls,
+        hash: str,
+        cache_key: str,
+        request_token: Callable[[], Awaitable[Tuple[dict, int]]],
+        min_ttl: float = 0,
+    ) -> dict:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + float(cls.generation_wait_timeout)
+        backoff = float(cls.generation_backoff_min)
+        while (remaining := deadline - loop.time()) > 0:
             async with cls._lock_token_generation(hash=hash) as lock:
-                user_token = await cls.cache.get(user_token_cache_key)
-                if user_token is None:
-                    user_token = await cls._request_new_user_token(
-                        client_id, default_token
+                if lock:
+                    token, ttl, fence = await cls.cache.get_with_ttl_and_fence(
+                        cache_key
                     )
-                    await cls.cache.set(user_token_cache_key, user_token, 12 * 60 * 60)
-            user_token = await cls.cache.get(user_token_cache_key)
-        return user_token
+                    if token is None or (ttl is not None and ttl <= min_ttl):
+                        try:
+                            with Metrics.stage("token_generation"):
+                                token, ttl = await request_token()
+                        except Exception:
+                            Metrics.increment("token_generations_total", result="error")
+                            raise
+                        if await cls.cache.set_and_publish(
+                            cache_key, token, ttl, fence=fence
+                        ):
+                            Metrics.increment(
+                                "token_generations_total", result="stored"
+                            )
+                            cls.local_cache.set(cache_key, token, ttl)
+                        else:
+                            Metrics.increment(
+                                "token_generations_total", result="fenced"
+                            )
+                            message = f"{cls.__class__}:generate_token:Fenced off"
+                            Gladsheim.info(message=message, cache_key=cache_key)
+                    return token
+            wait_time = min(backoff / 2 + uniform(0, backoff / 2), remaining)
+            token, ttl = await cls.cache.wait_for(cache_key, timeout=wait_time)
+            if token:
+                cls.local_cache.set(cache_key, token, ttl)
+                return token
+            backoff = min(backoff * 2, float(cls.generation_backoff_max))
+        raise TokenGenerationTimeout()
+
+    @classmethod
+    async def _single_flight(
+        cls, hash: str, generation: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        pending_generation = cls.__pending_generations.get(hash)
+        if pending_generation is None:
+            pending_generation = asyncio.ensure_future(generation())
+            cls.__pending_generations[hash] = pending_generation
+            pending_generation.add_done_callback(
+                partial(cls._discard_pending_generation, hash)
+            )
+        return await asyncio.shield(pending_generation)
+
+    @classmethod
+    def _discard_pending_generation(cls, hash: str, pending_generation: asyncio.Future):
+        if cls.__pending_generations.get(hash) is pending_generation:
+            del cls.__pending_generations[hash]
+        if not pending_generation.cancelled():
+            pending_generation.exception()
+
+    @classmethod
+    async def _get_cached_token(cls, key: str) -> dict:
+        token = cls.local_cache.get(key)
+        if token:
+            Metrics.increment("token_cache_total", result="local_hit")
+            return token
+        with Metrics.stage("cache_get"):
+            token, ttl = await cls.cache.get_with_ttl(key)
+        if token:
+            Metrics.increment("token_cache_total", result="hit")
+            cls.local_cache.set(key, token, ttl)
+        else:
+            Metrics.increment("token_cache_total", result="miss")
+        return token
+
+    @classmethod
+    def get_local_cache_stats(cls) -> dict:
+        return cls.local_cache.get_stats()
 
     @classmethod
     @asynccontextmanager
     async def _lock_token_generation(cls, hash: str):
         lock = None
+        keep_alive = None
         try:
-            while True:
-                (
-                    call_status,
-                    status,
-                    lock,
-                ) = await AuthenticationLockManagerRepository.lock_authentication(
-                    hash=hash
-                )
-                if status == LockAuthenticationStatus.SUCCESS:
-                    yield lock
-                    break
+            with Metrics.stage("lock_acquire"):
+                _, status, lock = await cls.lock_manager.lock_authentication(hash=hash)
+            if status == LockAuthenticationStatus.SUCCESS:
+                Metrics.increment("lock_attempts_total", result="acquired")
+                keep_alive = asyncio.ensure_future(cls._keep_lock_alive(lock))
+                yield lock
+            else:
+                Metrics.increment("lock_attempts_total", result="busy")
+                yield None
         except Exception as err:
             message = f"{cls.__class__}:validate_token_redis:Error - {err}"
             Gladsheim.error(error=err, message=message)
+            raise
         finally:
+            if keep_alive is not None:
+                keep_alive.cancel()
+                with suppress(asyncio.CancelledError):
+                    await keep_alive
             if lock:
-                await AuthenticationLockManagerRepository.unlock_authentication(
-                    lock=lock
-                )
+                await cls.lock_manager.unlock_authentication(lock=lock)
+
+    @classmethod
+    async def _keep_lock_alive(cls, lock):
+        while True:
+            await asyncio.sleep(lock.lock_timeout / 3)
+            if not await cls.lock_manager.extend_authentication(lock):
+                message = f"{cls.__class__}:keep_lock_alive:Lock lost"
+                Gladsheim.info(message=message, resource=lock.resource)
+                return
 
     @classmethod
-    async def _request_new_token(cls) -> dict:
+    async def _request_new_token(cls) -> Tuple[dict, int]:
         body = {
-            "chave": config("OUROINVEST_SYSTEM_USER"),
-            "senha": config("OUROINVEST_SYSTEM_PWD"),
+            "chave": cls.system_user,
+            "senha": cls.system_password,
         }
         success, caronte_status, content = await HTTPTransport.request_method(
             method=AllowedHTTPMethods.POST,
-            url=config("OUROINVEST_DEFAULT_TOKEN_URL"),
+            url=cls.default_token_url,
             body=body,
+            rate_limit_bucket=RateLimitBucket.TOKEN,
         )
-
-        token = content.get("tokenAcesso", {}).get("token")
+        if not success:
+            raise ExchangeRequestFailed(caronte_status)
+        access_token = content.get("tokenAcesso", {})
+        token = access_token.get("token")
         if not token:
             raise TokenNotFoundInContent
-        return cls._get_auth(token)
+        return cls._get_auth(token), cls._get_token_ttl(access_token)
 
     @classmethod
-    async def _request_new_user_token(cls, client_id: int, auth: dict) -> dict:
+    async def _request_new_user_token(
+        cls, client_id: int, auth: dict
+    ) -> Tuple[dict, int]:
         body = {"codigoCliente": client_id}
         success, caronte_status, content = await HTTPTransport.request_method(
             method=AllowedHTTPMethods.POST,
-            url=config("OUROINVEST_USER_TOKEN_URL"),
+            url=cls.user_token_url,
             body=body,
             headers=auth,
+            rate_limit_bucket=RateLimitBucket.TOKEN,
         )
-        user_token = content.get("tokenAcesso", {}).get("token")
+        if caronte_status in cls.rejected_token_statuses:
+            raise CompanyTokenRejected(caronte_status)
+        if not success:
+            raise ExchangeRequestFailed(caronte_status)
+        access_token = content.get("tokenAcesso", {})
+        user_token = access_token.get("token")
         if not user_token:
             raise TokenNotFoundInContent
-        return cls._get_auth(user_token)
+        return cls._get_auth(user_token), cls._get_token_ttl(access_token)
 
-    @staticmethod
-    def _base_tokens_cache_folder():
-        return config("OUROINVEST_BASE_TOKENS_CACHE_FOLDER")
+    @classmethod
+    def _base_tokens_cache_folder(cls):
+        return cls.base_tokens_cache_folder
 
     @classmethod
     def _default_token_cache_key(cls):
-        return cls._base_tokens_cache_folder() + config(
-            "OUROINVEST_DEFAULT_TOKEN_CACHE_KEY"
-        )
+        return cls._base_tokens_cache_folder() + cls.default_token_cache_key
 
     @classmethod
-    def _user_token_cache_key_format(cls, client_id: int):
-        url = cls._base_tokens_cache_folder() + config(
-            "OUROINVEST_USER_TOKEN_CACHE_KEY"
-        )
+    async def _user_tokens_cache_folder(cls) -> str:
+        folder = cls._base_tokens_cache_folder()
+        version, expires_at = cls.__folder_versions.get(folder, (None, 0))
+        if expires_at <= monotonic():
+            version = await cls.cache.get_folder_version(folder)
+            cls.__set_folder_version(folder, version)
+        return f"{folder}:v{version}"
+
+    @classmethod
+    def __set_folder_version(cls, folder: str, version: int):
+        expires_at = monotonic() + float(cls.folder_version_ttl)
+        cls.__folder_versions[folder] = (version, expires_at)
+
+    @classmethod
+    async def _user_token_cache_key_format(cls, client_id: int):
+        url = await cls._user_tokens_cache_folder() + cls.user_token_cache_key
         url = url.format(client_id)
         return url
 
     @staticmethod
     def _get_auth(token) -> dict:
         return {"Authorization": f"Bearer {token}"}
+
+    @classmethod
+    def _get_token_ttl(cls, access_token: dict) -> int:
+        expiration = cls._get_payload_expiration(access_token)
+        if expiration is None:
+            expiration = cls._get_jwt_expiration(access_token.get("token"))
+        if expiration is None:
+            message = f"{cls.__class__}:get_token_ttl:Expiration not found"
+            Gladsheim.warning(
+                message=message,
+                expiration_fields=cls.token_expiration_fields,
+                default_ttl=cls.token_default_ttl,
+            )
+            return int(cls.token_default_ttl)
+        ttl = expiration - datetime.now(tz=timezone("UTC")).timestamp()
+        return max(int(ttl) - int(cls.token_ttl_safety_margin), 1)
+
+    @classmethod
+    def _get_payload_expiration(cls, access_token: dict) -> Optional[float]:
+        for field in cls.token_expiration_fields:
+            if value := access_token.get(field):
+                try:
+                    expiration = datetime.fromisoformat(value.replace("Z", "+00:00"))
+                except (AttributeError, ValueError):
+                    continue
+                if expiration.tzinfo is None:
+                    expiration = timezone("America/Sao_Paulo").localize(expiration)
+                return expiration.timestamp()
+        return None
+
+    @staticmethod
+    def _get_jwt_expiration(token: str) -> Optional[float]:
+        try:
+            payload = token.split(".")[1]
+            claims = orjson.loads(
+                urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+            )
+            return float(claims["exp"])
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+            return None
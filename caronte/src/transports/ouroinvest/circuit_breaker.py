@@ -0,0 +1,136 @@
+# Standards
+from collections import deque
+from functools import lru_cache
+from time import monotonic
+from typing import Dict
+
+# Third party
+from yarl import URL
+
+# Caronte
+from caronte.src.domain.enums.circuit_breaker import CircuitBreakerState
+from caronte.src.infrastructures.env_config import Setting
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        window_size: int,
+        min_calls: int,
+        failure_rate_threshold: float,
+        open_duration: float,
+        half_open_max_calls: int,
+    ):
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.open_duration = open_duration
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CircuitBreakerState.CLOSED
+        self.__outcomes = deque(maxlen=window_size)
+        self.__opened_at = 0.0
+        self.__half_open_calls = 0
+        self.__half_open_successes = 0
+
+    def allow_request(self) -> bool:
+        if self.state == CircuitBreakerState.OPEN:
+            if monotonic() - self.__opened_at < self.open_duration:
+                return False
+            self.state = CircuitBreakerState.HALF_OPEN
+            self.__half_open_calls = 0
+            self.__half_open_successes = 0
+        if self.state == CircuitBreakerState.HALF_OPEN:
+            if self.__half_open_calls >= self.half_open_max_calls:
+                return False
+            self.__half_open_calls += 1
+        return True
+
+    def record_success(self):
+        if self.state == CircuitBreakerState.HALF_OPEN:
+            self.__half_open_successes += 1
+            if self.__half_open_successes >= self.half_open_max_calls:
+                self.state = CircuitBreakerState.CLOSED
+                self.__outcomes.clear()
+            return
+        self.__outcomes.append(True)
+
+    def record_failure(self):
+        if self.state == CircuitBreakerState.HALF_OPEN:
+            self.__open()
+            return
+        self.__outcomes.append(False)
+        if (
+            len(self.__outcomes) >= self.min_calls
+            and self.failure_rate >= self.failure_rate_threshold
+        ):
+            self.__open()
+
+    def record_abort(self):
+        if self.state == CircuitBreakerState.HALF_OPEN:
+            self.__half_open_calls = max(self.__half_open_calls - 1, 0)
+
+    @property
+    def failure_rate(self) -> float:
+        if not self.__outcomes:
+            return 0.0
+        return self.__outcomes.count(False) / len(self.__outcomes)
+
+    def get_state(self) -> dict:
+        return {
+            "state": self.state.value,
+            "failure_rate": self.failure_rate,
+            "calls": len(self.__outcomes),
+        }
+
+    def __open(self):
+        self.state = CircuitBreakerState.OPEN
+        self.__opened_at = monotonic()
+        self.__outcomes.clear()
+
+
+class CircuitBreakers:
+    enabled = Setting("CARONTE_CIRCUIT_BREAKER_ENABLED", default=True, cast=bool)
+    window_size = Setting("CARONTE_CIRCUIT_BREAKER_WINDOW_SIZE", default=20, cast=int)
+    min_calls = Setting("CARONTE_CIRCUIT_BREAKER_MIN_CALLS", default=10, cast=int)
+    failure_rate_threshold = Setting(
+        "CARONTE_CIRCUIT_BREAKER_FAILURE_RATE_THRESHOLD", default=0.5, cast=float
+    )
+    open_duration = Setting(
+        "CARONTE_CIRCUIT_BREAKER_OPEN_DURATION", default=30, cast=float
+    )
+    half_open_max_calls = Setting(
+        "CARONTE_CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS", default=1, cast=int
+    )
+
+    __circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+    @classmethod
+    def get_circuit_breaker(cls, url: str) -> CircuitBreaker:
+        endpoint = cls._get_endpoint(url)
+        if (circuit_breaker := cls.__circuit_breakers.get(endpoint)) is None:
+            circuit_breaker = CircuitBreaker(
+                window_size=int(cls.window_size),
+                min_calls=int(cls.min_calls),
+                failure_rate_threshold=float(cls.failure_rate_threshold),
+                open_duration=float(cls.open_duration),
+                half_open_max_calls=int(cls.half_open_max_calls),
+            )
+            cls.__circuit_breakers[endpoint] = circuit_breaker
+        return circuit_breaker
+
+    @classmethod
+    def get_states(cls) -> Dict[str, dict]:
+        return {
+            endpoint: circuit_breaker.get_state()
+            for endpoint, circuit_breaker in cls.__circuit_breakers.items()
+        }
+
+    @classmethod
+    def reset(cls):
+        cls.__circuit_breakers.clear()
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _get_endpoint(url: str) -> str:
+        parsed_url = URL(url)
+        return f'{parsed_url.host or ""}{parsed_url.path}'
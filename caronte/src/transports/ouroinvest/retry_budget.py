@@ -0,0 +1,36 @@
+# Caronte
+from caronte.src.infrastructures.env_config import Setting
+
+
+class RetryBudget:
+    ratio = Setting("CARONTE_RETRY_BUDGET_RATIO", default=0.1, cast=float)
+    max_balance = Setting("CARONTE_RETRY_BUDGET_MAX_BALANCE", default=100, cast=float)
+    initial_balance = Setting(
+        "CARONTE_RETRY_BUDGET_INITIAL_BALANCE", default=10, cast=float
+    )
+
+    __balance = None
+
+    @classmethod
+    def record_request(cls):
+        cls.__balance = min(
+            cls.__get_balance() + float(cls.ratio), float(cls.max_balance)
+        )
+
+    @classmethod
+    def try_withdraw(cls) -> bool:
+        balance = cls.__get_balance()
+        if balance < 1:
+            return False
+        cls.__balance = balance - 1
+        return True
+
+    @classmethod
+    def reset(cls):
+        cls.__balance = None
+
+    @classmethod
+    def __get_balance(cls) -> float:
+        if cls.__balance is None:
+            cls.__balance = float(cls.initial_balance)
+        return cls.__balance
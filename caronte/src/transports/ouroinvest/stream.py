@@ -0,0 +1,113 @@
+# Standards
+import re
+from typing import Any, AsyncIterator, List, Optional
+
+# Third party
+from aiohttp import ClientResponse
+import orjson
+
+
+class JsonArrayStream:
+    __structural = re.compile(rb'[\[\]{},"]')
+    __string_control = re.compile(rb'["\\]')
+    __opening = b"[{"
+    __closing = b"]}"
+    __quote = ord('"')
+    __backslash = ord("\\")
+
+    def __init__(self):
+        self.__buffer = bytearray()
+        self.__position = 0
+        self.__depth = 0
+        self.__in_string = False
+        self.__item_start: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        buffer = self.__buffer
+        buffer.extend(chunk)
+        items = []
+        position = self.__position
+        while True:
+            if self.__in_string:
+                match = self.__string_control.search(buffer, position)
+                if match is None:
+                    position = len(buffer)
+                    break
+                position = match.start()
+                if buffer[position] == self.__backslash:
+                    if position + 1 >= len(buffer):
+                        break
+                    position += 2
+                    continue
+                self.__in_string = False
+                position += 1
+                continue
+
+            match = self.__structural.search(buffer, position)
+            if match is None:
+                position = len(buffer)
+                break
+            position = match.start()
+            byte = buffer[position]
+            if byte == self.__quote:
+                self.__in_string = True
+            elif byte in self.__opening:
+                self.__depth += 1
+                if self.__depth == 1:
+                    self.__item_start = position + 1
+            elif byte in self.__closing:
+                self.__depth -= 1
+                if self.__depth == 0:
+                    self.__flush_item(items, position)
+                    self.__item_start = None
+            elif self.__depth == 1:
+                self.__flush_item(items, position)
+                self.__item_start = position + 1
+            position += 1
+
+        consumed = position if self.__item_start is None else self.__item_start
+        del buffer[:consumed]
+        self.__position = position - consumed
+        if self.__item_start is not None:
+            self.__item_start = 0
+        return items
+
+    def __flush_item(self, items: List[Any], end: int):
+        if self.__item_start is None:
+            return
+        raw_item = bytes(self.__buffer[self.__item_start : end]).strip()
+        if raw_item:
+            items.append(orjson.loads(raw_item))
+
+
+class ResponseStream:
+    """Holds its pooled connection until consumed to the end or closed.
+
+    Callers that may stop early must close it, with ``aclose`` or ``async with``.
+    """
+
+    def __init__(self, response: ClientResponse, content: AsyncIterator[Any]):
+        self.__response = response
+        self.__content = content
+
+    def __aiter__(self) -> "ResponseStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return await self.__content.__anext__()
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self):
+        try:
+            await self.__content.aclose()
+        finally:
+            self.__response.release()
+
+    async def __aenter__(self) -> "ResponseStream":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -1,58 +1,356 @@
-# Caronte
-from caronte.src.domain.models.authentication.response.model import (
-    CaronteStatusResponse,
-)
-from caronte.src.domain.enums.http_methods import AllowedHTTPMethods
-from caronte.src.domain.enums.response import CaronteStatus
-from caronte.src.infrastructures.env_config import config
-
 # Standards
+import asyncio
 from http import HTTPStatus
 from datetime import datetime
+from random import uniform
+from time import perf_counter
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
 # Third party
-from aiohttp import ClientSession, ClientResponse
+from aiohttp import ClientConnectionError, ClientSession, ClientResponse, TCPConnector
 from etria_logger import Gladsheim
 from pytz import timezone
+import orjson
+
+# Caronte
+from caronte.src.domain.models.authentication.response.model import (
+    CaronteStatusResponse,
+)
+from caronte.src.domain.enums.hook import HookEvent
+from caronte.src.domain.enums.http_methods import AllowedHTTPMethods
+from caronte.src.domain.enums.rate_limit import RateLimitBucket
+from caronte.src.domain.enums.response import CaronteStatus
+from caronte.src.domain.exceptions.base_exceptions.exception import TransportException
+from caronte.src.domain.exceptions.transport.exception import CircuitBreakerOpen
+from caronte.src.domain.models.call_context.model import CallContext
+from caronte.src.infrastructures.env_config import Setting, Settings
+from caronte.src.infrastructures.hooks import Hooks, current_call_context
+from caronte.src.infrastructures.metrics import Metrics
+from caronte.src.repositories.rate_limiter.repository import RateLimiter
+from caronte.src.transports.ouroinvest.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakers,
+)
+from caronte.src.transports.ouroinvest.retry_budget import RetryBudget
+from caronte.src.transports.ouroinvest.stream import JsonArrayStream, ResponseStream
 
 
 class HTTPTransport:
-    __session = None
+    __sessions = {}
+    __control_envelope = None
+    __control_envelope_version = None
+    __control_timezone = timezone("America/Sao_Paulo")
+    stream_chunk_size = Setting(
+        "CARONTE_STREAM_CHUNK_SIZE", default=64 * 1024, cast=int
+    )
+    pool_limit = Setting("CARONTE_HTTP_POOL_LIMIT", default=100, cast=int)
+    pool_limit_per_host = Setting(
+        "CARONTE_HTTP_POOL_LIMIT_PER_HOST", default=0, cast=int
+    )
+    keepalive_timeout = Setting(
+        "CARONTE_HTTP_KEEPALIVE_TIMEOUT", default=15, cast=float
+    )
+    dns_cache_ttl = Setting("CARONTE_HTTP_DNS_CACHE_TTL", default=10, cast=int)
+    retry_attempts = Setting("CARONTE_HTTP_RETRY_ATTEMPTS", default=2, cast=int)
+    retry_backoff_base = Setting(
+        "CARONTE_HTTP_RETRY_BACKOFF_BASE", default=0.1, cast=float
+    )
+    retry_backoff_max = Setting("CARONTE_HTTP_RETRY_BACKOFF_MAX", default=2, cast=float)
+    retry_budget = RetryBudget
+    circuit_breakers = CircuitBreakers
+    rate_limiter = RateLimiter
+    hooks = Hooks()
+    correlation_id_header = Setting(
+        "CARONTE_CORRELATION_ID_HEADER", default="X-Correlation-ID"
+    )
+    control_resource_code = Setting("OUROINVEST_CONTROLE_RECURSO_CODIGO")
+    control_resource_acronym = Setting("OUROINVEST_CONTROLE_RECURSO_SIGLA")
+    control_origin_name = Setting("OUROINVEST_CONTROLE_ORIGEM_NOME")
+    control_origin_key = Setting("OUROINVEST_CONTROLE_ORIGEM_CHAVE")
+    control_origin_address = Setting("OUROINVEST_CONTROLE_ORIGEM_ENDERECO")
+
+    @classmethod
+    async def startup(cls):
+        cls.__get_control_envelope()
+        await cls.__get_session()
+
+    @classmethod
+    async def aclose(cls):
+        session = cls.__sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    @classmethod
+    def get_circuit_breakers_state(cls) -> Dict[str, dict]:
+        return cls.circuit_breakers.get_states()
 
     @classmethod
     async def request_method(
-        cls, method: AllowedHTTPMethods, url: str, body: dict, headers: dict = None
+        cls,
+        method: AllowedHTTPMethods,
+        url: str,
+        body: dict,
+        headers: dict = None,
+        idempotent: bool = None,
+        rate_limit_bucket: RateLimitBucket = RateLimitBucket.BUSINESS,
     ) -> CaronteStatusResponse:
-        if body:
-            body.update(cls.__get_control())
-        session = await cls.__get_session()
-        response = await session.request(method.value, url, headers=headers, json=body)
+        try:
+            response = await cls.__send(
+                method=method,
+                url=url,
+                body=body,
+                headers=headers,
+                idempotent=idempotent,
+                rate_limit_bucket=rate_limit_bucket,
+            )
+        except TransportException as ex:
+            Gladsheim.info(message=ex.msg, url=url)
+            return CaronteStatusResponse((False, ex.code, None))
         result = await cls.__map_response(response=response)
         return result
 
+    @classmethod
+    async def request_stream(
+        cls,
+        method: AllowedHTTPMethods,
+        url: str,
+        body: dict,
+        headers: dict = None,
+        json_items: bool = False,
+        idempotent: bool = None,
+        rate_limit_bucket: RateLimitBucket = RateLimitBucket.BUSINESS,
+    ) -> CaronteStatusResponse:
+        try:
+            response = await cls.__send(
+                method=method,
+                url=url,
+                body=body,
+                headers=headers,
+                idempotent=idempotent,
+                rate_limit_bucket=rate_limit_bucket,
+            )
+        except TransportException as ex:
+            Gladsheim.info(message=ex.msg, url=url)
+            return CaronteStatusResponse((False, ex.code, None))
+        if response.status != HTTPStatus.OK:
+            return await cls.__map_response(response=response)
+        content = (
+            cls.__iter_json_items(response)
+            if json_items
+            else cls.__iter_chunks(response)
+        )
+        return CaronteStatusResponse(
+            (True, CaronteStatus.SUCCESS, ResponseStream(response, content))
+        )
+
+    @classmethod
+    async def __send(
+        cls,
+        method: AllowedHTTPMethods,
+        url: str,
+        body: dict,
+        headers: dict = None,
+        idempotent: bool = None,
+        rate_limit_bucket: RateLimitBucket = RateLimitBucket.BUSINESS,
+    ) -> ClientResponse:
+        context = current_call_context.get() or CallContext(method, url)
+        headers = {**(headers or {}), cls.correlation_id_header: context.correlation_id}
+        data = None
+        if body:
+            data = cls.__encode_body(body)
+            headers["Content-Type"] = "application/json"
+        if idempotent is None:
+            idempotent = method == AllowedHTTPMethods.GET
+        retry_attempts = int(cls.retry_attempts) if idempotent else 0
+        circuit_breaker = cls.__get_circuit_breaker(url)
+        cls.retry_budget.record_request()
+        attempt = 0
+        while True:
+            if circuit_breaker and not circuit_breaker.allow_request():
+                raise CircuitBreakerOpen()
+            try:
+                await cls.rate_limiter.acquire(rate_limit_bucket)
+            except BaseException:
+                cls.__record_abort(circuit_breaker)
+                raise
+            cls.hooks.emit(
+                HookEvent.REQUEST_START,
+                context,
+                method=method,
+                url=url,
+                attempt=attempt,
+            )
+            started_at = perf_counter()
+            try:
+                response = await cls.__request(method, url, headers, data, context)
+            except (ClientConnectionError, asyncio.TimeoutError) as error:
+                cls.hooks.emit(
+                    HookEvent.ERROR,
+                    context,
+                    method=method,
+                    url=url,
+                    attempt=attempt,
+                    error=error,
+                    elapsed=context.elapsed(since=started_at),
+                )
+                cls.__record_outcome(circuit_breaker, success=False)
+                if not cls.__can_retry(attempt, retry_attempts):
+                    raise
+                Gladsheim.info(
+                    message="Retrying exchange request",
+                    url=url,
+                    correlation_id=context.correlation_id,
+                    error=error,
+                )
+            except BaseException as error:
+                cls.hooks.emit(
+                    HookEvent.ERROR,
+                    context,
+                    method=method,
+                    url=url,
+                    attempt=attempt,
+                    error=error,
+                    elapsed=context.elapsed(since=started_at),
+                )
+                cls.__record_abort(circuit_breaker)
+                raise
+            else:
+                cls.hooks.emit(
+                    HookEvent.RESPONSE,
+                    context,
+                    method=method,
+                    url=url,
+                    attempt=attempt,
+                    http_status=response.status,
+                    elapsed=context.elapsed(since=started_at),
+                )
+                if response.status < HTTPStatus.INTERNAL_SERVER_ERROR:
+                    cls.__record_outcome(circuit_breaker, success=True)
+                    return response
+                cls.__record_outcome(circuit_breaker, success=False)
+                if not cls.__can_retry(attempt, retry_attempts):
+                    return response
+                response.release()
+            attempt += 1
+            await asyncio.sleep(cls.__get_retry_backoff(attempt))
+
+    @classmethod
+    async def __request(
+        cls,
+        method: AllowedHTTPMethods,
+        url: str,
+        headers: dict,
+        data: Optional[bytes],
+        context: CallContext,
+    ) -> ClientResponse:
+        if context.trace_headers:
+            headers = {**headers, **context.trace_headers}
+        session = await cls.__get_session()
+        with Metrics.stage("exchange_request"):
+            return await session.request(method.value, url, headers=headers, data=data)
+
+    @classmethod
+    def __get_circuit_breaker(cls, url: str) -> Optional[CircuitBreaker]:
+        if not cls.circuit_breakers.enabled:
+            return None
+        return cls.circuit_breakers.get_circuit_breaker(url)
+
     @staticmethod
-    def __get_control():
-        control = {
-            "controle": {
-                "dataHoraCliente": datetime.now(tz=timezone("America/Sao_Paulo")),
-                "recurso": {
-                    "codigo": config("OUROINVEST_CONTROLE_RECURSO_CODIGO"),
-                    "sigla": config("OUROINVEST_CONTROLE_RECURSO_SIGLA"),
-                },
-                "origem": {
-                    "nome": config("OUROINVEST_CONTROLE_ORIGEM_NOME"),
-                    "chave": config("OUROINVEST_CONTROLE_ORIGEM_CHAVE"),
-                    "endereco": config("OUROINVEST_CONTROLE_ORIGEM_ENDERECO"),
-                },
-            }
-        }
-        return control
+    def __record_outcome(circuit_breaker: Optional[CircuitBreaker], success: bool):
+        if circuit_breaker is None:
+            return
+        if success:
+            circuit_breaker.record_success()
+        else:
+            circuit_breaker.record_failure()
+
+    @staticmethod
+    def __record_abort(circuit_breaker: Optional[CircuitBreaker]):
+        if circuit_breaker is not None:
+            circuit_breaker.record_abort()
+
+    @classmethod
+    def __can_retry(cls, attempt: int, retry_attempts: int) -> bool:
+        return attempt < retry_attempts and cls.retry_budget.try_withdraw()
+
+    @classmethod
+    def __get_retry_backoff(cls, attempt: int) -> float:
+        backoff = float(cls.retry_backoff_base) * 2 ** (attempt - 1)
+        return uniform(0, min(backoff, float(cls.retry_backoff_max)))
+
+    @classmethod
+    async def __iter_chunks(cls, response: ClientResponse) -> AsyncIterator[bytes]:
+        async for chunk in response.content.iter_chunked(int(cls.stream_chunk_size)):
+            yield chunk
+
+    @classmethod
+    async def __iter_json_items(cls, response: ClientResponse) -> AsyncIterator[Any]:
+        json_array_stream = JsonArrayStream()
+        async for chunk in cls.__iter_chunks(response):
+            for item in json_array_stream.feed(chunk):
+                yield item
+
+    @classmethod
+    def __encode_body(cls, body: dict) -> bytes:
+        if "controle" in body:
+            body = {key: value for key, value in body.items() if key != "controle"}
+        control_prefix, control_suffix = cls.__get_control_envelope()
+        client_datetime = orjson.dumps(datetime.now(tz=cls.__control_timezone))
+        payload = orjson.dumps(body)
+        if payload == b"{}":
+            return b"".join((control_prefix, client_datetime, control_suffix, b"}"))
+        return b"".join(
+            (control_prefix, client_datetime, control_suffix, b",", payload[1:])
+        )
+
+    @classmethod
+    def __get_control_envelope(cls) -> Tuple[bytes, bytes]:
+        control_envelope = cls.__control_envelope
+        if cls.__control_envelope_version != Settings.version:
+            static_control = orjson.dumps(
+                {
+                    "recurso": {
+                        "codigo": cls.control_resource_code,
+                        "sigla": cls.control_resource_acronym,
+                    },
+                    "origem": {
+                        "nome": cls.control_origin_name,
+                        "chave": cls.control_origin_key,
+                        "endereco": cls.control_origin_address,
+                    },
+                }
+            )
+            control_envelope = cls.__control_envelope = (
+                b'{"controle":{"dataHoraCliente":',
+                b"," + static_control[1:],
+            )
+            cls.__control_envelope_version = Settings.version
+        return control_envelope
 
     @classmethod
     async def __get_session(cls) -> ClientSession:
-        if cls.__session is None:
-            cls.__session = ClientSession()
-        return cls.__session
+        loop = asyncio.get_running_loop()
+        session = cls.__sessions.get(loop)
+        if session is None or session.closed:
+            cls.__discard_closed_loops_sessions()
+            session = ClientSession(connector=cls.__create_connector())
+            cls.__sessions[loop] = session
+        return session
+
+    @classmethod
+    def __create_connector(cls) -> TCPConnector:
+        return TCPConnector(
+            limit=int(cls.pool_limit),
+            limit_per_host=int(cls.pool_limit_per_host),
+            keepalive_timeout=float(cls.keepalive_timeout),
+            ttl_dns_cache=int(cls.dns_cache_ttl),
+            use_dns_cache=True,
+        )
+
+    @classmethod
+    def __discard_closed_loops_sessions(cls):
+        for loop in [loop for loop in cls.__sessions if loop.is_closed()]:
+            del cls.__sessions[loop]
 
     @classmethod
     async def __map_response(cls, response: ClientResponse) -> CaronteStatusResponse:
@@ -64,18 +362,21 @@ class HTTPTransport:
             CaronteStatus.UNEXPECTED_ERROR: cls.__when_unexpected_error,
         }
         response_function = possibilities_response_map.get(
-            response.status, possibilities_response_map.get(CaronteStatus.UNEXPECTED_ERROR)
+            response.status,
+            possibilities_response_map.get(CaronteStatus.UNEXPECTED_ERROR),
         )
         result = await response_function(response=response)
         return result
 
     @staticmethod
     async def __when_success_status(response: ClientResponse) -> CaronteStatusResponse:
-        content = await response.json()
+        content = await response.json(loads=orjson.loads)
         return CaronteStatusResponse((True, CaronteStatus.SUCCESS, content))
 
     @staticmethod
-    async def __when_bad_request_status(response: ClientResponse) -> CaronteStatusResponse:
+    async def __when_bad_request_status(
+        response: ClientResponse,
+    ) -> CaronteStatusResponse:
         message = await response.content.read()
         Gladsheim.info(
             status=response.status, reason=response.reason, content=message.decode()
@@ -83,7 +384,9 @@ class HTTPTransport:
         return CaronteStatusResponse((False, CaronteStatus.BAD_REQUEST, None))
 
     @staticmethod
-    async def __when_forbidden_status(response: ClientResponse) -> CaronteStatusResponse:
+    async def __when_forbidden_status(
+        response: ClientResponse,
+    ) -> CaronteStatusResponse:
         message = await response.content.read()
         Gladsheim.info(
             status=response.status, reason=response.reason, content=message.decode()
@@ -91,7 +394,9 @@ class HTTPTransport:
         return CaronteStatusResponse((False, CaronteStatus.FORBIDDEN, None))
 
     @staticmethod
-    async def __when_unauthorized_status(response: ClientResponse) -> CaronteStatusResponse:
+    async def __when_unauthorized_status(
+        response: ClientResponse,
+    ) -> CaronteStatusResponse:
         message = await response.content.read()
         Gladsheim.info(
             status=response.status, reason=response.reason, content=message.decode()
@@ -99,7 +404,9 @@ class HTTPTransport:
         return CaronteStatusResponse((False, CaronteStatus.UNAUTHORIZED, None))
 
     @staticmethod
-    async def __when_unexpected_error(response: ClientResponse) -> CaronteStatusResponse:
+    async def __when_unexpected_error(
+        response: ClientResponse,
+    ) -> CaronteStatusResponse:
         message = await response.content.read()
         Gladsheim.error(
             status=response.status, reason=response.reason, content=message.decode()
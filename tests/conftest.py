@@ -0,0 +1,11 @@
+import pytest
+
+from caronte.src.infrastructures.env_config import Settings
+
+
+@pytest.fixture(autouse=True)
+def settings():
+    Settings.configure(source=lambda key, default=None, cast=None: "ENV_VALUE{}")
+    yield Settings
+    Settings.clear_overrides()
+    Settings.configure(source=None)
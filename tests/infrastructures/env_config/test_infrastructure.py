@@ -0,0 +1,101 @@
+import pytest
+
+from caronte.src.domain.exceptions.infrastructure.exception import InvalidSettings
+from caronte.src.infrastructures.env_config import Setting, Settings
+
+
+class DummySettings:
+    required = Setting("CARONTE_TEST_REQUIRED")
+    optional = Setting("CARONTE_TEST_OPTIONAL", default="10", cast=int)
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    path = tmp_path / ".env"
+    path.write_text("CARONTE_TEST_REQUIRED=from_file\nCARONTE_TEST_OPTIONAL=20\n")
+    monkeypatch.setenv(Settings.env_file_variable, str(path))
+    Settings.configure(source=None)
+    return path
+
+
+def test_setting_is_resolved_lazily_and_cached(settings):
+    calls = []
+
+    def source(key, default=None, cast=None):
+        calls.append(key)
+        return "value"
+
+    settings.configure(source=source)
+    assert calls == []
+    assert DummySettings.required == "value"
+    assert DummySettings.required == "value"
+    assert calls == ["CARONTE_TEST_REQUIRED"]
+
+
+def test_setting_reads_env_file(env_file):
+    assert DummySettings.required == "from_file"
+    assert DummySettings.optional == 20
+
+
+def test_environment_overrides_env_file(env_file, monkeypatch):
+    monkeypatch.setenv("CARONTE_TEST_OPTIONAL", "30")
+    assert DummySettings.optional == 30
+
+
+def test_in_memory_overrides(env_file, settings):
+    settings.override(CARONTE_TEST_REQUIRED="in_memory")
+    assert DummySettings.required == "in_memory"
+    settings.clear_overrides()
+    assert DummySettings.required == "from_file"
+
+
+def test_reload_reads_env_file_again(env_file, settings):
+    assert DummySettings.required == "from_file"
+    version = settings.version
+    env_file.write_text("CARONTE_TEST_REQUIRED=reloaded\n")
+    settings.reload()
+    assert DummySettings.required == "reloaded"
+    assert DummySettings.optional == 10
+    assert settings.version > version
+
+
+def test_missing_env_file_falls_back_to_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(Settings.env_file_variable, str(tmp_path / "missing.env"))
+    monkeypatch.setenv("CARONTE_TEST_REQUIRED", "from_environment")
+    Settings.configure(source=None)
+    assert DummySettings.required == "from_environment"
+    assert DummySettings.optional == 10
+
+
+def test_validate_reports_every_invalid_setting(tmp_path, monkeypatch):
+    monkeypatch.setenv(Settings.env_file_variable, str(tmp_path / "missing.env"))
+    monkeypatch.setenv("CARONTE_TEST_OPTIONAL", "not a number")
+    Settings.configure(source=None)
+    with pytest.raises(InvalidSettings) as error:
+        Settings.validate()
+    assert "CARONTE_TEST_REQUIRED" in error.value.errors
+    assert "CARONTE_TEST_OPTIONAL" in error.value.errors
+
+
+def test_validate_only_the_given_owners(tmp_path, monkeypatch):
+    class OtherSettings:
+        other = Setting("CARONTE_TEST_OTHER", default="1", cast=int)
+
+    monkeypatch.setenv(Settings.env_file_variable, str(tmp_path / "missing.env"))
+    Settings.configure(source=None)
+    Settings.validate(OtherSettings)
+    with pytest.raises(InvalidSettings):
+        Settings.validate(DummySettings)
+
+
+def test_backends_are_selected_by_settings(settings):
+    from caronte.src.repositories.authentication.redis_lock_manager.repository import (
+        RedisLockManagerRepository,
+    )
+    from caronte.src.repositories.memory_cache.repository import MemoryCache
+    from caronte.src.service.token import TokenService
+
+    settings.configure(source=None)
+    settings.override(CARONTE_CACHE_BACKEND="memory", CARONTE_LOCK_BACKEND="redis")
+    assert TokenService.cache is MemoryCache
+    assert TokenService.lock_manager is RedisLockManagerRepository
@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+import pytest
+
+from caronte.src.infrastructures.metrics import infrastructure
+from caronte.src.infrastructures.metrics.infrastructure import Metrics
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    monkeypatch.setattr(Metrics, "enabled", True)
+    monkeypatch.setattr(Metrics, "latency_buckets", (0.1, 1))
+    Metrics.reset()
+    yield Metrics
+    Metrics.reset()
+
+
+def test_render_counters_and_gauges(metrics):
+    metrics.increment("token_cache_total", result="hit")
+    metrics.increment("token_cache_total", result="hit")
+    metrics.increment("responses_total", status='say "hi"')
+    metrics.add("stage_in_flight", 1, stage="request")
+    exposition = metrics.render()
+    assert "# TYPE caronte_token_cache_total counter" in exposition
+    assert 'caronte_token_cache_total{result="hit"} 2' in exposition
+    assert 'caronte_responses_total{status="say \\"hi\\""} 1' in exposition
+    assert 'caronte_stage_in_flight{stage="request"} 1' in exposition
+
+
+def test_stage_records_cumulative_histogram(metrics):
+    with patch.object(
+        infrastructure, "perf_counter", side_effect=[0, 0.1, 10, 10.5, 20, 25]
+    ):
+        for _ in range(3):
+            with metrics.stage("cache_get"):
+                pass
+    exposition = metrics.render()
+    assert (
+        'caronte_stage_duration_seconds_bucket{stage="cache_get",le="0.1"} 1'
+        in exposition
+    )
+    assert (
+        'caronte_stage_duration_seconds_bucket{stage="cache_get",le="1"} 2'
+        in exposition
+    )
+    assert (
+        'caronte_stage_duration_seconds_bucket{stage="cache_get",le="+Inf"} 3'
+        in exposition
+    )
+    assert 'caronte_stage_duration_seconds_sum{stage="cache_get"} 5.6' in exposition
+    assert 'caronte_stage_duration_seconds_count{stage="cache_get"} 3' in exposition
+    assert 'caronte_stage_in_flight{stage="cache_get"} 0' in exposition
+
+
+def test_disabled_metrics_record_nothing(metrics, monkeypatch):
+    monkeypatch.setattr(Metrics, "enabled", False)
+    with metrics.stage("request"):
+        metrics.increment("responses_total", status="success")
+    assert metrics.get_counters() == {}
+    assert "caronte_responses_total{" not in metrics.render()
@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+import pytest
+
+from caronte.src.infrastructures.redis.distribuited_lock_manager import infrastructure
+from caronte.src.infrastructures.redis.distribuited_lock_manager.infrastructure import (
+    RedLockManagerInfrastructure,
+    parse_redis_urls,
+)
+
+
+@pytest.mark.parametrize(
+    "redis_urls, expected",
+    [
+        ("redis://a:6379, redis://b:6379", ["redis://a:6379", "redis://b:6379"]),
+        (
+            "['redis://a:6379', {'host': 'b', 'port': 6379}]",
+            ["redis://a:6379", {"host": "b", "port": 6379}],
+        ),
+        (("redis://a:6379",), ["redis://a:6379"]),
+    ],
+)
+def test_parse_redis_urls(redis_urls, expected):
+    assert parse_redis_urls(redis_urls) == expected
+
+
+@pytest.mark.parametrize("redis_urls", ["[__import__('os').system('id')]", "[1, 2"])
+def test_parse_redis_urls_does_not_evaluate_code(redis_urls):
+    with pytest.raises((ValueError, SyntaxError)):
+        parse_redis_urls(redis_urls)
+
+
+def test_get_red_lock_manager_does_not_cache_failures(monkeypatch):
+    monkeypatch.setattr(RedLockManagerInfrastructure, "red_lock_manager", None)
+    monkeypatch.setattr(RedLockManagerInfrastructure, "redis_urls", "redis://a:6379")
+    with patch.object(
+        infrastructure, "Aioredlock", side_effect=[ValueError(), "manager"]
+    ):
+        with pytest.raises(ValueError):
+            RedLockManagerInfrastructure.get_red_lock_manager()
+        assert RedLockManagerInfrastructure.get_red_lock_manager() == "manager"
@@ -1,23 +1,95 @@
-import aioredis
-from unittest.mock import patch
-from decouple import Config, RepositoryEnv
+from unittest.mock import patch, MagicMock
 
+import pytest
+import redis.asyncio as aioredis
+from redis.asyncio.sentinel import Sentinel
 
-with patch.object(RepositoryEnv, "__init__", return_value=None):
-    with patch.object(Config, "__init__", return_value=None):
-        with patch.object(Config, "__call__", return_value="ENV_VALUE{}"):
-            from caronte.src.infrastructures.redis.client.infrastructure import RedisInfrastructure
+from caronte.src.domain.enums.redis import RedisTopology
+from caronte.src.domain.exceptions.infrastructure.exception import InvalidSettings
+from caronte.src.infrastructures.redis.client.infrastructure import RedisInfrastructure
+from caronte.src.repositories.authentication.redis_lock_manager.repository import (
+    RedisLockManagerRepository,
+)
+from caronte.src.repositories.cache.repository import Cache
+from caronte.src.repositories.rate_limiter.repository import RateLimiter
 
 dummy_connection = "dummy connection"
 
 
-@patch.object(aioredis, "from_url", return_value=dummy_connection)
-def test_get_redis(mock_s3_connection):
-    new_connection_created = RedisInfrastructure.get_redis()
-    assert new_connection_created == dummy_connection
-    mock_s3_connection.assert_called_once()
+@pytest.fixture
+def redis_infrastructure(monkeypatch):
+    monkeypatch.setattr(RedisInfrastructure, "_RedisInfrastructure__redis", None)
+    monkeypatch.setattr(RedisInfrastructure, "redis_host", "redis://localhost")
+    monkeypatch.setattr(RedisInfrastructure, "redis_db", 1)
+    monkeypatch.setattr(RedisInfrastructure, "redis_topology", RedisTopology.STANDALONE)
+    monkeypatch.setattr(
+        RedisInfrastructure, "redis_sentinels", ["sentinel-1:26379", "sentinel-2:26379"]
+    )
+    monkeypatch.setattr(RedisInfrastructure, "redis_sentinel_service_name", "master")
+    monkeypatch.setattr(RedisInfrastructure, "redis_max_connections", 10)
+    monkeypatch.setattr(RedisInfrastructure, "redis_pool_timeout", 3)
+    monkeypatch.setattr(RedisInfrastructure, "redis_socket_timeout", 1)
+    monkeypatch.setattr(RedisInfrastructure, "redis_socket_connect_timeout", 1)
+    monkeypatch.setattr(RedisInfrastructure, "redis_retry_on_timeout", True)
+    monkeypatch.setattr(RedisInfrastructure, "redis_retry_attempts", 3)
+    monkeypatch.setattr(RedisInfrastructure, "redis_retry_backoff_base", 0.05)
+    monkeypatch.setattr(RedisInfrastructure, "redis_retry_backoff_max", 1)
+    monkeypatch.setattr(RedisInfrastructure, "redis_health_check_interval", 30)
+    return RedisInfrastructure
+
 
-    reused_client = RedisInfrastructure.get_redis()
+@patch.object(
+    aioredis.BlockingConnectionPool, "from_url", return_value=dummy_connection
+)
+@patch.object(aioredis, "Redis", return_value=dummy_connection)
+def test_get_redis(mocked_redis, mocked_pool, redis_infrastructure):
+    new_connection_created = redis_infrastructure.get_redis()
+    assert new_connection_created == dummy_connection
+    reused_client = redis_infrastructure.get_redis()
     assert reused_client == new_connection_created
-    mock_s3_connection.assert_called_once()
-    RedisInfrastructure.client = None
+    mocked_redis.assert_called_once_with(connection_pool=dummy_connection)
+    (url,), options = mocked_pool.call_args
+    assert url == "redis://localhost?db=1"
+    assert options["max_connections"] == 10
+    assert options["timeout"] == 3
+    assert options["socket_timeout"] == 1
+    assert options["health_check_interval"] == 30
+    assert options["retry_on_timeout"] is True
+
+
+@patch.object(aioredis.BlockingConnectionPool, "from_url")
+@patch.object(aioredis, "Redis", side_effect=lambda connection_pool: object())
+def test_get_redis_is_shared_by_subclasses(
+    mocked_redis, mocked_pool, redis_infrastructure
+):
+    clients = [
+        repository.get_redis()
+        for repository in (Cache, RateLimiter, RedisLockManagerRepository)
+    ]
+    assert clients[0] is clients[1] is clients[2]
+    assert redis_infrastructure.get_redis() is clients[0]
+    mocked_pool.assert_called_once()
+    mocked_redis.assert_called_once()
+
+
+@patch.object(Sentinel, "master_for", return_value=dummy_connection)
+def test_get_redis_from_sentinel(mocked_master_for, redis_infrastructure, monkeypatch):
+    monkeypatch.setattr(RedisInfrastructure, "redis_topology", "sentinel")
+    with patch.object(Sentinel, "__init__", return_value=None) as mocked_sentinel:
+        assert redis_infrastructure.get_redis() == dummy_connection
+    (addresses,), options = mocked_sentinel.call_args
+    assert addresses == [("sentinel-1", 26379), ("sentinel-2", 26379)]
+    assert options["db"] == 1
+    assert options["sentinel_kwargs"] == {
+        "socket_timeout": 1,
+        "socket_connect_timeout": 1,
+    }
+    mocked_master_for.assert_called_once_with("master")
+
+
+@pytest.mark.parametrize("topology", ["cluster", "unknown"])
+def test_unsupported_topology_is_rejected(topology, settings):
+    settings.override(CARONTE_REDIS_TOPOLOGY=topology)
+    with pytest.raises(InvalidSettings) as error:
+        settings.validate(RedisInfrastructure)
+    assert "CARONTE_REDIS_TOPOLOGY" in error.value.errors
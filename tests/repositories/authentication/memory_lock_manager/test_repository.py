@@ -0,0 +1,71 @@
+from unittest.mock import patch
+
+import pytest
+
+from caronte.src.domain.models.authentication.response.model import (
+    LockAuthenticationStatus,
+    UnlockAuthenticationStatus,
+)
+from caronte.src.repositories.authentication.memory_lock_manager import (
+    repository as lock_module,
+)
+from caronte.src.repositories.authentication.memory_lock_manager.repository import (
+    MemoryLockManagerRepository,
+)
+
+
+@pytest.fixture
+def lock_manager(monkeypatch):
+    monkeypatch.setattr(MemoryLockManagerRepository, "lock_time_out", 10)
+    monkeypatch.setattr(
+        MemoryLockManagerRepository, "_MemoryLockManagerRepository__locks", {}
+    )
+    return MemoryLockManagerRepository
+
+
+@pytest.mark.asyncio
+async def test_lock_is_exclusive_until_unlocked(lock_manager):
+    success, status, lock = await lock_manager.lock_authentication("hash")
+    assert (success, status) == (True, LockAuthenticationStatus.SUCCESS)
+    assert lock.resource == "caronte:ouroinvest:hash"
+    assert await lock_manager.lock_authentication("hash") == (
+        False,
+        LockAuthenticationStatus.ACQUIRING_LOCK_ERROR,
+        None,
+    )
+    assert await lock_manager.unlock_authentication(lock) == (
+        True,
+        UnlockAuthenticationStatus.SUCCESS,
+    )
+    success, _, _ = await lock_manager.lock_authentication("hash")
+    assert success is True
+
+
+@pytest.mark.asyncio
+async def test_expired_lock_can_be_taken_over(lock_manager):
+    with patch.object(lock_module, "monotonic", return_value=100):
+        _, _, stale_lock = await lock_manager.lock_authentication("hash")
+    with patch.object(lock_module, "monotonic", return_value=111):
+        success, _, lock = await lock_manager.lock_authentication("hash")
+    assert success is True
+    assert await lock_manager.unlock_authentication(stale_lock) == (
+        False,
+        UnlockAuthenticationStatus.RUNTIME_LOCK_ERROR,
+    )
+    assert await lock_manager.unlock_authentication(lock) == (
+        True,
+        UnlockAuthenticationStatus.SUCCESS,
+    )
+
+
+@pytest.mark.asyncio
+async def test_extend_keeps_lock_until_new_timeout(lock_manager):
+    with patch.object(lock_module, "monotonic", return_value=100):
+        _, _, lock = await lock_manager.lock_authentication("hash")
+    with patch.object(lock_module, "monotonic", return_value=105):
+        assert await lock_manager.extend_authentication(lock) is True
+    with patch.object(lock_module, "monotonic", return_value=111):
+        success, _, _ = await lock_manager.lock_authentication("hash")
+        assert success is False
+    with patch.object(lock_module, "monotonic", return_value=116):
+        assert await lock_manager.extend_authentication(lock) is False
@@ -0,0 +1,87 @@
+from unittest.mock import patch, AsyncMock, MagicMock
+
+import pytest
+
+from caronte.src.domain.models.authentication.response.model import (
+    LockAuthenticationStatus,
+    UnlockAuthenticationStatus,
+)
+from caronte.src.repositories.authentication.redis_lock_manager.repository import (
+    RedisLockManagerRepository,
+)
+
+fake_redis = MagicMock()
+
+
+@pytest.fixture
+def lock_manager(monkeypatch):
+    fake_redis.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr(RedisLockManagerRepository, "lock_time_out", 10)
+    monkeypatch.setattr(
+        RedisLockManagerRepository, "distributed_lock_manager_identifier", "caronte"
+    )
+    with patch.object(RedisLockManagerRepository, "get_redis", return_value=fake_redis):
+        yield RedisLockManagerRepository
+
+
+@pytest.mark.asyncio
+async def test_lock_authentication(lock_manager):
+    fake_redis.set = AsyncMock(return_value=True)
+    success, status, lock = await lock_manager.lock_authentication("hash")
+    assert (success, status) == (True, LockAuthenticationStatus.SUCCESS)
+    assert lock.id.startswith("caronte-")
+    fake_redis.set.assert_called_once_with(
+        "caronte:ouroinvest:hash", lock.id, nx=True, px=10000
+    )
+
+
+@pytest.mark.asyncio
+async def test_lock_authentication_when_held(lock_manager):
+    fake_redis.set = AsyncMock(return_value=None)
+    response = await lock_manager.lock_authentication("hash")
+    assert response == (False, LockAuthenticationStatus.ACQUIRING_LOCK_ERROR, None)
+
+
+@pytest.mark.asyncio
+async def test_lock_authentication_error(lock_manager):
+    fake_redis.set = AsyncMock(side_effect=ConnectionError())
+    response = await lock_manager.lock_authentication("hash")
+    assert response == (False, LockAuthenticationStatus.INTERNAL_SERVER_ERROR, None)
+
+
+@pytest.mark.asyncio
+async def test_unlock_authentication_only_releases_own_lock(lock_manager):
+    lock = MagicMock(resource="caronte:ouroinvest:hash", id="caronte-1")
+    fake_redis.eval = AsyncMock(side_effect=[1, 0])
+    assert await lock_manager.unlock_authentication(lock) == (
+        True,
+        UnlockAuthenticationStatus.SUCCESS,
+    )
+    assert await lock_manager.unlock_authentication(lock) == (
+        False,
+        UnlockAuthenticationStatus.RUNTIME_LOCK_ERROR,
+    )
+    fake_redis.eval.assert_called_with(
+        RedisLockManagerRepository.unlock_script,
+        1,
+        "caronte:ouroinvest:hash",
+        "caronte-1",
+    )
+
+
+@pytest.mark.asyncio
+async def test_extend_authentication(lock_manager):
+    lock = MagicMock(
+        resource="caronte:ouroinvest:hash", id="caronte-1", lock_timeout=10
+    )
+    fake_redis.eval = AsyncMock(side_effect=[1, 0, ConnectionError()])
+    assert await lock_manager.extend_authentication(lock) is True
+    assert await lock_manager.extend_authentication(lock) is False
+    assert await lock_manager.extend_authentication(lock) is False
+    fake_redis.eval.assert_called_with(
+        RedisLockManagerRepository.extend_script,
+        1,
+        "caronte:ouroinvest:hash",
+        "caronte-1",
+        10000,
+    )
@@ -4,8 +4,6 @@ from decouple import Config, RepositoryEnv
 import orjson
 import pytest
 
-from tests.test_utils.utils import create_async_iterable_object
-
 with patch.object(RepositoryEnv, "__init__", return_value=None):
     with patch.object(Config, "__init__", return_value=None):
         with patch.object(Config, "__call__", return_value="ENV_VALUE{}"):
@@ -16,7 +14,6 @@ dummy_key = "key"
 dummy_value = "value"
 dummy_prefix = "prefix"
 dummy_prefix_key = "prefixkey"
-dummy_prefix_folder = "prefixkey:*"
 
 fake_redis = AsyncMock()
 
@@ -27,7 +24,9 @@ fake_redis = AsyncMock()
 async def test_set(mocked_orjson, mocked_get_redis, monkeypatch):
     monkeypatch.setattr(Cache, "prefix", dummy_prefix)
     await Cache.set(dummy_key, dummy_value)
-    fake_redis.set.assert_called_once_with(name=dummy_prefix_key, value=dummy_value, ex=None)
+    fake_redis.set.assert_called_once_with(
+        name=dummy_prefix_key, value=dummy_value, ex=None
+    )
     mocked_get_redis.assert_called_once_with()
     mocked_orjson.assert_called_once_with(dummy_value)
 
@@ -69,10 +68,201 @@ async def test_delete(mocked_get_redis, monkeypatch):
 
 @pytest.mark.asyncio
 @patch.object(Cache, "get_redis", return_value=fake_redis)
-async def test_delete_folder(mocked_get_redis, monkeypatch):
+async def test_get_folder_version(mocked_get_redis, monkeypatch):
     monkeypatch.setattr(Cache, "prefix", dummy_prefix)
-    fake_redis.scan_iter = MagicMock(return_value=create_async_iterable_object([dummy_key]))
-    await Cache.delete_folder(dummy_key)
-    mocked_get_redis.assert_called_once_with()
-    fake_redis.scan_iter.assert_called_once_with(match=dummy_prefix_folder)
-    fake_redis.delete.assert_called_with(dummy_key)
+    monkeypatch.setattr(fake_redis, "get", AsyncMock(side_effect=[b"3", None]))
+    assert await Cache.get_folder_version(dummy_key) == 3
+    assert await Cache.get_folder_version(dummy_key) == 0
+    fake_redis.get.assert_called_with("prefixversion:key")
+
+
+@pytest.mark.asyncio
+@patch.object(Cache, "get_redis", return_value=fake_redis)
+async def test_bump_folder_version(mocked_get_redis, monkeypatch):
+    monkeypatch.setattr(Cache, "prefix", dummy_prefix)
+    monkeypatch.setattr(fake_redis, "incr", AsyncMock(return_value=4))
+    assert await Cache.bump_folder_version(dummy_key) == 4
+    fake_redis.incr.assert_called_once_with("prefixversion:key")
+
+
+@pytest.mark.asyncio
+@patch.object(Cache, "get_redis", return_value=fake_redis)
+@patch.object(orjson, "loads", return_value=dummy_value)
+async def test_get_with_ttl(mocked_orjson, mocked_get_redis, monkeypatch):
+    monkeypatch.setattr(Cache, "prefix", dummy_prefix)
+    fake_pipeline = MagicMock()
+    fake_pipeline.get.return_value = fake_pipeline
+    fake_pipeline.pttl.return_value = fake_pipeline
+    fake_pipeline.execute = AsyncMock(return_value=[dummy_value, 1500])
+    fake_redis.pipeline = MagicMock(
+        return_value=AsyncMock(__aenter__=AsyncMock(return_value=fake_pipeline))
+    )
+    response = await Cache.get_with_ttl(dummy_key)
+    fake_pipeline.get.assert_called_once_with(dummy_prefix_key)
+    fake_pipeline.pttl.assert_called_once_with(dummy_prefix_key)
+    mocked_orjson.assert_called_once_with(dummy_value)
+    assert response == (dummy_value, 1.5)
+
+
+@pytest.mark.asyncio
+@patch.object(Cache, "get_redis", return_value=fake_redis)
+async def test_get_with_ttl_empty(mocked_get_redis, monkeypatch):
+    monkeypatch.setattr(Cache, "prefix", dummy_prefix)
+    fake_pipeline = MagicMock()
+    fake_pipeline.get.return_value = fake_pipeline
+    fake_pipeline.pttl.return_value = fake_pipeline
+    fake_pipeline.execute = AsyncMock(return_value=[None, -2])
+    fake_redis.pipeline = MagicMock(
+        return_value=AsyncMock(__aenter__=AsyncMock(return_value=fake_pipeline))
+    )
+    response = await Cache.get_with_ttl(dummy_key)
+    assert response == (None, None)
+
+
+@pytest.mark.asyncio
+@patch.object(Cache, "get_redis", return_value=fake_redis)
+@patch.object(orjson, "dumps", return_value=dummy_value)
+async def test_set_and_publish(mocked_orjson, mocked_get_redis, monkeypatch):
+    monkeypatch.setattr(Cache, "prefix", dummy_prefix)
+    fake_pipeline = MagicMock(execute=AsyncMock())
+    fake_pipeline.set.return_value = fake_pipeline
+    fake_pipeline.publish.return_value = fake_pipeline
+    fake_redis.pipeline = MagicMock(
+        return_value=AsyncMock(__aenter__=AsyncMock(return_value=fake_pipeline))
+    )
+    await Cache.set_and_publish(dummy_key, dummy_value, 10)
+    fake_pipeline.set.assert_called_once_with(
+        name=dummy_prefix_key, value=dummy_value, ex=10
+    )
+    fake_pipeline.publish.assert_called_once_with(dummy_prefix_key, dummy_value)
+    fake_pipeline.execute.assert_called_once_with()
+    mocked_orjson.assert_called_once_with(dummy_value)
+
+
+@pytest.mark.asyncio
+@patch.object(Cache, "get_redis", return_value=fake_redis)
+@patch.object(orjson, "loads", return_value=dummy_value)
+async def test_wait_for_notification(mocked_orjson, mocked_get_redis, monkeypatch):
+    monkeypatch.setattr(Cache, "prefix", dummy_prefix)
+    fake_pubsub = AsyncMock()
+    fake_pubsub.get_message.side_effect = [None, {"data": dummy_value}]
+    fake_redis.pubsub = MagicMock(return_value=fake_pubsub)
+    fake_pipeline = MagicMock()
+    fake_pipeline.get.return_value = fake_pipeline
+    fake_pipeline.pttl.return_value = fake_pipeline
+    fake_pipeline.execute = AsyncMock(return_value=[None, -2])
+    fake_redis.pipeline = MagicMock(
+        return_value=AsyncMock(__aenter__=AsyncMock(return_value=fake_pipeline))
+    )
+    fake_redis.pttl = AsyncMock(return_value=1500)
+    response = await Cache.wait_for(dummy_key, timeout=1)
+    fake_pubsub.subscribe.assert_called_once_with(dummy_prefix_key)
+    fake_pubsub.reset.assert_called_once_with()
+    fake_redis.pttl.assert_called_once_with(dummy_prefix_key)
+    mocked_orjson.assert_called_once_with(dummy_value)
+    assert response == (dummy_value, 1.5)
+
+
+@pytest.mark.asyncio
+@patch.object(Cache, "get_redis", return_value=fake_redis)
+async def test_wait_for_timeout(mocked_get_redis, monkeypatch):
+    monkeypatch.setattr(Cache, "prefix", dummy_prefix)
+    fake_pubsub = AsyncMock()
+    fake_redis.pubsub = MagicMock(return_value=fake_pubsub)
+    fake_pipeline = MagicMock()
+    fake_pipeline.get.return_value = fake_pipeline
+    fake_pipeline.pttl.return_value = fake_pipeline
+    fake_pipeline.execute = AsyncMock(return_value=[None, -2])
+    fake_redis.pipeline = MagicMock(
+        return_value=AsyncMock(__aenter__=AsyncMock(return_value=fake_pipeline))
+    )
+    response = await Cache.wait_for(dummy_key, timeout=0)
+    fake_pubsub.get_message.assert_not_called()
+    fake_pubsub.reset.assert_called_once_with()
+    assert response == (None, None)
+
+
+@pytest.mark.asyncio
+@patch.object(Cache, "get_redis", return_value=fake_redis)
+async def test_get_many(mocked_get_redis, monkeypatch):
+    monkeypatch.setattr(Cache, "prefix", dummy_prefix)
+    monkeypatch.setattr(Cache, "batch_size", 1)
+    fake_redis.mget = AsyncMock(side_effect=[[orjson.dumps(dummy_value)], [None]])
+    response = await Cache.get_many([dummy_key, dummy_key])
+    fake_redis.mget.assert_called_with([dummy_prefix_key])
+    assert fake_redis.mget.call_count == 2
+    assert response == [dummy_value, None]
+
+
+@pytest.mark.asyncio
+@patch.object(Cache, "get_redis", return_value=fake_redis)
+@patch.object(orjson, "dumps", return_value=dummy_value)
+async def test_set_many(mocked_orjson, mocked_get_redis, monkeypatch):
+    monkeypatch.setattr(Cache, "prefix", dummy_prefix)
+    fake_pipeline = MagicMock(execute=AsyncMock())
+    fake_pipeline.__len__.return_value = 1
+    fake_redis.pipeline = MagicMock(
+        return_value=AsyncMock(__aenter__=AsyncMock(return_value=fake_pipeline))
+    )
+    await Cache.set_many({dummy_key: (dummy_value, 10)})
+    fake_pipeline.set.assert_called_once_with(
+        name=dummy_prefix_key, value=dummy_value, ex=10
+    )
+    fake_pipeline.execute.assert_called_with()
+
+
+@pytest.mark.asyncio
+@patch.object(Cache, "get_redis", return_value=fake_redis)
+@patch.object(orjson, "dumps", return_value=dummy_value)
+async def test_delete_if_equals(mocked_orjson, mocked_get_redis, monkeypatch):
+    monkeypatch.setattr(Cache, "prefix", dummy_prefix)
+    fake_redis.eval = AsyncMock(return_value=1)
+    assert await Cache.delete_if_equals(dummy_key, dummy_value) is True
+    fake_redis.eval.assert_called_once_with(
+        Cache.delete_if_equals_script, 1, dummy_prefix_key, dummy_value
+    )
+
+
+@pytest.mark.asyncio
+@patch.object(Cache, "get_redis", return_value=fake_redis)
+@patch.object(orjson, "loads", return_value=dummy_value)
+async def test_get_with_ttl_and_fence(mocked_orjson, mocked_get_redis, monkeypatch):
+    monkeypatch.setattr(Cache, "prefix", dummy_prefix)
+    monkeypatch.setattr(Cache, "fence_ttl", 60)
+    fake_pipeline = MagicMock()
+    fake_pipeline.get.return_value = fake_pipeline
+    fake_pipeline.pttl.return_value = fake_pipeline
+    fake_pipeline.incr.return_value = fake_pipeline
+    fake_pipeline.expire.return_value = fake_pipeline
+    fake_pipeline.execute = AsyncMock(return_value=[dummy_value, 1500, 3, True])
+    monkeypatch.setattr(
+        fake_redis,
+        "pipeline",
+        MagicMock(
+            return_value=AsyncMock(__aenter__=AsyncMock(return_value=fake_pipeline))
+        ),
+    )
+    response = await Cache.get_with_ttl_and_fence(dummy_key)
+    fake_pipeline.incr.assert_called_once_with("{prefixkey}:fence")
+    fake_pipeline.expire.assert_called_once_with("{prefixkey}:fence", 60)
+    assert response == (dummy_value, 1.5, 3)
+
+
+@pytest.mark.asyncio
+@patch.object(Cache, "get_redis", return_value=fake_redis)
+@patch.object(orjson, "dumps", return_value=dummy_value)
+async def test_set_and_publish_with_stale_fence(
+    mocked_orjson, mocked_get_redis, monkeypatch
+):
+    monkeypatch.setattr(Cache, "prefix", dummy_prefix)
+    monkeypatch.setattr(fake_redis, "eval", AsyncMock(return_value=0))
+    assert await Cache.set_and_publish(dummy_key, dummy_value, 10, fence=2) is False
+    fake_redis.eval.assert_called_once_with(
+        Cache.fenced_set_and_publish_script,
+        2,
+        dummy_prefix_key,
+        "{prefixkey}:fence",
+        dummy_value,
+        10,
+        2,
+    )
@@ -0,0 +1,79 @@
+from unittest.mock import patch
+from decouple import Config, RepositoryEnv
+
+import pytest
+
+with patch.object(RepositoryEnv, "__init__", return_value=None):
+    with patch.object(Config, "__init__", return_value=None):
+        with patch.object(Config, "__call__", return_value="ENV_VALUE{}"):
+            from caronte.src.repositories.local_cache import repository
+            from caronte.src.repositories.local_cache.repository import LocalCache
+
+
+dummy_key = "folder:key"
+dummy_other_key = "folder:other_key"
+dummy_value = {"Authorization": "Bearer token"}
+
+
+@pytest.fixture(autouse=True)
+def local_cache(monkeypatch):
+    monkeypatch.setattr(LocalCache, "max_size", 2)
+    monkeypatch.setattr(LocalCache, "max_ttl", 60)
+    LocalCache.clear()
+    yield LocalCache
+    LocalCache.clear()
+
+
+def test_get_hit():
+    LocalCache.set(dummy_key, dummy_value, 10)
+    assert LocalCache.get(dummy_key) == dummy_value
+    assert LocalCache.get_stats() == {"hits": 1, "misses": 0, "size": 1}
+
+
+def test_get_miss():
+    assert LocalCache.get(dummy_key) is None
+    assert LocalCache.get_stats() == {"hits": 0, "misses": 1, "size": 0}
+
+
+def test_get_expired(monkeypatch):
+    LocalCache.set(dummy_key, dummy_value, 10)
+    monkeypatch.setattr(repository, "monotonic", lambda: float("inf"))
+    assert LocalCache.get(dummy_key) is None
+    assert LocalCache.get_stats() == {"hits": 0, "misses": 1, "size": 0}
+
+
+def test_set_ttl_is_capped_by_max_ttl(monkeypatch):
+    monkeypatch.setattr(repository, "monotonic", lambda: 0)
+    LocalCache.set(dummy_key, dummy_value, 12 * 60 * 60)
+    monkeypatch.setattr(repository, "monotonic", lambda: 60)
+    assert LocalCache.get(dummy_key) is None
+
+
+def test_set_without_remaining_ttl():
+    LocalCache.set(dummy_key, dummy_value, 0)
+    assert LocalCache.get(dummy_key) is None
+
+
+def test_lru_eviction():
+    LocalCache.set(dummy_key, dummy_value, 10)
+    LocalCache.set(dummy_other_key, dummy_value, 10)
+    LocalCache.get(dummy_key)
+    LocalCache.set("folder:newest_key", dummy_value, 10)
+    assert LocalCache.get(dummy_other_key) is None
+    assert LocalCache.get(dummy_key) == dummy_value
+
+
+def test_delete_folder():
+    LocalCache.set(dummy_key, dummy_value, 10)
+    LocalCache.set("another_folder:key", dummy_value, 10)
+    LocalCache.delete_folder("folder")
+    assert LocalCache.get(dummy_key) is None
+    assert LocalCache.get("another_folder:key") == dummy_value
+
+
+def test_delete_if_equals():
+    LocalCache.set(dummy_key, dummy_value, 10)
+    LocalCache.delete_if_equals(dummy_key, {"Authorization": "Bearer other"})
+    assert LocalCache.get(dummy_key) == dummy_value
+    LocalCache.delete_if_equals(dummy_key, dummy_value)
+    assert LocalCache.get(dummy_key) is None
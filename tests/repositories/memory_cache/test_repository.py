@@ -0,0 +1,79 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from caronte.src.repositories.memory_cache import repository as memory_cache_module
+from caronte.src.repositories.memory_cache.repository import MemoryCache
+
+dummy_key = "folder:key"
+dummy_value = {"Authorization": "Bearer token"}
+
+
+@pytest.fixture
+def memory_cache():
+    MemoryCache.clear()
+    yield MemoryCache
+    MemoryCache.clear()
+
+
+@pytest.mark.asyncio
+async def test_set_and_get_with_ttl(memory_cache):
+    with patch.object(memory_cache_module, "monotonic", return_value=100):
+        await memory_cache.set(dummy_key, dummy_value, 10)
+        assert await memory_cache.get_with_ttl(dummy_key) == (dummy_value, 10)
+    with patch.object(memory_cache_module, "monotonic", return_value=110):
+        assert await memory_cache.get_with_ttl(dummy_key) == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_set_many_and_get_many(memory_cache):
+    await memory_cache.set_many({"a": (1, 10), "b": (2, None)})
+    assert await memory_cache.get_many(["a", "b", "c"]) == [1, 2, None]
+    assert await memory_cache.get_with_ttl("b") == (2, None)
+
+
+@pytest.mark.asyncio
+async def test_wait_for_published_value(memory_cache):
+    waiter = asyncio.ensure_future(memory_cache.wait_for(dummy_key, timeout=1))
+    await asyncio.sleep(0)
+    await memory_cache.set_and_publish(dummy_key, dummy_value, 10)
+    value, ttl = await waiter
+    assert value == dummy_value
+    assert 0 < ttl <= 10
+    assert await memory_cache.get(dummy_key) == dummy_value
+
+
+@pytest.mark.asyncio
+async def test_wait_for_timeout(memory_cache):
+    assert await memory_cache.wait_for(dummy_key, timeout=0.01) == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_delete_if_equals(memory_cache):
+    await memory_cache.set(dummy_key, dummy_value)
+    assert await memory_cache.delete_if_equals(dummy_key, {"other": "token"}) is False
+    assert await memory_cache.delete_if_equals(dummy_key, dummy_value) is True
+    assert await memory_cache.get(dummy_key) is None
+
+
+@pytest.mark.asyncio
+async def test_folder_version(memory_cache):
+    assert await memory_cache.get_folder_version("folder") == 0
+    assert await memory_cache.bump_folder_version("folder") == 1
+    assert await memory_cache.get_folder_version("folder") == 1
+
+
+@pytest.mark.asyncio
+async def test_set_and_publish_rejects_stale_fence(memory_cache):
+    _, _, stale_fence = await memory_cache.get_with_ttl_and_fence(dummy_key)
+    _, _, fence = await memory_cache.get_with_ttl_and_fence(dummy_key)
+    assert (
+        await memory_cache.set_and_publish(dummy_key, dummy_value, 10, fence=fence)
+        is True
+    )
+    assert (
+        await memory_cache.set_and_publish(dummy_key, "stale", 10, fence=stale_fence)
+        is False
+    )
+    assert await memory_cache.get(dummy_key) == dummy_value
@@ -0,0 +1,79 @@
+from unittest.mock import patch, AsyncMock, MagicMock
+from decouple import Config, RepositoryEnv
+
+import pytest
+
+with patch.object(RepositoryEnv, "__init__", return_value=None):
+    with patch.object(Config, "__init__", return_value=None):
+        with patch.object(Config, "__call__", return_value="ENV_VALUE{}"):
+            from caronte.src.domain.enums.rate_limit import RateLimitBucket
+            from caronte.src.domain.exceptions.transport.exception import (
+                RateLimitExceeded,
+            )
+            from caronte.src.repositories.rate_limiter.repository import RateLimiter
+
+
+fake_script = AsyncMock()
+fake_redis = MagicMock()
+fake_redis.register_script.return_value = fake_script
+
+
+@pytest.fixture
+def rate_limiter(monkeypatch):
+    fake_script.reset_mock(return_value=True, side_effect=True)
+    fake_script.return_value = 0
+    fake_redis.register_script.reset_mock()
+    monkeypatch.setattr(RateLimiter, "prefix", "prefix:")
+    monkeypatch.setattr(RateLimiter, "enabled", True)
+    monkeypatch.setattr(RateLimiter, "max_wait", 1)
+    monkeypatch.setattr(RateLimiter, "preallocation", 1)
+    monkeypatch.setattr(RateLimiter, "token_rate", 10)
+    monkeypatch.setattr(RateLimiter, "token_burst", 5)
+    monkeypatch.setattr(RateLimiter, "business_rate", 100)
+    monkeypatch.setattr(RateLimiter, "business_burst", 50)
+    RateLimiter.reset()
+    with patch.object(RateLimiter, "get_redis", return_value=fake_redis):
+        yield RateLimiter
+    RateLimiter.reset()
+
+
+@pytest.mark.asyncio
+async def test_acquire_when_disabled(rate_limiter, monkeypatch):
+    monkeypatch.setattr(RateLimiter, "enabled", False)
+    await rate_limiter.acquire(RateLimitBucket.BUSINESS)
+    fake_script.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_acquire_reserves_one_permit(rate_limiter):
+    await rate_limiter.acquire(RateLimitBucket.TOKEN)
+    fake_script.assert_called_once_with(
+        keys=["prefix:rate_limit:token"], args=[100.0, 500.0, 1]
+    )
+    fake_redis.register_script.assert_called_once_with(RateLimiter.gcra_script)
+
+
+@pytest.mark.asyncio
+async def test_acquire_uses_preallocated_permits(rate_limiter, monkeypatch):
+    monkeypatch.setattr(RateLimiter, "preallocation", 3)
+    for _ in range(3):
+        await rate_limiter.acquire(RateLimitBucket.BUSINESS)
+    fake_script.assert_called_once_with(
+        keys=["prefix:rate_limit:business"], args=[10.0, 500.0, 3]
+    )
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_retry_after(rate_limiter):
+    fake_script.side_effect = [20, 0]
+    with patch("asyncio.sleep", AsyncMock()) as mocked_sleep:
+        await rate_limiter.acquire(RateLimitBucket.TOKEN)
+    mocked_sleep.assert_called_once_with(0.02)
+    assert fake_script.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_acquire_raises_when_wait_exceeds_max_wait(rate_limiter):
+    fake_script.return_value = 5000
+    with pytest.raises(RateLimitExceeded):
+        await rate_limiter.acquire(RateLimitBucket.TOKEN)
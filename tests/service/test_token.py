@@ -0,0 +1,583 @@
+import asyncio
+from base64 import urlsafe_b64encode
+from datetime import datetime, timedelta
+from unittest.mock import patch, AsyncMock, MagicMock
+from decouple import Config, RepositoryEnv
+
+import orjson
+import pytest
+from pytz import timezone
+
+with patch.object(RepositoryEnv, "__init__", return_value=None):
+    with patch.object(Config, "__init__", return_value=None):
+        with patch.object(Config, "__call__", return_value="ENV_VALUE{}"):
+            from caronte.src.domain.enums.response import CaronteStatus
+            from caronte.src.domain.exceptions.infrastructure.exception import (
+                InvalidSettings,
+            )
+            from caronte.src.domain.exceptions.service.exception import (
+                CompanyTokenRejected,
+                TokenGenerationTimeout,
+                TokenNotFoundInContent,
+            )
+            from caronte.src.domain.models.authentication.response.model import (
+                LockAuthenticationStatus,
+            )
+            from caronte.src.repositories.authentication.distribuited_lock_manager.repository import (
+                AuthenticationLockManagerRepository,
+            )
+            from caronte.src.repositories.authentication.memory_lock_manager.repository import (
+                MemoryLockManagerRepository,
+            )
+            from caronte.src.repositories.memory_cache.repository import MemoryCache
+            from caronte.src.service import token
+            from caronte.src.service.token import TokenService
+
+
+dummy_hash = "cliente:1"
+dummy_token = {"Authorization": "Bearer token"}
+dummy_cache_key = "folder:key"
+dummy_ttl = 3600
+dummy_now = datetime(2022, 1, 1, tzinfo=timezone("UTC"))
+dummy_lock = MagicMock(lock_timeout=10, resource="caronte:ouroinvest:cliente:1")
+fake_cache = AsyncMock()
+fake_local_cache = MagicMock()
+
+
+@pytest.fixture
+def token_service(monkeypatch):
+    fake_cache.reset_mock(return_value=True, side_effect=True)
+    fake_local_cache.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr(TokenService, "cache", fake_cache)
+    monkeypatch.setattr(TokenService, "local_cache", fake_local_cache)
+    monkeypatch.setattr(
+        TokenService, "lock_manager", AuthenticationLockManagerRepository
+    )
+    monkeypatch.setattr(TokenService, "generation_wait_timeout", 1)
+    monkeypatch.setattr(TokenService, "generation_backoff_min", 0.01)
+    monkeypatch.setattr(TokenService, "generation_backoff_max", 0.02)
+    monkeypatch.setattr(TokenService, "company_token_refresh_margin", 60)
+    monkeypatch.setattr(TokenService, "token_default_ttl", 12 * 60 * 60)
+    monkeypatch.setattr(TokenService, "token_ttl_safety_margin", 60)
+    monkeypatch.setattr(
+        TokenService, "token_expiration_fields", ["dataHoraExpiracao", "expiracao"]
+    )
+    monkeypatch.setattr(TokenService, "folder_version_ttl", 60)
+    monkeypatch.setattr(TokenService, "_TokenService__folder_versions", {})
+    return TokenService
+
+
+@pytest.mark.asyncio
+async def test_single_flight_joins_pending_generation():
+    release_generation = asyncio.Event()
+
+    async def generation():
+        await release_generation.wait()
+        return dummy_token
+
+    stub_generation = AsyncMock(side_effect=generation)
+    callers = [
+        asyncio.ensure_future(TokenService._single_flight(dummy_hash, stub_generation))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release_generation.set()
+    tokens = await asyncio.gather(*callers)
+    assert tokens == [dummy_token] * 5
+    stub_generation.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_single_flight_starts_new_generation_after_completion():
+    stub_generation = AsyncMock(return_value=dummy_token)
+    await TokenService._single_flight(dummy_hash, stub_generation)
+    await TokenService._single_flight(dummy_hash, stub_generation)
+    assert stub_generation.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_to_every_caller():
+    stub_generation = AsyncMock(side_effect=ValueError)
+    callers = [
+        TokenService._single_flight(dummy_hash, stub_generation) for _ in range(2)
+    ]
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    stub_generation.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_single_flight_retrieves_errors_of_abandoned_generations():
+    release_generation = asyncio.Event()
+
+    async def generation():
+        await release_generation.wait()
+        raise ValueError()
+
+    pending_generation = asyncio.ensure_future(generation())
+    caller = asyncio.ensure_future(
+        TokenService._single_flight(dummy_hash, lambda: pending_generation)
+    )
+    await asyncio.sleep(0)
+    caller.cancel()
+    release_generation.set()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    await asyncio.sleep(0)
+    assert pending_generation._log_traceback is False
+
+
+@pytest.mark.asyncio
+@patch.object(AuthenticationLockManagerRepository, "unlock_authentication")
+@patch.object(
+    AuthenticationLockManagerRepository,
+    "lock_authentication",
+    return_value=(True, LockAuthenticationStatus.SUCCESS, dummy_lock),
+)
+async def test_generate_token_when_lock_is_acquired(
+    mocked_lock, mocked_unlock, token_service
+):
+    fake_cache.get_with_ttl_and_fence.return_value = (None, None, 7)
+    stub_request_token = AsyncMock(return_value=(dummy_token, dummy_ttl))
+    token = await token_service._generate_token(
+        dummy_hash, dummy_cache_key, stub_request_token
+    )
+    assert token == dummy_token
+    stub_request_token.assert_called_once_with()
+    fake_cache.set_and_publish.assert_called_once_with(
+        dummy_cache_key, dummy_token, dummy_ttl, fence=7
+    )
+    fake_local_cache.set.assert_called_once_with(
+        dummy_cache_key, dummy_token, dummy_ttl
+    )
+    mocked_unlock.assert_called_once_with(lock=dummy_lock)
+
+
+@pytest.mark.asyncio
+@patch.object(AuthenticationLockManagerRepository, "unlock_authentication")
+@patch.object(
+    AuthenticationLockManagerRepository,
+    "lock_authentication",
+    return_value=(True, LockAuthenticationStatus.SUCCESS, dummy_lock),
+)
+async def test_generate_token_fenced_off_skips_local_cache(
+    mocked_lock, mocked_unlock, token_service
+):
+    fake_cache.get_with_ttl_and_fence.return_value = (None, None, 7)
+    fake_cache.set_and_publish.return_value = False
+    stub_request_token = AsyncMock(return_value=(dummy_token, dummy_ttl))
+    token = await token_service._generate_token(
+        dummy_hash, dummy_cache_key, stub_request_token
+    )
+    assert token == dummy_token
+    fake_local_cache.set.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch.object(AuthenticationLockManagerRepository, "unlock_authentication")
+@patch.object(
+    AuthenticationLockManagerRepository, "extend_authentication", return_value=True
+)
+@patch.object(
+    AuthenticationLockManagerRepository,
+    "lock_authentication",
+    return_value=(True, LockAuthenticationStatus.SUCCESS, MagicMock(lock_timeout=0.03)),
+)
+async def test_generate_token_extends_lock_while_generating(
+    mocked_lock, mocked_extend, mocked_unlock, token_service
+):
+    fake_cache.get_with_ttl_and_fence.return_value = (None, None, 1)
+
+    async def slow_request_token():
+        await asyncio.sleep(0.05)
+        return dummy_token, dummy_ttl
+
+    await token_service._generate_token(dummy_hash, dummy_cache_key, slow_request_token)
+    calls = mocked_extend.call_count
+    assert calls >= 2
+    await asyncio.sleep(0.03)
+    assert mocked_extend.call_count == calls
+    mocked_unlock.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch.object(AuthenticationLockManagerRepository, "unlock_authentication")
+@patch.object(
+    AuthenticationLockManagerRepository,
+    "lock_authentication",
+    return_value=(False, LockAuthenticationStatus.ACQUIRING_LOCK_ERROR, None),
+)
+async def test_generate_token_waits_for_notification(
+    mocked_lock, mocked_unlock, token_service
+):
+    fake_cache.wait_for.side_effect = [(None, None), (dummy_token, 30)]
+    stub_request_token = AsyncMock()
+    token = await token_service._generate_token(
+        dummy_hash, dummy_cache_key, stub_request_token
+    )
+    assert token == dummy_token
+    assert mocked_lock.call_count == 2
+    stub_request_token.assert_not_called()
+    mocked_unlock.assert_not_called()
+    fake_local_cache.set.assert_called_once_with(dummy_cache_key, dummy_token, 30)
+
+
+@pytest.mark.asyncio
+@patch.object(
+    AuthenticationLockManagerRepository,
+    "lock_authentication",
+    return_value=(False, LockAuthenticationStatus.ACQUIRING_LOCK_ERROR, None),
+)
+async def test_generate_token_wait_is_bounded(mocked_lock, token_service, monkeypatch):
+    monkeypatch.setattr(TokenService, "generation_wait_timeout", 0.05)
+    fake_cache.wait_for.return_value = (None, None)
+    with pytest.raises(TokenGenerationTimeout):
+        await token_service._generate_token(dummy_hash, dummy_cache_key, AsyncMock())
+
+
+@pytest.mark.asyncio
+@patch.object(AuthenticationLockManagerRepository, "unlock_authentication")
+@patch.object(
+    AuthenticationLockManagerRepository,
+    "lock_authentication",
+    return_value=(True, LockAuthenticationStatus.SUCCESS, dummy_lock),
+)
+async def test_generate_token_keeps_token_above_min_ttl(
+    mocked_lock, mocked_unlock, token_service
+):
+    fake_cache.get_with_ttl_and_fence.return_value = (dummy_token, 120, 1)
+    stub_request_token = AsyncMock()
+    token = await token_service._generate_token(
+        dummy_hash, dummy_cache_key, stub_request_token, min_ttl=60
+    )
+    assert token == dummy_token
+    stub_request_token.assert_not_called()
+    fake_cache.set_and_publish.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch.object(TokenService, "_request_new_user_token")
+@patch.object(
+    TokenService,
+    "_request_new_token",
+    return_value=({"Authorization": "Bearer fresh"}, dummy_ttl),
+)
+async def test_user_tokens_survive_a_company_token_refresh(
+    mocked_request, mocked_request_user_token, token_service, monkeypatch
+):
+    monkeypatch.setattr(TokenService, "cache", MemoryCache)
+    monkeypatch.setattr(TokenService, "lock_manager", MemoryLockManagerRepository)
+    monkeypatch.setattr(MemoryLockManagerRepository, "lock_time_out", 10)
+    monkeypatch.setattr(TokenService, "base_tokens_cache_folder", "folder")
+    monkeypatch.setattr(TokenService, "default_token_cache_key", ":default")
+    monkeypatch.setattr(TokenService, "user_token_cache_key", ":user:{}")
+    fake_local_cache.get.return_value = None
+    MemoryCache.clear()
+    await MemoryCache.set_many(
+        {"folder:default": (dummy_token, 30), "folder:v0:user:1": (dummy_token, 600)}
+    )
+    token = await token_service._refresh_company_token(60)
+    assert token == {"Authorization": "Bearer fresh"}
+    assert await token_service.get_user_token(client_id=1) == dummy_token
+    assert await MemoryCache.get_folder_version("folder") == 0
+    mocked_request_user_token.assert_not_called()
+    fake_local_cache.delete_folder.assert_not_called()
+    MemoryCache.clear()
+
+
+@pytest.mark.asyncio
+async def test_user_token_cache_key_reuses_folder_version(token_service, monkeypatch):
+    monkeypatch.setattr(TokenService, "base_tokens_cache_folder", "folder")
+    monkeypatch.setattr(TokenService, "user_token_cache_key", ":user:{}")
+    fake_cache.get_folder_version.return_value = 0
+    assert await token_service._user_token_cache_key_format(1) == "folder:v0:user:1"
+    assert await token_service._user_token_cache_key_format(2) == "folder:v0:user:2"
+    fake_cache.get_folder_version.assert_called_once_with("folder")
+
+
+@pytest.mark.asyncio
+@patch.object(TokenService, "_request_new_token", return_value=(dummy_token, dummy_ttl))
+async def test_replace_company_token_bumps_folder_version(
+    mocked_request, token_service, monkeypatch
+):
+    monkeypatch.setattr(TokenService, "base_tokens_cache_folder", "folder")
+    monkeypatch.setattr(TokenService, "user_token_cache_key", ":user:{}")
+    fake_cache.bump_folder_version.return_value = 1
+    token = await token_service._replace_company_token()
+    assert token == (dummy_token, dummy_ttl)
+    assert await token_service._user_token_cache_key_format(1) == "folder:v1:user:1"
+    fake_cache.bump_folder_version.assert_called_once_with("folder")
+    fake_cache.get_folder_version.assert_not_called()
+    fake_local_cache.delete_folder.assert_called_once_with("folder")
+
+
+@pytest.mark.asyncio
+@patch.object(TokenService, "_single_flight")
+@patch.object(TokenService, "_default_token_cache_key", return_value=dummy_cache_key)
+async def test_company_token_refresh_renews_ahead_of_expiration(
+    mocked_cache_key, mocked_single_flight, token_service
+):
+    fake_cache.get_with_ttl.return_value = (dummy_token, 30)
+    refresh = token_service.start_company_token_refresh()
+    await asyncio.sleep(0.01)
+    await token_service.stop_company_token_refresh()
+    assert refresh.cancelled()
+    generation = mocked_single_flight.call_args.kwargs["generation"]
+    assert generation.func == TokenService._refresh_company_token
+    assert generation.args == (60,)
+
+
+@pytest.mark.asyncio
+@patch.object(TokenService, "_request_new_token", return_value=(dummy_token, 20 * 60))
+async def test_company_token_refresh_margin_is_bounded_by_token_lifetime(
+    mocked_request, token_service, monkeypatch
+):
+    monkeypatch.setattr(TokenService, "cache", MemoryCache)
+    monkeypatch.setattr(TokenService, "lock_manager", MemoryLockManagerRepository)
+    monkeypatch.setattr(MemoryLockManagerRepository, "lock_time_out", 10)
+    monkeypatch.setattr(TokenService, "base_tokens_cache_folder", "folder")
+    monkeypatch.setattr(TokenService, "default_token_cache_key", ":default")
+    monkeypatch.setattr(TokenService, "company_token_refresh_margin", 30 * 60)
+    monkeypatch.setattr(TokenService, "generation_backoff_max", 0.001)
+    MemoryCache.clear()
+    token_service.start_company_token_refresh()
+    await asyncio.sleep(0.1)
+    await token_service.stop_company_token_refresh()
+    mocked_request.assert_called_once_with()
+    assert await MemoryCache.get("folder:default") == dummy_token
+    assert token_service._get_refresh_margin(20 * 60) == 10 * 60
+    MemoryCache.clear()
+
+
+def _jwt_with_claims(claims: dict) -> str:
+    payload = urlsafe_b64encode(orjson.dumps(claims)).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    fake_datetime = MagicMock(wraps=datetime)
+    fake_datetime.now.return_value = dummy_now
+    monkeypatch.setattr(token, "datetime", fake_datetime)
+
+
+def test_get_token_ttl_from_payload_expiration(token_service, frozen_now):
+    expiration = (dummy_now + timedelta(hours=2)).isoformat()
+    access_token = {"token": "token", "dataHoraExpiracao": expiration}
+    assert token_service._get_token_ttl(access_token) == 2 * 60 * 60 - 60
+
+
+def test_get_token_ttl_from_jwt_exp_claim(token_service, frozen_now):
+    expiration = (dummy_now + timedelta(hours=1)).timestamp()
+    access_token = {"token": _jwt_with_claims({"exp": expiration})}
+    assert token_service._get_token_ttl(access_token) == 60 * 60 - 60
+
+
+def test_get_token_ttl_from_configured_expiration_field(
+    token_service, frozen_now, monkeypatch
+):
+    monkeypatch.setattr(TokenService, "token_expiration_fields", ["validoAte"])
+    expiration = (dummy_now + timedelta(hours=2)).isoformat()
+    access_token = {"token": "token", "validoAte": expiration}
+    assert token_service._get_token_ttl(access_token) == 2 * 60 * 60 - 60
+
+
+@patch.object(token.Gladsheim, "warning")
+def test_get_token_ttl_fallback(mocked_warning, token_service, frozen_now):
+    assert token_service._get_token_ttl({"token": "opaque"}) == 12 * 60 * 60
+    mocked_warning.assert_called_once()
+
+
+def test_get_token_ttl_already_expired(token_service, frozen_now):
+    expiration = (dummy_now - timedelta(hours=1)).timestamp()
+    access_token = {"token": _jwt_with_claims({"exp": expiration})}
+    assert token_service._get_token_ttl(access_token) == 1
+
+
+@pytest.mark.asyncio
+@patch.object(TokenService, "_single_flight")
+@patch.object(TokenService, "get_company_token")
+@patch.object(
+    TokenService, "_user_token_cache_key_format", return_value=dummy_cache_key
+)
+async def test_get_user_token_hit_skips_company_token(
+    mocked_cache_key, mocked_company_token, mocked_single_flight, token_service
+):
+    fake_local_cache.get.return_value = dummy_token
+    token = await token_service.get_user_token(client_id=1)
+    assert token == dummy_token
+    mocked_company_token.assert_not_called()
+    mocked_single_flight.assert_not_called()
+    fake_cache.get_with_ttl.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch.object(TokenService, "get_company_token", return_value=dummy_token)
+@patch.object(
+    TokenService,
+    "_user_token_cache_key_format",
+    side_effect=lambda client_id: f"user:{client_id}",
+)
+async def test_warm_up_user_tokens(
+    mocked_cache_key, mocked_company_token, token_service, monkeypatch
+):
+    monkeypatch.setattr(fake_cache, "batch_size", 1000)
+    fake_cache.get_many.return_value = [dummy_token, None, None]
+    progress = []
+
+    async def request_new_user_token(client_id, auth):
+        if client_id == 3:
+            raise TokenNotFoundInContent()
+        return dummy_token, dummy_ttl
+
+    with patch.object(
+        TokenService, "_request_new_user_token", side_effect=request_new_user_token
+    ):
+        report = await token_service.warm_up_user_tokens(
+            [1, 2, 3, 1], concurrency=2, on_progress=lambda *args: progress.append(args)
+        )
+    fake_cache.get_many.assert_called_once_with(["user:1", "user:2", "user:3"])
+    fake_cache.set_many.assert_called_once_with({"user:2": (dummy_token, dummy_ttl)})
+    assert report == {
+        1: CaronteStatus.SUCCESS,
+        2: CaronteStatus.SUCCESS,
+        3: CaronteStatus.TOKEN_NOT_FOUND,
+    }
+    assert sorted(progress, key=lambda item: item[0]) == list(report.items())
+
+
+@pytest.mark.asyncio
+@patch.object(TokenService, "invalidate_company_token")
+@patch.object(
+    TokenService,
+    "get_company_token",
+    side_effect=[dummy_token, {"Authorization": "fresh"}],
+)
+@patch.object(
+    TokenService,
+    "_user_token_cache_key_format",
+    side_effect=lambda client_id: f"user:{client_id}",
+)
+async def test_warm_up_user_tokens_regenerates_rejected_company_token(
+    mocked_cache_key,
+    mocked_company_token,
+    mocked_invalidate,
+    token_service,
+    monkeypatch,
+):
+    monkeypatch.setattr(fake_cache, "batch_size", 1000)
+    fake_cache.get_many.return_value = [None]
+    with patch.object(
+        TokenService,
+        "_request_new_user_token",
+        side_effect=[
+            CompanyTokenRejected(CaronteStatus.UNAUTHORIZED),
+            (dummy_token, dummy_ttl),
+        ],
+    ) as mocked_request:
+        report = await token_service.warm_up_user_tokens([1], concurrency=1)
+    assert report == {1: CaronteStatus.SUCCESS}
+    mocked_invalidate.assert_called_once_with(dummy_token)
+    mocked_request.assert_called_with(1, {"Authorization": "fresh"})
+    fake_cache.set_many.assert_called_once_with({"user:1": (dummy_token, dummy_ttl)})
+
+
+@pytest.mark.asyncio
+@patch.object(TokenService, "get_company_token", return_value=dummy_token)
+async def test_warm_up_user_tokens_keys_follow_company_token_rotation(
+    mocked_company_token, token_service, monkeypatch
+):
+    monkeypatch.setattr(fake_cache, "batch_size", 1000)
+    fake_cache.get_many.return_value = [None]
+    versions = iter(["v0", "v1"])
+
+    async def user_token_cache_key_format(client_id):
+        return f"{next(versions)}:user:{client_id}"
+
+    with patch.object(
+        TokenService,
+        "_user_token_cache_key_format",
+        side_effect=user_token_cache_key_format,
+    ), patch.object(
+        TokenService, "_request_new_user_token", return_value=(dummy_token, dummy_ttl)
+    ):
+        report = await token_service.warm_up_user_tokens([1], concurrency=1)
+    assert report == {1: CaronteStatus.SUCCESS}
+    fake_cache.get_many.assert_called_once_with(["v0:user:1"])
+    fake_cache.set_many.assert_called_once_with({"v1:user:1": (dummy_token, dummy_ttl)})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("concurrency", [0, -1])
+async def test_warm_up_user_tokens_invalid_concurrency(concurrency, token_service):
+    with pytest.raises(ValueError):
+        await token_service.warm_up_user_tokens([1], concurrency=concurrency)
+    fake_cache.get_many.assert_not_called()
+
+
+def test_warm_up_concurrency_setting_must_be_positive(settings):
+    settings.override(CARONTE_WARM_UP_CONCURRENCY="0")
+    with pytest.raises(InvalidSettings) as error:
+        settings.validate(TokenService)
+    assert "CARONTE_WARM_UP_CONCURRENCY" in error.value.errors
+
+
+@pytest.mark.asyncio
+@patch.object(
+    TokenService, "_user_token_cache_key_format", return_value=dummy_cache_key
+)
+async def test_invalidate_user_token_only_drops_the_stale_token(
+    mocked_cache_key, token_service
+):
+    await token_service.invalidate_user_token(1, dummy_token)
+    fake_local_cache.delete_if_equals.assert_called_once_with(
+        dummy_cache_key, dummy_token
+    )
+    fake_cache.delete_if_equals.assert_called_once_with(dummy_cache_key, dummy_token)
+
+
+@pytest.mark.asyncio
+@patch.object(TokenService, "invalidate_company_token")
+@patch.object(
+    TokenService,
+    "get_company_token",
+    side_effect=[dummy_token, {"Authorization": "fresh"}],
+)
+async def test_issue_user_token_regenerates_rejected_company_token(
+    mocked_company_token, mocked_invalidate, token_service
+):
+    with patch.object(
+        TokenService,
+        "_request_new_user_token",
+        side_effect=[
+            CompanyTokenRejected(CaronteStatus.UNAUTHORIZED),
+            (dummy_token, dummy_ttl),
+        ],
+    ) as mocked_request:
+        assert await token_service._issue_user_token(1) == (dummy_token, dummy_ttl)
+    mocked_invalidate.assert_called_once_with(dummy_token)
+    mocked_request.assert_called_with(1, {"Authorization": "fresh"})
+
+
+@pytest.mark.asyncio
+@patch.object(
+    TokenService, "_request_new_user_token", return_value=(dummy_token, dummy_ttl)
+)
+@patch.object(TokenService, "get_company_token", return_value=dummy_token)
+async def test_get_user_token_with_memory_backends(
+    mocked_company_token, mocked_request, token_service, monkeypatch
+):
+    monkeypatch.setattr(TokenService, "cache", MemoryCache)
+    monkeypatch.setattr(TokenService, "lock_manager", MemoryLockManagerRepository)
+    monkeypatch.setattr(MemoryLockManagerRepository, "lock_time_out", 10)
+    monkeypatch.setattr(TokenService, "base_tokens_cache_folder", "folder")
+    monkeypatch.setattr(TokenService, "user_token_cache_key", ":user:{}")
+    fake_local_cache.get.return_value = None
+    MemoryCache.clear()
+    tokens = await asyncio.gather(
+        *(token_service.get_user_token(client_id=1) for _ in range(5))
+    )
+    assert tokens == [dummy_token] * 5
+    mocked_request.assert_called_once_with(1, dummy_token)
+    assert await MemoryCache.get("folder:v0:user:1") == dummy_token
+    MemoryCache.clear()
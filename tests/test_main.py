@@ -0,0 +1,320 @@
+import asyncio
+from unittest.mock import patch
+from decouple import Config, RepositoryEnv
+
+import pytest
+
+with patch.object(RepositoryEnv, "__init__", return_value=None):
+    with patch.object(Config, "__init__", return_value=None):
+        with patch.object(Config, "__call__", return_value="ENV_VALUE{}"):
+            from caronte import (
+                AllowedHTTPMethods,
+                CaronteStatus,
+                ClientRequest,
+                ExchangeCompanyApi,
+            )
+            from caronte.src.domain.exceptions.infrastructure.exception import (
+                InvalidSettings,
+            )
+            from caronte.src.domain.exceptions.service.exception import (
+                TokenNotFoundInContent,
+            )
+            from caronte.src.domain.enums.hook import HookEvent
+            from caronte.src.infrastructures.hooks import current_call_context
+            from caronte.src.infrastructures.metrics import Metrics
+            from caronte.src.service.token import TokenService
+            from caronte.src.transports.ouroinvest.transport import HTTPTransport
+
+
+dummy_url = "url"
+dummy_token = {"Authorization": "Bearer token"}
+dummy_fresh_token = {"Authorization": "Bearer fresh_token"}
+dummy_requests = [
+    (AllowedHTTPMethods.GET, dummy_url, 1, None),
+    ClientRequest(AllowedHTTPMethods.POST, dummy_url, 2, {"field": "value"}),
+    (AllowedHTTPMethods.GET, dummy_url, 1),
+]
+
+
+async def fake_request_method(method, url, body, headers, idempotent=None):
+    await asyncio.sleep(0.01 if method == AllowedHTTPMethods.GET else 0)
+    return True, CaronteStatus.SUCCESS, method
+
+
+async def slow_call(*args, **kwargs):
+    await asyncio.sleep(1)
+
+
+@pytest.mark.asyncio
+@patch.object(HTTPTransport, "request_method", side_effect=fake_request_method)
+@patch.object(TokenService, "get_user_token", return_value=dummy_token)
+async def test_request_as_clients_in_input_order(mocked_user_token, mocked_request):
+    responses = await ExchangeCompanyApi.request_as_clients(
+        dummy_requests, concurrency=2
+    )
+    assert responses == [
+        (True, CaronteStatus.SUCCESS, AllowedHTTPMethods.GET),
+        (True, CaronteStatus.SUCCESS, AllowedHTTPMethods.POST),
+        (True, CaronteStatus.SUCCESS, AllowedHTTPMethods.GET),
+    ]
+    assert mocked_user_token.call_count == 2
+    assert mocked_request.call_count == 3
+
+
+@pytest.mark.asyncio
+@patch.object(HTTPTransport, "request_method", side_effect=fake_request_method)
+@patch.object(TokenService, "get_user_token", return_value=dummy_token)
+async def test_iter_request_as_clients_in_completion_order(
+    mocked_user_token, mocked_request
+):
+    responses = [
+        index
+        async for index, response in ExchangeCompanyApi.iter_request_as_clients(
+            dummy_requests, concurrency=3
+        )
+    ]
+    assert responses[0] == 1
+    assert sorted(responses) == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+@patch.object(HTTPTransport, "request_method")
+@patch.object(TokenService, "get_user_token", side_effect=TokenNotFoundInContent())
+async def test_request_as_clients_shares_token_errors(
+    mocked_user_token, mocked_request, monkeypatch
+):
+    monkeypatch.setattr(ExchangeCompanyApi, "batch_concurrency", 2)
+    responses = await ExchangeCompanyApi.request_as_clients(dummy_requests[::2])
+    assert responses == [(False, CaronteStatus.TOKEN_NOT_FOUND, None)] * 2
+    mocked_user_token.assert_called_once_with(client_id=1)
+    mocked_request.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch.object(HTTPTransport, "request_method", side_effect=fake_request_method)
+@patch.object(
+    TokenService,
+    "get_user_token",
+    side_effect=[TokenNotFoundInContent(), dummy_token],
+)
+async def test_request_as_clients_retries_failed_shared_tokens(
+    mocked_user_token, mocked_request
+):
+    responses = await ExchangeCompanyApi.request_as_clients(
+        dummy_requests[::2], concurrency=1
+    )
+    assert responses == [
+        (False, CaronteStatus.TOKEN_NOT_FOUND, None),
+        (True, CaronteStatus.SUCCESS, AllowedHTTPMethods.GET),
+    ]
+    assert mocked_user_token.call_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("concurrency", [0, -1])
+async def test_iter_request_as_clients_invalid_concurrency(concurrency):
+    with pytest.raises(ValueError):
+        await ExchangeCompanyApi.request_as_clients(dummy_requests, concurrency)
+
+
+def test_batch_concurrency_setting_must_be_positive(settings):
+    settings.override(CARONTE_BATCH_REQUEST_CONCURRENCY="0")
+    with pytest.raises(InvalidSettings) as error:
+        settings.validate(ExchangeCompanyApi)
+    assert "CARONTE_BATCH_REQUEST_CONCURRENCY" in error.value.errors
+
+
+@pytest.mark.asyncio
+async def test_iter_request_as_clients_invalid_request():
+    with pytest.raises(TypeError):
+        await ExchangeCompanyApi.request_as_clients(
+            [(AllowedHTTPMethods.GET,)], concurrency=1
+        )
+
+
+@pytest.mark.asyncio
+@patch.object(HTTPTransport, "request_method")
+@patch.object(TokenService, "get_user_token", side_effect=slow_call)
+async def test_request_as_client_deadline_during_token_lookup(
+    mocked_user_token, mocked_request
+):
+    response = await ExchangeCompanyApi.request_as_client(
+        AllowedHTTPMethods.GET, dummy_url, 1, timeout=0.01
+    )
+    assert response == (False, CaronteStatus.DEADLINE_EXCEEDED, None)
+    mocked_request.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch.object(HTTPTransport, "request_method", side_effect=slow_call)
+@patch.object(TokenService, "get_company_token", return_value=dummy_token)
+async def test_request_as_company_deadline_during_http_call(
+    mocked_company_token, mocked_request
+):
+    response = await ExchangeCompanyApi.request_as_company(
+        AllowedHTTPMethods.GET, dummy_url, timeout=0.01
+    )
+    assert response == (False, CaronteStatus.DEADLINE_EXCEEDED, None)
+
+
+@pytest.mark.asyncio
+@patch.object(HTTPTransport, "request_method", side_effect=fake_request_method)
+@patch.object(TokenService, "get_company_token", return_value=dummy_token)
+async def test_request_as_company_within_deadline(mocked_company_token, mocked_request):
+    response = await ExchangeCompanyApi.request_as_company(
+        AllowedHTTPMethods.POST, dummy_url, timeout=1
+    )
+    assert response == (True, CaronteStatus.SUCCESS, AllowedHTTPMethods.POST)
+
+
+@pytest.mark.asyncio
+@patch.object(HTTPTransport, "request_method", side_effect=fake_request_method)
+@patch.object(TokenService, "get_user_token", return_value=dummy_token)
+async def test_request_as_client_forwards_idempotent(mocked_user_token, mocked_request):
+    await ExchangeCompanyApi.request_as_client(
+        AllowedHTTPMethods.POST, dummy_url, 1, {"field": "value"}, idempotent=True
+    )
+    assert mocked_request.call_args.kwargs["idempotent"] is True
+
+
+@pytest.mark.asyncio
+@patch.object(TokenService, "invalidate_user_token")
+@patch.object(
+    TokenService, "get_user_token", side_effect=[dummy_token, dummy_fresh_token]
+)
+@patch.object(
+    HTTPTransport,
+    "request_method",
+    side_effect=[
+        (False, CaronteStatus.UNAUTHORIZED, None),
+        (True, CaronteStatus.SUCCESS, {}),
+    ],
+)
+async def test_request_as_client_replays_once_with_fresh_token(
+    mocked_request, mocked_user_token, mocked_invalidate
+):
+    response = await ExchangeCompanyApi.request_as_client(
+        AllowedHTTPMethods.GET, dummy_url, 1
+    )
+    assert response == (True, CaronteStatus.SUCCESS, {})
+    mocked_invalidate.assert_called_once_with(1, dummy_token)
+    assert mocked_request.call_args.kwargs["headers"] == dummy_fresh_token
+
+
+@pytest.mark.asyncio
+@patch.object(TokenService, "invalidate_company_token")
+@patch.object(TokenService, "get_company_token", return_value=dummy_token)
+@patch.object(
+    HTTPTransport,
+    "request_method",
+    return_value=(False, CaronteStatus.UNAUTHORIZED, None),
+)
+async def test_request_as_company_replays_only_once(
+    mocked_request, mocked_company_token, mocked_invalidate
+):
+    response = await ExchangeCompanyApi.request_as_company(
+        AllowedHTTPMethods.GET, dummy_url
+    )
+    assert response == (False, CaronteStatus.UNAUTHORIZED, None)
+    mocked_invalidate.assert_called_once_with(dummy_token)
+    assert mocked_request.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch.object(TokenService, "invalidate_user_token")
+@patch.object(TokenService, "get_user_token", return_value=dummy_token)
+@patch.object(
+    HTTPTransport, "request_method", return_value=(False, CaronteStatus.FORBIDDEN, None)
+)
+async def test_request_as_client_keeps_token_on_repeated_forbidden(
+    mocked_request, mocked_user_token, mocked_invalidate
+):
+    for _ in range(3):
+        response = await ExchangeCompanyApi.request_as_client(
+            AllowedHTTPMethods.GET, dummy_url, 1
+        )
+        assert response == (False, CaronteStatus.FORBIDDEN, None)
+    mocked_invalidate.assert_not_called()
+    assert mocked_user_token.call_count == 3
+    assert mocked_request.call_count == 3
+
+
+@pytest.mark.asyncio
+@patch.object(
+    HTTPTransport, "request_method", return_value=(False, CaronteStatus.FORBIDDEN, None)
+)
+@patch.object(TokenService, "get_company_token", side_effect=TokenNotFoundInContent())
+async def test_request_counts_responses_by_status(
+    mocked_company_token, mocked_request, monkeypatch
+):
+    monkeypatch.setattr(Metrics, "enabled", True)
+    Metrics.reset()
+    await ExchangeCompanyApi.request_as_company(AllowedHTTPMethods.GET, dummy_url)
+    assert Metrics.get_counters()["responses_total"] == {
+        (("status", CaronteStatus.TOKEN_NOT_FOUND.value),): 1
+    }
+    assert (
+        'caronte_stage_in_flight{stage="request"} 0' in ExchangeCompanyApi.get_metrics()
+    )
+    Metrics.reset()
+
+
+@pytest.mark.asyncio
+@patch.object(TokenService, "invalidate_user_token")
+@patch.object(
+    TokenService, "get_user_token", side_effect=[dummy_token, dummy_fresh_token]
+)
+async def test_request_as_client_emits_hooks_with_correlation_id(
+    mocked_user_token, mocked_invalidate
+):
+    events = []
+
+    async def request_method(method, url, body, headers, idempotent=None):
+        events.append(("send", current_call_context.get().correlation_id))
+        if headers == dummy_token:
+            return False, CaronteStatus.UNAUTHORIZED, None
+        return True, CaronteStatus.SUCCESS, {}
+
+    def record(event):
+        return lambda context, **details: events.append(
+            (event, context.correlation_id, context.client_id, sorted(details))
+        )
+
+    for event in HookEvent:
+        ExchangeCompanyApi.hooks.register(event, record(event))
+    try:
+        with patch.object(HTTPTransport, "request_method", side_effect=request_method):
+            await ExchangeCompanyApi.request_as_client(
+                AllowedHTTPMethods.GET, dummy_url, 1, correlation_id="correlation"
+            )
+    finally:
+        ExchangeCompanyApi.hooks.clear()
+    assert events == [
+        (HookEvent.REQUEST_START, "correlation", 1, []),
+        (HookEvent.TOKEN_RESOLVED, "correlation", 1, ["elapsed"]),
+        ("send", "correlation"),
+        (HookEvent.TOKEN_RESOLVED, "correlation", 1, ["elapsed"]),
+        ("send", "correlation"),
+        (HookEvent.RESPONSE, "correlation", 1, ["elapsed", "status"]),
+    ]
+    assert current_call_context.get() is None
+
+
+@pytest.mark.asyncio
+@patch.object(TokenService, "get_company_token", side_effect=TokenNotFoundInContent())
+async def test_request_as_company_hook_errors_do_not_break_the_call(
+    mocked_company_token,
+):
+    errors = []
+    ExchangeCompanyApi.hooks.register(HookEvent.REQUEST_START, lambda context: 1 / 0)
+    ExchangeCompanyApi.hooks.register(
+        HookEvent.ERROR, lambda context, error, status, elapsed: errors.append(status)
+    )
+    try:
+        response = await ExchangeCompanyApi.request_as_company(
+            AllowedHTTPMethods.GET, dummy_url
+        )
+    finally:
+        ExchangeCompanyApi.hooks.clear()
+    assert response == (False, CaronteStatus.TOKEN_NOT_FOUND, None)
+    assert errors == [CaronteStatus.TOKEN_NOT_FOUND]
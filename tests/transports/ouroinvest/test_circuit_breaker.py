@@ -0,0 +1,102 @@
+from unittest.mock import patch
+from decouple import Config, RepositoryEnv
+
+import pytest
+
+with patch.object(RepositoryEnv, "__init__", return_value=None):
+    with patch.object(Config, "__init__", return_value=None):
+        with patch.object(Config, "__call__", return_value="ENV_VALUE{}"):
+            from caronte.src.domain.enums.circuit_breaker import CircuitBreakerState
+            from caronte.src.transports.ouroinvest import (
+                circuit_breaker as circuit_breaker_module,
+            )
+            from caronte.src.transports.ouroinvest.circuit_breaker import (
+                CircuitBreaker,
+                CircuitBreakers,
+            )
+
+
+@pytest.fixture
+def circuit_breaker():
+    return CircuitBreaker(
+        window_size=4,
+        min_calls=2,
+        failure_rate_threshold=0.5,
+        open_duration=30,
+        half_open_max_calls=1,
+    )
+
+
+@pytest.fixture
+def now(monkeypatch):
+    clock = {"now": 0}
+    monkeypatch.setattr(circuit_breaker_module, "monotonic", lambda: clock["now"])
+    return clock
+
+
+def test_opens_when_failure_rate_reaches_threshold(circuit_breaker, now):
+    circuit_breaker.record_success()
+    assert circuit_breaker.allow_request()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CircuitBreakerState.OPEN
+    assert not circuit_breaker.allow_request()
+
+
+def test_stays_closed_below_min_calls(circuit_breaker, now):
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_half_open_allows_a_single_trial(circuit_breaker, now):
+    circuit_breaker.record_failure()
+    circuit_breaker.record_failure()
+    now["now"] = 30
+    assert circuit_breaker.allow_request()
+    assert circuit_breaker.state == CircuitBreakerState.HALF_OPEN
+    assert not circuit_breaker.allow_request()
+    circuit_breaker.record_success()
+    assert circuit_breaker.state == CircuitBreakerState.CLOSED
+    assert circuit_breaker.allow_request()
+
+
+def test_half_open_failure_reopens(circuit_breaker, now):
+    circuit_breaker.record_failure()
+    circuit_breaker.record_failure()
+    now["now"] = 30
+    assert circuit_breaker.allow_request()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CircuitBreakerState.OPEN
+    assert not circuit_breaker.allow_request()
+
+
+def test_half_open_aborted_trial_is_released(circuit_breaker, now):
+    circuit_breaker.record_failure()
+    circuit_breaker.record_failure()
+    now["now"] = 30
+    assert circuit_breaker.allow_request()
+    circuit_breaker.record_abort()
+    assert circuit_breaker.allow_request()
+
+
+def test_circuit_breakers_are_keyed_by_host_and_path(monkeypatch):
+    monkeypatch.setattr(CircuitBreakers, "window_size", 4)
+    monkeypatch.setattr(CircuitBreakers, "min_calls", 2)
+    monkeypatch.setattr(CircuitBreakers, "failure_rate_threshold", 0.5)
+    monkeypatch.setattr(CircuitBreakers, "open_duration", 30)
+    monkeypatch.setattr(CircuitBreakers, "half_open_max_calls", 1)
+    CircuitBreakers.reset()
+    positions = CircuitBreakers.get_circuit_breaker(
+        "https://exchange/positions?client=1"
+    )
+    assert positions is CircuitBreakers.get_circuit_breaker(
+        "https://exchange/positions?client=2"
+    )
+    assert positions is not CircuitBreakers.get_circuit_breaker(
+        "https://exchange/statements"
+    )
+    assert CircuitBreakers.get_states()["exchange/positions"] == {
+        "state": "closed",
+        "failure_rate": 0.0,
+        "calls": 0,
+    }
+    CircuitBreakers.reset()
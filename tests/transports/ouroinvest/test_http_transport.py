@@ -0,0 +1,391 @@
+from datetime import datetime
+from unittest.mock import patch, AsyncMock, MagicMock
+from aiohttp import ServerDisconnectedError
+from decouple import Config, RepositoryEnv
+
+import orjson
+import pytest
+
+from tests.test_utils.utils import create_async_iterable_object
+
+with patch.object(RepositoryEnv, "__init__", return_value=None):
+    with patch.object(Config, "__init__", return_value=None):
+        with patch.object(Config, "__call__", return_value="ENV_VALUE{}"):
+            from caronte import AllowedHTTPMethods, CaronteStatus
+            from caronte.src.domain.enums.hook import HookEvent
+            from caronte.src.domain.exceptions.transport.exception import (
+                RateLimitExceeded,
+            )
+            from caronte.src.domain.models.call_context.model import CallContext
+            from caronte.src.infrastructures.hooks import current_call_context
+            from caronte.src.repositories.rate_limiter.repository import RateLimiter
+            from caronte.src.transports.ouroinvest.circuit_breaker import (
+                CircuitBreakers,
+            )
+            from caronte.src.transports.ouroinvest.retry_budget import RetryBudget
+            from caronte.src.transports.ouroinvest.transport import HTTPTransport
+
+
+dummy_url = "url"
+dummy_headers = {"Authorization": "Bearer token"}
+fake_session = MagicMock()
+
+
+@pytest.fixture
+def transport(monkeypatch, settings):
+    fake_session.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr(HTTPTransport, "stream_chunk_size", 2)
+    settings.override(OUROINVEST_CONTROLE_ORIGEM_CHAVE="ENV_VALUE")
+    monkeypatch.setattr(HTTPTransport, "retry_attempts", 2)
+    monkeypatch.setattr(HTTPTransport, "retry_backoff_base", 0)
+    monkeypatch.setattr(HTTPTransport, "retry_backoff_max", 0)
+    monkeypatch.setattr(RetryBudget, "ratio", 0.1)
+    monkeypatch.setattr(RetryBudget, "max_balance", 100)
+    monkeypatch.setattr(RetryBudget, "initial_balance", 10)
+    RetryBudget.reset()
+    monkeypatch.setattr(CircuitBreakers, "enabled", False)
+    monkeypatch.setattr(RateLimiter, "enabled", False)
+    monkeypatch.setattr(HTTPTransport, "correlation_id_header", "X-Correlation-ID")
+    with patch.object(
+        HTTPTransport,
+        "_HTTPTransport__get_session",
+        AsyncMock(return_value=fake_session),
+    ):
+        yield HTTPTransport
+
+
+def _fake_response(status: int, chunks: list) -> MagicMock:
+    response = MagicMock(status=status, reason="reason")
+    response.content.iter_chunked = MagicMock(
+        return_value=create_async_iterable_object(chunks)
+    )
+    response.content.read = AsyncMock(return_value=b"".join(chunks))
+    return response
+
+
+@pytest.mark.asyncio
+async def test_request_stream_chunks(transport):
+    response = _fake_response(200, [b"ab", b"cd"])
+    fake_session.request = AsyncMock(return_value=response)
+    success, status, content = await transport.request_stream(
+        AllowedHTTPMethods.GET, dummy_url, None, dummy_headers
+    )
+    assert (success, status) == (True, CaronteStatus.SUCCESS)
+    assert [chunk async for chunk in content] == [b"ab", b"cd"]
+    response.content.iter_chunked.assert_called_once_with(2)
+    response.release.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_request_stream_json_items(transport):
+    response = _fake_response(200, [b'[{"a"', b": 1}, ", b"2]"])
+    fake_session.request = AsyncMock(return_value=response)
+    success, status, content = await transport.request_stream(
+        AllowedHTTPMethods.GET, dummy_url, None, dummy_headers, json_items=True
+    )
+    assert [item async for item in content] == [{"a": 1}, 2]
+    response.release.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_request_stream_releases_abandoned_stream(transport):
+    response = _fake_response(200, [b"ab", b"cd"])
+    fake_session.request = AsyncMock(return_value=response)
+    _, _, content = await transport.request_stream(
+        AllowedHTTPMethods.GET, dummy_url, None, dummy_headers
+    )
+    async for chunk in content:
+        assert chunk == b"ab"
+        break
+    response.release.assert_not_called()
+    await content.aclose()
+    response.release.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_request_stream_releases_unconsumed_stream(transport):
+    response = _fake_response(200, [b"ab", b"cd"])
+    fake_session.request = AsyncMock(return_value=response)
+    _, _, content = await transport.request_stream(
+        AllowedHTTPMethods.GET, dummy_url, None, dummy_headers, json_items=True
+    )
+    async with content:
+        pass
+    response.release.assert_called_once_with()
+    response.content.iter_chunked.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_request_stream_error_status(transport):
+    response = _fake_response(401, [b"denied"])
+    fake_session.request = AsyncMock(return_value=response)
+    result = await transport.request_stream(
+        AllowedHTTPMethods.GET, dummy_url, None, dummy_headers
+    )
+    assert result == (False, CaronteStatus.UNAUTHORIZED, None)
+    response.content.iter_chunked.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_request_method_encodes_with_orjson(transport):
+    response = _fake_response(200, [])
+    response.json = AsyncMock(return_value={"field": "value"})
+    fake_session.request = AsyncMock(return_value=response)
+    body = {"codigoCliente": 1}
+    result = await transport.request_method(
+        AllowedHTTPMethods.POST, dummy_url, body, dummy_headers
+    )
+    assert result == (True, CaronteStatus.SUCCESS, {"field": "value"})
+    response.json.assert_called_once_with(loads=orjson.loads)
+    (method, url), kwargs = fake_session.request.call_args
+    assert (method, url) == ("POST", dummy_url)
+    correlation_id = kwargs["headers"].pop("X-Correlation-ID")
+    assert correlation_id
+    assert kwargs["headers"] == {**dummy_headers, "Content-Type": "application/json"}
+    sent_body = orjson.loads(kwargs["data"])
+    assert sent_body["codigoCliente"] == 1
+    assert (
+        datetime.fromisoformat(sent_body["controle"]["dataHoraCliente"]).tzinfo
+        is not None
+    )
+
+
+@pytest.mark.asyncio
+async def test_request_method_without_body(transport):
+    response = _fake_response(200, [])
+    response.json = AsyncMock(return_value={})
+    fake_session.request = AsyncMock(return_value=response)
+    context = CallContext(
+        AllowedHTTPMethods.GET, dummy_url, correlation_id="correlation"
+    )
+    context_token = current_call_context.set(context)
+    try:
+        await transport.request_method(
+            AllowedHTTPMethods.GET, dummy_url, None, dummy_headers
+        )
+    finally:
+        current_call_context.reset(context_token)
+    fake_session.request.assert_called_once_with(
+        "GET",
+        dummy_url,
+        headers={**dummy_headers, "X-Correlation-ID": "correlation"},
+        data=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_session_lifecycle(monkeypatch):
+    monkeypatch.setattr(HTTPTransport, "pool_limit", 10)
+    monkeypatch.setattr(HTTPTransport, "pool_limit_per_host", 5)
+    monkeypatch.setattr(HTTPTransport, "keepalive_timeout", 30)
+    monkeypatch.setattr(HTTPTransport, "dns_cache_ttl", 60)
+    await HTTPTransport.startup()
+    session = await HTTPTransport._HTTPTransport__get_session()
+    assert session is await HTTPTransport._HTTPTransport__get_session()
+    assert session.connector.limit == 10
+    assert session.connector.limit_per_host == 5
+    await HTTPTransport.aclose()
+    assert session.closed
+    new_session = await HTTPTransport._HTTPTransport__get_session()
+    assert new_session is not session
+    await HTTPTransport.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request_method_retries_idempotent_server_errors(transport):
+    response = _fake_response(200, [])
+    response.json = AsyncMock(return_value={})
+    failed_response = _fake_response(503, [])
+    fake_session.request = AsyncMock(
+        side_effect=[failed_response, ServerDisconnectedError(), response]
+    )
+    result = await transport.request_method(
+        AllowedHTTPMethods.GET, dummy_url, None, dummy_headers
+    )
+    assert result == (True, CaronteStatus.SUCCESS, {})
+    assert fake_session.request.call_count == 3
+    failed_response.release.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_request_method_gives_up_after_retry_attempts(transport):
+    fake_session.request = AsyncMock(return_value=_fake_response(500, [b"error"]))
+    result = await transport.request_method(
+        AllowedHTTPMethods.GET, dummy_url, None, dummy_headers
+    )
+    assert result == (False, CaronteStatus.UNEXPECTED_ERROR, None)
+    assert fake_session.request.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_request_method_does_not_retry_non_idempotent(transport):
+    fake_session.request = AsyncMock(side_effect=ServerDisconnectedError())
+    with pytest.raises(ServerDisconnectedError):
+        await transport.request_method(
+            AllowedHTTPMethods.POST, dummy_url, None, dummy_headers
+        )
+    fake_session.request.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_request_method_retries_are_capped_by_budget(transport, monkeypatch):
+    monkeypatch.setattr(RetryBudget, "initial_balance", 1)
+    RetryBudget.reset()
+    fake_session.request = AsyncMock(return_value=_fake_response(502, [b"error"]))
+    await transport.request_method(
+        AllowedHTTPMethods.GET, dummy_url, None, dummy_headers
+    )
+    assert fake_session.request.call_count == 2
+    fake_session.request.reset_mock()
+    await transport.request_method(
+        AllowedHTTPMethods.GET, dummy_url, None, dummy_headers
+    )
+    fake_session.request.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_request_method_fails_fast_when_circuit_is_open(transport, monkeypatch):
+    monkeypatch.setattr(CircuitBreakers, "enabled", True)
+    monkeypatch.setattr(CircuitBreakers, "window_size", 2)
+    monkeypatch.setattr(CircuitBreakers, "min_calls", 2)
+    monkeypatch.setattr(CircuitBreakers, "failure_rate_threshold", 1)
+    monkeypatch.setattr(CircuitBreakers, "open_duration", 30)
+    monkeypatch.setattr(CircuitBreakers, "half_open_max_calls", 1)
+    CircuitBreakers.reset()
+    fake_session.request = AsyncMock(return_value=_fake_response(503, [b"error"]))
+    result = await transport.request_method(
+        AllowedHTTPMethods.GET, dummy_url, None, dummy_headers
+    )
+    assert result == (False, CaronteStatus.CIRCUIT_OPEN, None)
+    assert fake_session.request.call_count == 2
+    result = await transport.request_method(
+        AllowedHTTPMethods.GET, dummy_url, None, dummy_headers
+    )
+    assert result == (False, CaronteStatus.CIRCUIT_OPEN, None)
+    assert fake_session.request.call_count == 2
+    assert transport.get_circuit_breakers_state()[dummy_url]["state"] == "open"
+    CircuitBreakers.reset()
+
+
+@pytest.mark.asyncio
+async def test_request_method_skips_rate_limiter_when_circuit_is_open(
+    transport, monkeypatch
+):
+    monkeypatch.setattr(CircuitBreakers, "enabled", True)
+    monkeypatch.setattr(CircuitBreakers, "window_size", 2)
+    monkeypatch.setattr(CircuitBreakers, "min_calls", 2)
+    monkeypatch.setattr(CircuitBreakers, "failure_rate_threshold", 1)
+    monkeypatch.setattr(CircuitBreakers, "open_duration", 30)
+    monkeypatch.setattr(CircuitBreakers, "half_open_max_calls", 1)
+    CircuitBreakers.reset()
+    fake_session.request = AsyncMock(return_value=_fake_response(503, [b"error"]))
+    await transport.request_method(
+        AllowedHTTPMethods.GET, dummy_url, None, dummy_headers
+    )
+    monkeypatch.setattr(RateLimiter, "enabled", True)
+    with patch.object(RateLimiter, "acquire", AsyncMock()) as mocked_acquire:
+        result = await transport.request_method(
+            AllowedHTTPMethods.GET, dummy_url, None, dummy_headers
+        )
+    assert result == (False, CaronteStatus.CIRCUIT_OPEN, None)
+    mocked_acquire.assert_not_called()
+    CircuitBreakers.reset()
+
+
+@pytest.mark.asyncio
+async def test_request_method_returns_rate_limited(transport, monkeypatch):
+    monkeypatch.setattr(RateLimiter, "enabled", True)
+    with patch.object(
+        RateLimiter, "acquire", AsyncMock(side_effect=RateLimitExceeded())
+    ):
+        success, status, content = await transport.request_method(
+            AllowedHTTPMethods.POST, dummy_url, None
+        )
+    assert (success, status, content) == (False, CaronteStatus.RATE_LIMITED, None)
+    fake_session.request.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_request_method_does_not_mutate_body(transport):
+    response = _fake_response(200, [])
+    response.json = AsyncMock(return_value={})
+    fake_session.request = AsyncMock(return_value=response)
+    body = {"codigoCliente": 1, "controle": "ignored"}
+    await transport.request_method(AllowedHTTPMethods.POST, dummy_url, body)
+    await transport.request_method(AllowedHTTPMethods.POST, dummy_url, body)
+    assert body == {"codigoCliente": 1, "controle": "ignored"}
+    for (_, kwargs) in fake_session.request.call_args_list:
+        sent_body = orjson.loads(kwargs["data"])
+        assert list(sent_body) == ["controle", "codigoCliente"]
+        assert list(sent_body["controle"]) == ["dataHoraCliente", "recurso", "origem"]
+        assert sent_body["controle"]["origem"]["chave"] == "ENV_VALUE"
+
+
+@pytest.mark.asyncio
+async def test_request_method_emits_hooks_and_propagates_trace_headers(transport):
+    events = []
+
+    def on_request_start(context, method, url, attempt):
+        context.trace_headers["traceparent"] = f"00-trace-span{attempt}-01"
+        events.append((HookEvent.REQUEST_START, method, url, attempt))
+
+    def on_error(context, method, url, attempt, error, elapsed):
+        events.append((HookEvent.ERROR, method, url, attempt))
+
+    def on_response(context, method, url, attempt, http_status, elapsed):
+        events.append((HookEvent.RESPONSE, method, url, attempt, http_status))
+
+    response = _fake_response(200, [])
+    response.json = AsyncMock(return_value={})
+    fake_session.request = AsyncMock(side_effect=[ServerDisconnectedError(), response])
+    transport.hooks.register(HookEvent.REQUEST_START, on_request_start)
+    transport.hooks.register("on_error", on_error)
+    transport.hooks.register(HookEvent.RESPONSE, on_response)
+    try:
+        await transport.request_method(
+            AllowedHTTPMethods.GET, dummy_url, None, dummy_headers
+        )
+    finally:
+        transport.hooks.clear()
+    get = AllowedHTTPMethods.GET
+    assert events == [
+        (HookEvent.REQUEST_START, get, dummy_url, 0),
+        (HookEvent.ERROR, get, dummy_url, 0),
+        (HookEvent.REQUEST_START, get, dummy_url, 1),
+        (HookEvent.RESPONSE, get, dummy_url, 1, 200),
+    ]
+    sent_headers = [
+        call.kwargs["headers"] for call in fake_session.request.call_args_list
+    ]
+    assert [headers["traceparent"] for headers in sent_headers] == [
+        "00-trace-span0-01",
+        "00-trace-span1-01",
+    ]
+    assert sent_headers[0]["X-Correlation-ID"] == sent_headers[1]["X-Correlation-ID"]
+
+
+@pytest.mark.asyncio
+async def test_request_method_hooks_describe_the_outgoing_call(transport):
+    requests = []
+    response = _fake_response(200, [])
+    response.json = AsyncMock(return_value={})
+    fake_session.request = AsyncMock(return_value=response)
+    transport.hooks.register(
+        HookEvent.REQUEST_START,
+        lambda context, method, url, attempt: requests.append(
+            (context.method, context.url, method, url)
+        ),
+    )
+    context_token = current_call_context.set(
+        CallContext(AllowedHTTPMethods.GET, dummy_url)
+    )
+    try:
+        await transport.request_method(
+            AllowedHTTPMethods.POST, "token_url", {"field": "value"}
+        )
+    finally:
+        current_call_context.reset(context_token)
+        transport.hooks.clear()
+    assert requests == [
+        (AllowedHTTPMethods.GET, dummy_url, AllowedHTTPMethods.POST, "token_url")
+    ]
@@ -0,0 +1,42 @@
+from unittest.mock import patch
+from decouple import Config, RepositoryEnv
+
+import orjson
+import pytest
+
+with patch.object(RepositoryEnv, "__init__", return_value=None):
+    with patch.object(Config, "__init__", return_value=None):
+        with patch.object(Config, "__call__", return_value="ENV_VALUE{}"):
+            from caronte.src.transports.ouroinvest.stream import JsonArrayStream
+
+
+dummy_items = [
+    {"text": 'with "quotes", commas ] and } brackets \\', "nested": [1, {"a": None}]},
+    1,
+    "string",
+    True,
+    None,
+    [],
+    {},
+    -3.5e2,
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1024])
+def test_feed_yields_items_across_chunk_boundaries(chunk_size):
+    payload = orjson.dumps(dummy_items, option=orjson.OPT_INDENT_2)
+    json_array_stream = JsonArrayStream()
+    items = []
+    for start in range(0, len(payload), chunk_size):
+        items.extend(json_array_stream.feed(payload[start : start + chunk_size]))
+    assert items == dummy_items
+
+
+def test_feed_empty_array():
+    assert JsonArrayStream().feed(b" [ ] ") == []
+
+
+def test_feed_keeps_only_pending_item_buffered():
+    json_array_stream = JsonArrayStream()
+    assert json_array_stream.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+    assert json_array_stream.feed(b": 2}]") == [{"b": 2}]